@@ -0,0 +1,670 @@
+# INFRASTRUCTURE
+import io
+import re
+import json
+import time
+import base64
+import hashlib
+import tarfile
+import argparse
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+DEFAULT_LATENCY_MS = 20.0
+DEFAULT_FILES = 200
+DEFAULT_FILE_BYTES = 4096
+DEFAULT_ITEMS = 100
+DEFAULT_BODY_BYTES = 500
+DEFAULT_REPLIES = 8
+PACKAGES = 10
+DEFAULT_PER_PAGE = 30
+NEEDLE = "benchmark_needle"
+CONTENTS_MAX_BYTES = 1024 * 1024
+RAW_ACCEPT = "application/vnd.github.raw"
+OBJECT_ACCEPT = "application/vnd.github.object"
+TIMESTAMP = "2024-01-15T12:00:00Z"
+CONTROL_PREFIX = "/_fake"
+
+# Sizes and latency of the synthetic repository; set by configure()
+SETTINGS = {
+    "latency": DEFAULT_LATENCY_MS / 1000,
+    "files": DEFAULT_FILES,
+    "file_bytes": DEFAULT_FILE_BYTES,
+    "items": DEFAULT_ITEMS,
+    "body_bytes": DEFAULT_BODY_BYTES,
+    "replies": DEFAULT_REPLIES
+}
+# Recorded responses keyed "GET /repos/o/r/..." (path without query) or "POST /graphql <kind>"; served instead of synthetic ones
+FIXTURES = {}
+REPO_FILES = {}
+BLOB_PATHS = {}
+TREE_PATHS = {}
+REQUEST_STATS = {"requests": 0, "bytes_out": 0, "endpoints": {}}
+STATS_LOCK = threading.Lock()
+
+
+# ORCHESTRATOR
+def serve(host: str, port: int) -> None:
+    server = ThreadingHTTPServer((host, port), FakeGitHubHandler)
+    server.daemon_threads = True
+    print(f"Fake GitHub API listening on http://{host}:{server.server_address[1]}", flush=True)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+# FUNCTIONS
+
+# Apply sizes and latency, then build the synthetic repository
+def configure(latency_ms: float, files: int, file_bytes: int, items: int, body_bytes: int, replies: int, fixtures_path: str = "") -> None:
+    SETTINGS.update({
+        "latency": latency_ms / 1000,
+        "files": files,
+        "file_bytes": file_bytes,
+        "items": items,
+        "body_bytes": body_bytes,
+        "replies": replies
+    })
+    build_repository()
+    FIXTURES.clear()
+    if fixtures_path:
+        with open(fixtures_path) as f:
+            FIXTURES.update(json.load(f))
+
+
+# Deterministic repository: every other file is Python under src/, the rest CSV under data/; every fifth holds NEEDLE
+def build_repository() -> None:
+    REPO_FILES.clear()
+    BLOB_PATHS.clear()
+    TREE_PATHS.clear()
+    for idx in range(SETTINGS["files"]):
+        package = f"pkg{idx % PACKAGES}"
+        path = f"src/{package}/module_{idx}.py" if idx % 2 == 0 else f"data/{package}/table_{idx}.csv"
+        content = file_content(idx, path.endswith(".py"), SETTINGS["file_bytes"])
+        REPO_FILES[path] = content
+        BLOB_PATHS[blob_sha(content)] = path
+        parts = path.split("/")
+        for depth in range(1, len(parts)):
+            directory = "/".join(parts[:depth])
+            TREE_PATHS[tree_sha(directory)] = directory
+    TREE_PATHS[tree_sha("")] = ""
+
+
+# Synthetic file body padded to roughly size bytes
+def file_content(idx: int, python: bool, size: int) -> bytes:
+    lines = [f"# module {idx}"] if python else ["id,name,value"]
+    written = len(lines[0]) + 1
+    row = 0
+    while written < size:
+        marker = NEEDLE if idx % 5 == 0 and row % 50 == 0 else f"value_{row}"
+        lines.append(f"def func_{row}():\n    return \"{marker}\"" if python else f"{row},item_{idx}_{row},{marker}")
+        written += len(lines[-1]) + 1
+        row += 1
+    return ("\n".join(lines) + "\n").encode()
+
+
+# Git blob SHA of content
+def blob_sha(content: bytes) -> str:
+    return hashlib.sha1(b"blob %d\0" % len(content) + content).hexdigest()
+
+
+# Stable tree SHA for a directory path ("" is the root)
+def tree_sha(directory: str) -> str:
+    return hashlib.sha1(f"tree {directory}".encode()).hexdigest()
+
+
+# Filler text of about SETTINGS["body_bytes"] characters
+def body_text(label: str) -> str:
+    text = f"{label}: "
+    return (text + "lorem ipsum dolor sit amet " * (SETTINGS["body_bytes"] // 27 + 1))[:max(len(text), SETTINGS["body_bytes"])]
+
+
+# Count one served request against its endpoint
+def record_request(key: str, size: int) -> None:
+    endpoint = re.sub(r"/repos/[^/]+/[^/]+", "/repos/*/*", key)
+    endpoint = re.sub(r"/(\d+|[0-9a-f]{40})(?=/|$)", "/*", endpoint)
+    endpoint = endpoint.split("/contents/")[0] + "/contents/*" if "/contents/" in endpoint else endpoint
+    with STATS_LOCK:
+        REQUEST_STATS["requests"] += 1
+        REQUEST_STATS["bytes_out"] += size
+        REQUEST_STATS["endpoints"][endpoint] = REQUEST_STATS["endpoints"].get(endpoint, 0) + 1
+
+
+# Snapshot and optionally reset request counters
+def request_stats(reset: bool = False) -> dict:
+    with STATS_LOCK:
+        snapshot = dict(REQUEST_STATS, endpoints=dict(REQUEST_STATS["endpoints"]))
+        if reset:
+            REQUEST_STATS.update({"requests": 0, "bytes_out": 0, "endpoints": {}})
+    return snapshot
+
+
+# Slice items for REST page/per_page and build the Link header (next and last), as GitHub does
+def rest_page(items: list, query: dict, url: str) -> tuple[list, dict]:
+    per_page = int(query.get("per_page", [DEFAULT_PER_PAGE])[0])
+    page = int(query.get("page", ["1"])[0])
+    last = max(1, -(-len(items) // per_page))
+    links = []
+    if page < last:
+        links.append(f'<{url}?per_page={per_page}&page={page + 1}>; rel="next"')
+        links.append(f'<{url}?per_page={per_page}&page={last}>; rel="last"')
+    headers = {"Link": ", ".join(links)} if links else {}
+    return items[(page - 1) * per_page:page * per_page], headers
+
+
+# Answer a REST GET with (status, body, headers); body is JSON-serializable, or bytes for raw content
+def route_rest(path: str, query: dict, accept: str, base_url: str) -> tuple[int, object, dict]:
+    if path.startswith("/search/"):
+        return 200, search_results(path.removeprefix("/search/"), base_url), {}
+
+    match = re.match(r"^/repos/([^/]+)/([^/]+)(.*)$", path)
+    if not match:
+        return 404, {"message": "Not Found"}, {}
+    owner, repo, rest = match.groups()
+    url = f"{base_url}{path}"
+    items = SETTINGS["items"]
+
+    if rest == "":
+        return 200, repository(owner, repo, base_url), {}
+    if rest.startswith("/branches/"):
+        return 200, {"name": rest.split("/")[2], "commit": {"sha": head_sha(), "commit": {"tree": {"sha": tree_sha("")}}}}, {}
+    if rest.startswith("/git/trees/"):
+        return tree_response(rest.split("/")[3], "recursive" in query)
+    if rest.startswith("/git/blobs/"):
+        return blob_response(rest.split("/")[3], accept)
+    if rest.startswith("/contents/"):
+        return contents_response(owner, repo, rest.removeprefix("/contents/"), accept)
+    if rest.startswith("/tarball/"):
+        return 200, tarball(owner, repo), {"Content-Type": "application/x-gzip"}
+    if re.fullmatch(r"/issues/\d+", rest):
+        return 200, rest_issue(owner, repo, int(rest.split("/")[2]), base_url), {}
+    if re.fullmatch(r"/issues/\d+/comments", rest):
+        return (200,) + rest_page([rest_comment(idx) for idx in range(items)], query, url)
+    if rest == "/pulls":
+        return (200,) + rest_page([rest_pull(owner, repo, number, base_url) for number in range(1, items + 1)], query, url)
+    if re.fullmatch(r"/pulls/\d+", rest):
+        return 200, rest_pull(owner, repo, int(rest.split("/")[2]), base_url), {}
+    if re.fullmatch(r"/pulls/\d+/files", rest):
+        return (200,) + rest_page([rest_pull_file(path) for path in list(REPO_FILES)[:items]], query, url)
+    if rest == "/commits":
+        return (200,) + rest_page([rest_commit(idx) for idx in range(items)], query, url)
+    if rest.startswith("/compare/"):
+        return 200, compare_response(items), {}
+    if rest == "/releases":
+        return (200,) + rest_page([rest_release(idx) for idx in range(items)], query, url)
+    return 404, {"message": "Not Found"}, {}
+
+
+# Head commit SHA of the synthetic repository (changes with its contents)
+def head_sha() -> str:
+    return hashlib.sha1(tree_sha("").encode() + str(SETTINGS["files"]).encode()).hexdigest()
+
+
+# Repository metadata
+def repository(owner: str, repo: str, base_url: str) -> dict:
+    return {
+        "id": 1,
+        "node_id": f"R_{owner}_{repo}",
+        "name": repo,
+        "full_name": f"{owner}/{repo}",
+        "owner": {"login": owner},
+        "description": body_text("Synthetic repository"),
+        "html_url": f"https://github.com/{owner}/{repo}",
+        "url": f"{base_url}/repos/{owner}/{repo}",
+        "default_branch": "main",
+        "visibility": "public",
+        "archived": False,
+        "stargazers_count": 1234,
+        "forks_count": 56,
+        "open_issues_count": SETTINGS["items"],
+        "language": "Python",
+        "topics": ["benchmark", "fixture"],
+        "license": {"name": "MIT License"},
+        "updated_at": TIMESTAMP
+    }
+
+
+# Git tree of a directory, recursive or one level
+def tree_response(sha: str, recursive: bool) -> tuple[int, object, dict]:
+    if sha not in TREE_PATHS:
+        return 404, {"message": "Not Found"}, {}
+    prefix = TREE_PATHS[sha] + "/" if TREE_PATHS[sha] else ""
+    entries = {}
+    for path, content in REPO_FILES.items():
+        if not path.startswith(prefix):
+            continue
+        relative = path[len(prefix):]
+        parts = relative.split("/")
+        for depth in range(1, len(parts)):
+            directory = "/".join(parts[:depth])
+            entries[directory] = {"path": directory, "mode": "040000", "type": "tree", "sha": tree_sha(prefix + directory)}
+        entries[relative] = {"path": relative, "mode": "100644", "type": "blob", "sha": blob_sha(content), "size": len(content)}
+    tree = [entry for path, entry in sorted(entries.items()) if recursive or "/" not in path]
+    return 200, {"sha": sha, "tree": tree, "truncated": False}, {}
+
+
+# Git blob as raw bytes or base64 JSON
+def blob_response(sha: str, accept: str) -> tuple[int, object, dict]:
+    if sha not in BLOB_PATHS:
+        return 404, {"message": "Not Found"}, {}
+    content = REPO_FILES[BLOB_PATHS[sha]]
+    if accept.startswith(RAW_ACCEPT):
+        return 200, content, {"Content-Type": "application/octet-stream"}
+    return 200, {"sha": sha, "size": len(content), "encoding": "base64", "content": base64.b64encode(content).decode()}, {}
+
+
+# Contents API: a file with base64 content (encoding "none" above 1 MB, as on GitHub), or a directory as a list (or object with the object media type)
+def contents_response(owner: str, repo: str, path: str, accept: str) -> tuple[int, object, dict]:
+    path = path.strip("/")
+    if path in REPO_FILES:
+        content = REPO_FILES[path]
+        if accept.startswith(RAW_ACCEPT):
+            return 200, content, {"Content-Type": "application/octet-stream"}
+        if len(content) > CONTENTS_MAX_BYTES:
+            return 200, dict(contents_entry(owner, repo, path), encoding="none", content=""), {}
+        return 200, dict(contents_entry(owner, repo, path), encoding="base64", content=base64.b64encode(content).decode()), {}
+
+    sha = tree_sha(path)
+    if sha not in TREE_PATHS:
+        return 404, {"message": "Not Found"}, {}
+    children = sorted({child.split("/")[0] for child in (p[len(path) + 1:] for p in REPO_FILES if p.startswith(path + "/"))})
+    entries = [contents_entry(owner, repo, f"{path}/{child}") for child in children]
+    if accept.startswith(OBJECT_ACCEPT):
+        return 200, {"type": "dir", "name": path.split("/")[-1], "path": path, "sha": sha, "entries": entries}, {}
+    return 200, entries, {}
+
+
+# Contents API entry without content
+def contents_entry(owner: str, repo: str, path: str) -> dict:
+    content = REPO_FILES.get(path)
+    return {
+        "type": "file" if content is not None else "dir",
+        "name": path.split("/")[-1],
+        "path": path,
+        "sha": blob_sha(content) if content is not None else tree_sha(path),
+        "size": len(content) if content is not None else 0,
+        "html_url": f"https://github.com/{owner}/{repo}/blob/main/{path}"
+    }
+
+
+# Gzipped tarball with GitHub's "owner-repo-sha/" top-level directory
+def tarball(owner: str, repo: str) -> bytes:
+    buffer = io.BytesIO()
+    with tarfile.open(fileobj=buffer, mode="w:gz") as archive:
+        for path, content in REPO_FILES.items():
+            info = tarfile.TarInfo(f"{owner}-{repo}-{head_sha()[:7]}/{path}")
+            info.size = len(content)
+            archive.addfile(info, io.BytesIO(content))
+    return buffer.getvalue()
+
+
+# Search API results for repositories, code or issues
+def search_results(kind: str, base_url: str) -> dict:
+    count = min(SETTINGS["items"], 100)
+    if kind == "repositories":
+        items = [repository("bench", f"repo{idx}", base_url) for idx in range(count)]
+    elif kind == "code":
+        paths = list(REPO_FILES)[:count]
+        items = [{
+            "name": path.split("/")[-1],
+            "path": path,
+            "html_url": f"https://github.com/bench/repo/blob/main/{path}",
+            "repository": {"name": "repo", "full_name": "bench/repo", "owner": {"login": "bench"}},
+            "text_matches": [{"property": "content", "fragment": f"return \"{NEEDLE}\""}]
+        } for path in paths]
+    else:
+        items = [rest_issue("bench", "repo", number, base_url) for number in range(1, count + 1)]
+    return {"total_count": SETTINGS["items"], "incomplete_results": False, "items": items}
+
+
+# REST issue
+def rest_issue(owner: str, repo: str, number: int, base_url: str) -> dict:
+    return {
+        "number": number,
+        "title": f"Issue {number}",
+        "state": "open",
+        "user": {"login": f"user{number % 7}"},
+        "labels": [{"name": "bug"}],
+        "comments": SETTINGS["items"],
+        "created_at": TIMESTAMP,
+        "updated_at": TIMESTAMP,
+        "repository_url": f"{base_url}/repos/{owner}/{repo}",
+        "html_url": f"https://github.com/{owner}/{repo}/issues/{number}",
+        "body": body_text(f"Issue {number}")
+    }
+
+
+# REST issue comment
+def rest_comment(idx: int) -> dict:
+    return {"id": idx, "user": {"login": f"user{idx % 7}"}, "created_at": TIMESTAMP, "body": body_text(f"Comment {idx}")}
+
+
+# REST pull request
+def rest_pull(owner: str, repo: str, number: int, base_url: str) -> dict:
+    return dict(
+        rest_issue(owner, repo, number, base_url),
+        title=f"Pull request {number}",
+        head={"ref": f"feature-{number}"},
+        base={"ref": "main"},
+        merged_at=None,
+        commits=3,
+        additions=120,
+        deletions=40,
+        changed_files=min(SETTINGS["items"], len(REPO_FILES)),
+        mergeable=True,
+        html_url=f"https://github.com/{owner}/{repo}/pull/{number}"
+    )
+
+
+# REST pull request file
+def rest_pull_file(path: str) -> dict:
+    return {"filename": path, "status": "modified", "additions": 3, "deletions": 1, "patch": "@@ -1,2 +1,4 @@\n-old\n+new\n+new\n+new"}
+
+
+# REST commit
+def rest_commit(idx: int) -> dict:
+    sha = hashlib.sha1(f"commit {idx}".encode()).hexdigest()
+    return {
+        "sha": sha,
+        "commit": {"message": f"Commit {idx}\n\n{body_text('Details')}", "author": {"name": f"Author {idx % 7}", "date": TIMESTAMP}},
+        "author": {"login": f"user{idx % 7}"},
+        "html_url": f"https://github.com/bench/repo/commit/{sha}"
+    }
+
+
+# REST compare of two refs
+def compare_response(items: int) -> dict:
+    commits = [rest_commit(idx) for idx in range(items)]
+    return {
+        "status": "ahead",
+        "ahead_by": items,
+        "behind_by": 0,
+        "total_commits": items,
+        "base_commit": rest_commit(-1),
+        "commits": commits,
+        "files": [rest_pull_file(path) for path in list(REPO_FILES)[:items]]
+    }
+
+
+# REST release
+def rest_release(idx: int) -> dict:
+    return {
+        "tag_name": f"v1.{idx}.0",
+        "name": f"Release 1.{idx}.0",
+        "published_at": TIMESTAMP,
+        "prerelease": False,
+        "draft": False,
+        "assets": [],
+        "html_url": f"https://github.com/bench/repo/releases/tag/v1.{idx}.0",
+        "body": body_text(f"Release notes {idx}")
+    }
+
+
+# Kind of GraphQL operation, recognized from the query text of the tools' queries
+def graphql_kind(query: str) -> str:
+    if re.search(r"\ba0: repository", query):
+        return "batch"
+    if "search(" in query:
+        return "search_discussions"
+    if "discussionCategories" in query:
+        return "discussion_categories"
+    if "discussions(" in query:
+        return "list_discussions"
+    if "discussion(number" in query:
+        return "discussion"
+    if "node(id" in query:
+        return "replies"
+    if "pullRequest(number" in query:
+        return "pull_request"
+    if "issue(number" in query:
+        return "issue"
+    return "unknown"
+
+
+# Answer a GraphQL POST with the response body, including rateLimit when the query asks for it
+def route_graphql(query: str, variables: dict) -> dict:
+    kind = graphql_kind(query)
+    first = variables.get("first", 10)
+    items = SETTINGS["items"]
+
+    if kind == "batch":
+        data = graphql_batch(query, variables)
+    elif kind == "search_discussions":
+        data = {"search": dict(connection([gql_discussion(number) for number in range(1, items + 1)], first, variables.get("after")), discussionCount=items)}
+    elif kind == "discussion_categories":
+        categories = [{"id": f"DIC_{slug}", "name": slug.title(), "slug": slug, "emoji": ":speech_balloon:"} for slug in ("general", "ideas", "q-a")]
+        data = {"repository": {"id": f"R_{variables['owner']}_{variables['repo']}", "discussionCategories": {"nodes": categories}}}
+    elif kind == "list_discussions":
+        data = {"repository": {"discussions": connection([gql_discussion(number) for number in range(1, items + 1)], first, variables.get("after"))}}
+    elif kind == "discussion":
+        data = {"repository": {"discussion": gql_discussion_thread(variables)}}
+    elif kind == "replies":
+        data = {"node": {"replies": connection([gql_reply(idx) for idx in range(SETTINGS["replies"])], first, variables.get("after"))}}
+    elif kind == "pull_request":
+        data = {"repository": {"pullRequest": gql_thread(variables, gql_pull(variables["number"]), ("comments", "reviews", "files"))}}
+    elif kind == "issue":
+        data = {"repository": {"issue": gql_thread(variables, gql_issue(variables["number"]), ("comments",))}}
+    else:
+        return {"errors": [{"message": "Unsupported query"}]}
+
+    if "rateLimit" in query:
+        data["rateLimit"] = {"cost": 1, "remaining": 4999, "resetAt": "2099-01-01T00:00:00Z", "limit": 5000}
+    return {"data": data}
+
+
+# Slice nodes for $first/$after into a connection; cursors are node offsets
+def connection(nodes: list, first: int, after: str | None) -> dict:
+    start = int(after) if after else 0
+    end = start + first
+    return {
+        "totalCount": len(nodes),
+        "pageInfo": {"hasNextPage": end < len(nodes), "endCursor": str(min(end, len(nodes)))},
+        "nodes": nodes[start:end]
+    }
+
+
+# Aliased batch lookups: a{i}: repository(...) { field(number: $n{i}) {...} }
+def graphql_batch(query: str, variables: dict) -> dict:
+    data = {}
+    for alias, field in re.findall(r"\b(a\d+): repository\([^)]*\) \{ (\w+)\(number:", query):
+        number = variables[f"n{alias[1:]}"]
+        data[alias] = {field: gql_pull(number) if field == "pullRequest" else gql_issue(number)}
+    return data
+
+
+# Details (when $details) plus the requested connections, each honouring its $<name>Page flag and $<name>After cursor
+def gql_thread(variables: dict, details: dict, connections: tuple[str, ...]) -> dict:
+    node = dict(details) if variables.get("details", True) else {}
+    makers = {"comments": gql_comment, "reviews": gql_review, "files": gql_file}
+    for name in connections:
+        if variables.get(f"{name}Page", True):
+            count = min(SETTINGS["items"], len(REPO_FILES)) if name == "files" else SETTINGS["items"]
+            node[name] = connection([makers[name](idx) for idx in range(count)], variables["first"], variables.get(f"{name}After"))
+    return node
+
+
+# GraphQL issue
+def gql_issue(number: int) -> dict:
+    return {
+        "number": number,
+        "title": f"Issue {number}",
+        "body": body_text(f"Issue {number}"),
+        "state": "OPEN",
+        "stateReason": None,
+        "author": {"login": f"user{number % 7}"},
+        "createdAt": TIMESTAMP,
+        "updatedAt": TIMESTAMP,
+        "closedAt": None,
+        "url": f"https://github.com/bench/repo/issues/{number}",
+        "labels": {"nodes": [{"name": "bug"}]},
+        "assignees": {"nodes": []},
+        "comments": {"totalCount": SETTINGS["items"]}
+    }
+
+
+# GraphQL pull request
+def gql_pull(number: int) -> dict:
+    return dict(
+        gql_issue(number),
+        title=f"Pull request {number}",
+        isDraft=False,
+        merged=False,
+        mergedAt=None,
+        mergedBy=None,
+        headRefName=f"feature-{number}",
+        baseRefName="main",
+        additions=120,
+        deletions=40,
+        changedFiles=min(SETTINGS["items"], len(REPO_FILES)),
+        commits={"totalCount": 3},
+        mergeable="MERGEABLE",
+        reviewDecision="REVIEW_REQUIRED",
+        url=f"https://github.com/bench/repo/pull/{number}"
+    )
+
+
+# GraphQL issue or pull request comment
+def gql_comment(idx: int) -> dict:
+    return {"author": {"login": f"user{idx % 7}"}, "body": body_text(f"Comment {idx}"), "createdAt": TIMESTAMP}
+
+
+# GraphQL pull request review
+def gql_review(idx: int) -> dict:
+    return {"author": {"login": f"reviewer{idx % 3}"}, "state": "COMMENTED", "body": body_text(f"Review {idx}"), "submittedAt": TIMESTAMP}
+
+
+# GraphQL pull request file
+def gql_file(idx: int) -> dict:
+    return {"path": list(REPO_FILES)[idx], "additions": 3, "deletions": 1, "changeType": "MODIFIED"}
+
+
+# GraphQL discussion summary
+def gql_discussion(number: int) -> dict:
+    return {
+        "number": number,
+        "title": f"Discussion {number}",
+        "bodyText": body_text(f"Discussion {number}"),
+        "repository": {"nameWithOwner": "bench/repo"},
+        "author": {"login": f"user{number % 7}"},
+        "category": {"name": "Q&A", "emoji": ":pray:", "slug": "q-a"},
+        "comments": {"totalCount": SETTINGS["items"]},
+        "upvoteCount": number % 13,
+        "isAnswered": number % 2 == 0,
+        "url": f"https://github.com/bench/repo/discussions/{number}",
+        "createdAt": TIMESTAMP,
+        "updatedAt": TIMESTAMP
+    }
+
+
+# GraphQL discussion with comments and their first $replyFirst replies
+def gql_discussion_thread(variables: dict) -> dict:
+    details = {
+        "title": f"Discussion {variables['number']}",
+        "body": body_text("Discussion body"),
+        "author": {"login": "author"},
+        "category": {"name": "Q&A", "emoji": ":pray:", "isAnswerable": True},
+        "upvoteCount": 42,
+        "createdAt": TIMESTAMP,
+        "updatedAt": TIMESTAMP,
+        "isAnswered": True,
+        "answer": {"body": body_text("Answer"), "author": {"login": "maintainer"}, "createdAt": TIMESTAMP, "upvoteCount": 7, "url": "https://github.com/bench/repo/discussions/1#answer"}
+    }
+    node = dict(details) if variables.get("details", True) else {}
+    if variables.get("commentsPage", True):
+        comments = [dict(gql_reply(idx), id=f"DC_{idx}", isAnswer=idx == 0, url=f"https://github.com/bench/repo/discussions/1#c{idx}",
+                         replies=connection([gql_reply(reply) for reply in range(SETTINGS["replies"])], variables["replyFirst"], None))
+                    for idx in range(SETTINGS["items"])]
+        node["comments"] = connection(comments, variables["first"], variables.get("commentsAfter"))
+    return node
+
+
+# GraphQL discussion comment or reply
+def gql_reply(idx: int) -> dict:
+    return {"body": body_text(f"Reply {idx}"), "author": {"login": f"user{idx % 7}"}, "createdAt": TIMESTAMP, "upvoteCount": (idx * 7) % 11}
+
+
+# Serialize a response body, returning (bytes, content type)
+def encode_body(body: object) -> tuple[bytes, str]:
+    if isinstance(body, bytes):
+        return body, "application/octet-stream"
+    return json.dumps(body).encode(), "application/json; charset=utf-8"
+
+
+# Stand-in for api.github.com: REST GETs, POST /graphql, and /_fake/stats (?reset=1) for request counts
+class FakeGitHubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+
+    # Clients dropping keep-alive connections at exit are not errors
+    def handle(self):
+        try:
+            super().handle()
+        except ConnectionError:
+            pass
+
+    def do_GET(self):
+        parsed = urlparse(self.path)
+        query = parse_qs(parsed.query)
+        if parsed.path.startswith(CONTROL_PREFIX):
+            return self.respond(200, request_stats(reset="reset" in query), {}, count=False)
+        key = f"GET {parsed.path}"
+        if key in FIXTURES:
+            return self.respond(200, FIXTURES[key], {}, key=key)
+        base_url = f"http://{self.headers['Host']}"
+        status, body, headers = route_rest(parsed.path, query, self.headers.get("Accept", ""), base_url)
+        self.respond(status, body, headers, key=key)
+
+    def do_POST(self):
+        payload = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"{}")
+        query = payload.get("query", "")
+        key = f"POST /graphql {graphql_kind(query)}"
+        body = FIXTURES[key] if key in FIXTURES else route_graphql(query, payload.get("variables") or {})
+        self.respond(200, body, {}, key=key)
+
+    # Send body after the configured latency; JSON bodies carry an ETag and honour If-None-Match
+    def respond(self, status: int, body: object, headers: dict, key: str = "", count: bool = True):
+        if count and SETTINGS["latency"]:
+            time.sleep(SETTINGS["latency"])
+        data, content_type = encode_body(body)
+        etag = f'"{hashlib.md5(data).hexdigest()}"'
+        if count:
+            record_request(key, len(data))
+        if status == 200 and self.command == "GET" and self.headers.get("If-None-Match") == etag:
+            self.send_response(304)
+            self.send_header("ETag", etag)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        self.send_response(status)
+        self.send_header("Content-Type", headers.pop("Content-Type", content_type))
+        self.send_header("Content-Length", str(len(data)))
+        self.send_header("ETag", etag)
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        pass
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Local stand-in for the GitHub REST and GraphQL APIs")
+    parser.add_argument("--host", default=DEFAULT_HOST)
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT, help="0 picks a free port")
+    parser.add_argument("--latency-ms", type=float, default=DEFAULT_LATENCY_MS, help="Delay added to every request")
+    parser.add_argument("--files", type=int, default=DEFAULT_FILES, help="Files in the synthetic repository")
+    parser.add_argument("--file-bytes", type=int, default=DEFAULT_FILE_BYTES, help="Approximate size of each file")
+    parser.add_argument("--items", type=int, default=DEFAULT_ITEMS, help="Comments, PRs, commits, releases, discussions per list")
+    parser.add_argument("--body-bytes", type=int, default=DEFAULT_BODY_BYTES, help="Size of issue, comment and release bodies")
+    parser.add_argument("--replies", type=int, default=DEFAULT_REPLIES, help="Replies per discussion comment")
+    parser.add_argument("--fixtures", default="", help="JSON file of recorded responses keyed 'GET /path' or 'POST /graphql <kind>'")
+    args = parser.parse_args()
+    configure(args.latency_ms, args.files, args.file_bytes, args.items, args.body_bytes, args.replies, args.fixtures)
+    serve(args.host, args.port)
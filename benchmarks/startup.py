@@ -0,0 +1,130 @@
+# INFRASTRUCTURE
+import sys
+import json
+import time
+import argparse
+import statistics
+import subprocess
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+SERVER = ROOT / "server.py"
+DEFAULT_RUNS = 5
+DEFAULT_TOP = 15
+DEFAULT_BUDGET_MS = 2500.0
+PROTOCOL_VERSION = "2025-06-18"
+HANDSHAKE_TIMEOUT = 60
+
+
+# ORCHESTRATOR
+def startup_benchmark(runs: int, top: int, budget_ms: float, command: list[str]) -> int:
+    import_samples = [measure_import() for _ in range(runs)]
+    handshake_samples = [measure_handshake(command) for _ in range(runs)]
+    report = summarize(import_samples, handshake_samples, top)
+    print(format_report(report, runs, budget_ms, command))
+    return 0 if report["ready_ms"] <= budget_ms else 1
+
+
+# FUNCTIONS
+
+# Import server in a fresh interpreter with -X importtime; returns wall ms, self import time per package, and tool modules loaded
+def measure_import() -> dict:
+    code = "import sys, time; t = time.perf_counter(); import server; print((time.perf_counter() - t) * 1000); print(sum(m.startswith('src.github.') for m in sys.modules))"
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", code], cwd=ROOT, capture_output=True, text=True, check=True)
+    wall_ms, tool_modules = result.stdout.split()
+    return {"wall_ms": float(wall_ms), "modules": parse_importtime(result.stderr), "tool_modules": int(tool_modules)}
+
+
+# Parse "import time: self | cumulative | module" lines into top-level package -> summed self microseconds
+def parse_importtime(stderr: str) -> dict:
+    packages = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        self_us, _, name = (part.strip() for part in line.removeprefix("import time:").split("|"))
+        if not self_us.isdigit():
+            continue
+        package = "src.github" if name.startswith("src.github") else name.split(".")[0]
+        packages[package] = packages.get(package, 0) + int(self_us)
+    return packages
+
+
+# Spawn the server over stdio and time the initialize and tools/list responses from process start
+def measure_handshake(command: list[str]) -> dict:
+    started = time.perf_counter()
+    process = subprocess.Popen(command, cwd=ROOT, stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True)
+    try:
+        send(process, {"jsonrpc": "2.0", "id": 1, "method": "initialize", "params": {"protocolVersion": PROTOCOL_VERSION, "capabilities": {}, "clientInfo": {"name": "startup-benchmark", "version": "1"}}})
+        wait_for(process, 1)
+        initialized_ms = (time.perf_counter() - started) * 1000
+        send(process, {"jsonrpc": "2.0", "method": "notifications/initialized"})
+        send(process, {"jsonrpc": "2.0", "id": 2, "method": "tools/list"})
+        tools = len(wait_for(process, 2)["result"]["tools"])
+        listed_ms = (time.perf_counter() - started) * 1000
+    finally:
+        process.kill()
+        process.wait()
+    return {"initialize_ms": initialized_ms, "tools_list_ms": listed_ms, "tools": tools}
+
+
+# Write one JSON-RPC message line
+def send(process: subprocess.Popen, message: dict) -> None:
+    process.stdin.write(json.dumps(message) + "\n")
+    process.stdin.flush()
+
+
+# Read lines until the response with the given id (notifications and log lines are skipped)
+def wait_for(process: subprocess.Popen, message_id: int) -> dict:
+    deadline = time.monotonic() + HANDSHAKE_TIMEOUT
+    while time.monotonic() < deadline:
+        line = process.stdout.readline()
+        if not line:
+            raise RuntimeError(f"Server exited before answering request {message_id}")
+        try:
+            message = json.loads(line)
+        except ValueError:
+            continue
+        if message.get("id") == message_id:
+            return message
+    raise TimeoutError(f"No response to request {message_id} within {HANDSHAKE_TIMEOUT}s")
+
+
+# Medians across runs, and the packages with the largest median self import time
+def summarize(import_samples: list[dict], handshake_samples: list[dict], top: int) -> dict:
+    packages = {name for sample in import_samples for name in sample["modules"]}
+    package_ms = {name: statistics.median(sample["modules"].get(name, 0) for sample in import_samples) / 1000 for name in packages}
+    return {
+        "import_ms": statistics.median(s["wall_ms"] for s in import_samples),
+        "tool_modules": max(s["tool_modules"] for s in import_samples),
+        "initialize_ms": statistics.median(s["initialize_ms"] for s in handshake_samples),
+        "ready_ms": statistics.median(s["tools_list_ms"] for s in handshake_samples),
+        "tools": handshake_samples[0]["tools"],
+        "packages": sorted(package_ms.items(), key=lambda item: -item[1])[:top]
+    }
+
+
+# Format breakdown and budget verdict
+def format_report(report: dict, runs: int, budget_ms: float, command: list[str]) -> str:
+    lines = []
+    lines.append(f"# Startup ({runs} runs, medians)")
+    lines.append(f"import server: {report['import_ms']:.0f} ms | src.github modules loaded at import: {report['tool_modules']}")
+    lines.append(f"Launch: {' '.join(command)}")
+    lines.append(f"initialize response: {report['initialize_ms']:.0f} ms | tools/list ({report['tools']} tools): {report['ready_ms']:.0f} ms")
+    lines.append("")
+    lines.append("Self import time by top-level package:")
+    for package, ms in report["packages"]:
+        lines.append(f"  {package:<28} {ms:>8.1f} ms")
+    lines.append("")
+    verdict = "OK" if report["ready_ms"] <= budget_ms else "OVER BUDGET"
+    lines.append(f"Budget: tools/list within {budget_ms:.0f} ms -> {verdict}")
+    return "\n".join(lines)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Import-time breakdown and stdio time-to-ready of the MCP server, checked against a budget")
+    parser.add_argument("--runs", type=int, default=DEFAULT_RUNS)
+    parser.add_argument("--top", type=int, default=DEFAULT_TOP, help="Packages shown in the breakdown")
+    parser.add_argument("--budget-ms", type=float, default=DEFAULT_BUDGET_MS, help="Max median time from spawn to tools/list response; exit 1 when exceeded")
+    parser.add_argument("--command", nargs="+", default=[sys.executable, str(SERVER)], help="Launch command (default: this Python running server.py)")
+    args = parser.parse_args()
+    sys.exit(startup_benchmark(args.runs, args.top, args.budget_ms, args.command))
@@ -0,0 +1,201 @@
+# INFRASTRUCTURE
+import os
+import sys
+import json
+import time
+import asyncio
+import argparse
+import tempfile
+import importlib
+import tracemalloc
+import subprocess
+from pathlib import Path
+
+import requests
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+FAKE_SERVER = ROOT / "benchmarks" / "fake_github.py"
+DEFAULT_LATENCY_MS = 20.0
+DEFAULT_FILES = 200
+DEFAULT_FILE_BYTES = 4096
+DEFAULT_ITEMS = 100
+DEFAULT_WARM_RUNS = 3
+DEFAULT_CONCURRENT_CALLS = 20
+UNPACED_BUDGET = (1_000_000.0, 1_000_000)
+
+# (label, tool module, args from (owner, repo)); mirror_repo needs a git remote and server_stats makes no upstream calls
+SCENARIOS = [
+    ("search_repos", "search_repos", lambda owner, repo: (f"{repo} language:python",)),
+    ("search_code", "search_code", lambda owner, repo: (f"benchmark_needle repo:{owner}/{repo}",)),
+    ("search_items", "search_items", lambda owner, repo: (f"repo:{owner}/{repo} bug", "issue")),
+    ("get_repo", "get_repo", lambda owner, repo: (owner, repo)),
+    ("get_repo_tree", "get_repo_tree", lambda owner, repo: (owner, repo)),
+    ("get_repo_tree[pattern]", "get_repo_tree", lambda owner, repo: (owner, repo, "", -1, "data/**/*.csv")),
+    ("get_file_content", "get_file_content", lambda owner, repo: (owner, repo, "src/pkg0/module_0.py")),
+    ("grep_file", "grep_file", lambda owner, repo: (owner, repo, "src/pkg0/module_0.py", "benchmark_needle")),
+    ("grep_repo[api]", "grep_repo", lambda owner, repo: (owner, repo, "benchmark_needle", "*.py")),
+    ("grep_repo[archive]", "grep_repo", lambda owner, repo: (owner, repo, "benchmark_needle", "*.py", "", 10, "archive")),
+    ("grep_repo[index]", "grep_repo", lambda owner, repo: (owner, repo, "benchmark_needle", "*.py", "", 10, "index")),
+    ("get_issue", "get_issue", lambda owner, repo: (owner, repo, 1)),
+    ("get_issue_comments", "get_issue_comments", lambda owner, repo: (owner, repo, 1)),
+    ("get_issue_thread", "get_issue_thread", lambda owner, repo: (owner, repo, 1)),
+    ("get_issues", "get_issues", lambda owner, repo: ([str(number) for number in range(1, 21)], owner, repo)),
+    ("list_repo_prs", "list_repo_prs", lambda owner, repo: (owner, repo)),
+    ("get_pr", "get_pr", lambda owner, repo: (owner, repo, 1)),
+    ("get_pr_files", "get_pr_files", lambda owner, repo: (owner, repo, 1)),
+    ("get_pr_bundle", "get_pr_bundle", lambda owner, repo: (owner, repo, 1)),
+    ("get_prs", "get_prs", lambda owner, repo: ([str(number) for number in range(1, 21)], owner, repo)),
+    ("search_discussions", "search_discussions", lambda owner, repo: (f"repo:{owner}/{repo} crash",)),
+    ("list_discussions", "list_discussions", lambda owner, repo: (owner, repo, 10, "q-a")),
+    ("get_discussion", "get_discussion", lambda owner, repo: (owner, repo, 1)),
+    ("list_commits", "list_commits", lambda owner, repo: (owner, repo)),
+    ("compare_commits", "compare_commits", lambda owner, repo: (owner, repo, "v1.0.0", "main")),
+    ("list_releases", "list_releases", lambda owner, repo: (owner, repo))
+]
+
+
+# ORCHESTRATOR
+def tool_benchmarks(args: argparse.Namespace) -> None:
+    fake_server, base_url = start_fake_server(args)
+    try:
+        configure_environment(base_url, args.paced)
+        run_workflow = importlib.import_module("server").run_workflow
+        selected = [s for s in SCENARIOS if not args.tools or s[0] in args.tools or s[1] in args.tools]
+        results = [benchmark_tool(run_workflow, base_url, label, module, make_args, args.warm_runs) for label, module, make_args in selected]
+        concurrent = benchmark_concurrency(run_workflow, base_url, args.concurrent_calls)
+        pool = importlib.import_module("src.github.client").pool_stats()
+    finally:
+        fake_server.terminate()
+        fake_server.wait()
+
+    print(format_report(args, results, concurrent, pool))
+    if args.json:
+        Path(args.json).write_text(json.dumps({"settings": vars(args), "tools": results, "concurrency": concurrent, "pool": pool}, indent=2))
+
+
+# FUNCTIONS
+
+# Launch benchmarks/fake_github.py on a free port in its own process (so it neither shares the GIL nor shows up in peak memory)
+def start_fake_server(args: argparse.Namespace) -> tuple[subprocess.Popen, str]:
+    command = [
+        sys.executable, str(FAKE_SERVER), "--port", "0",
+        "--latency-ms", str(args.latency_ms),
+        "--files", str(args.files),
+        "--file-bytes", str(args.file_bytes),
+        "--items", str(args.items)
+    ]
+    if args.fixtures:
+        command += ["--fixtures", args.fixtures]
+    process = subprocess.Popen(command, stdout=subprocess.PIPE, text=True)
+    banner = process.stdout.readline()
+    if "http://" not in banner:
+        process.kill()
+        raise RuntimeError(f"Fake GitHub API failed to start: {banner!r}")
+    return process, banner.strip().split()[-1]
+
+
+# Point the server at the fake API before its modules are imported; pacing is lifted unless paced
+def configure_environment(base_url: str, paced: bool) -> None:
+    os.environ["GITHUB_API_BASE"] = base_url
+    os.environ["GITHUB_GRAPHQL"] = f"{base_url}/graphql"
+    os.environ["GITHUB_INDEX_DIR"] = tempfile.mkdtemp(prefix="github-mcp-bench-index-")
+    os.environ["GITHUB_MIRROR_DIR"] = tempfile.mkdtemp(prefix="github-mcp-bench-mirrors-")
+    os.environ.pop("GITHUB_METRICS_FILE", None)
+    if not paced:
+        rate_limit = importlib.import_module("src.github.rate_limit")
+        rate_limit.DEFAULT_BUDGETS.update({resource: UNPACED_BUDGET for resource in rate_limit.DEFAULT_BUDGETS})
+
+
+# Fake API request counters since the last reset; reset clears them
+def fake_requests(base_url: str, reset: bool = False) -> dict:
+    params = {"reset": "1"} if reset else None
+    return requests.get(f"{base_url}/_fake/stats", params=params, timeout=10).json()
+
+
+# Run one tool call through the server's executor, returning (seconds, upstream requests)
+def timed_call(run_workflow, base_url: str, workflow, call_args: tuple) -> tuple[float, int]:
+    fake_requests(base_url, reset=True)
+    started = time.perf_counter()
+    asyncio.run(run_workflow(workflow, *call_args))
+    seconds = time.perf_counter() - started
+    return seconds, fake_requests(base_url)["requests"]
+
+
+# Cold call on one repo, warm repeats of it, and a traced cold call on a second repo for peak memory
+def benchmark_tool(run_workflow, base_url: str, label: str, module: str, make_args, warm_runs: int) -> dict:
+    workflow = getattr(importlib.import_module(f"src.github.{module}"), f"{module}_workflow")
+    cold_seconds, cold_requests = timed_call(run_workflow, base_url, workflow, make_args("bench", label))
+
+    warm = [timed_call(run_workflow, base_url, workflow, make_args("bench", label)) for _ in range(warm_runs)]
+
+    tracemalloc.start()
+    try:
+        timed_call(run_workflow, base_url, workflow, make_args("bench-memory", label))
+        peak_bytes = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+    return {
+        "tool": label,
+        "cold_ms": round(cold_seconds * 1000, 1),
+        "warm_ms": round(sum(s for s, _ in warm) / len(warm) * 1000, 1) if warm else None,
+        "cold_requests": cold_requests,
+        "warm_requests": round(sum(r for _, r in warm) / len(warm), 1) if warm else None,
+        "peak_kib": round(peak_bytes / 1024, 1)
+    }
+
+
+# N distinct get_issue calls serialized, then awaited together: shows whether tool calls still overlap
+def benchmark_concurrency(run_workflow, base_url: str, calls: int) -> dict:
+    workflow = importlib.import_module("src.github.get_issue").get_issue_workflow
+
+    started = time.perf_counter()
+    for number in range(1, calls + 1):
+        asyncio.run(run_workflow(workflow, "bench-serial", "concurrency", number))
+    serial_seconds = time.perf_counter() - started
+
+    async def gather_calls():
+        await asyncio.gather(*(run_workflow(workflow, "bench-concurrent", "concurrency", number) for number in range(1, calls + 1)))
+
+    started = time.perf_counter()
+    asyncio.run(gather_calls())
+    concurrent_seconds = time.perf_counter() - started
+    return {
+        "calls": calls,
+        "serial_ms": round(serial_seconds * 1000, 1),
+        "concurrent_ms": round(concurrent_seconds * 1000, 1),
+        "speedup": round(serial_seconds / concurrent_seconds, 1) if concurrent_seconds > 0 else None
+    }
+
+
+# Format results table
+def format_report(args: argparse.Namespace, results: list[dict], concurrent: dict, pool: dict) -> str:
+    lines = []
+    lines.append(f"# Tool benchmarks (fake API: {args.latency_ms:g} ms latency, {args.files} files x {args.file_bytes} B, {args.items} items per list)")
+    lines.append(f"{'tool':<24} {'cold ms':>9} {'warm ms':>9} {'cold req':>9} {'warm req':>9} {'peak KiB':>10}")
+    for r in results:
+        warm_ms = f"{r['warm_ms']:.1f}" if r["warm_ms"] is not None else "-"
+        warm_requests = f"{r['warm_requests']:g}" if r["warm_requests"] is not None else "-"
+        lines.append(f"{r['tool']:<24} {r['cold_ms']:>9.1f} {warm_ms:>9} {r['cold_requests']:>9} {warm_requests:>9} {r['peak_kib']:>10.1f}")
+    lines.append("")
+    lines.append(f"get_issue x{concurrent['calls']}: serial {concurrent['serial_ms']:.1f} ms | concurrent {concurrent['concurrent_ms']:.1f} ms | speedup {concurrent['speedup']}x")
+    lines.append(f"Connections opened: {pool['connections_opened']} | Requests: {pool['requests']} | Reuse ratio: {pool['reuse_ratio']}")
+    return "\n".join(lines)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Per-tool wall time, upstream requests and peak memory against a local fake GitHub API")
+    parser.add_argument("--tools", nargs="*", default=[], help="Scenario labels or tool names to run (default: all)")
+    parser.add_argument("--latency-ms", type=float, default=DEFAULT_LATENCY_MS)
+    parser.add_argument("--files", type=int, default=DEFAULT_FILES)
+    parser.add_argument("--file-bytes", type=int, default=DEFAULT_FILE_BYTES)
+    parser.add_argument("--items", type=int, default=DEFAULT_ITEMS)
+    parser.add_argument("--warm-runs", type=int, default=DEFAULT_WARM_RUNS)
+    parser.add_argument("--concurrent-calls", type=int, default=DEFAULT_CONCURRENT_CALLS)
+    parser.add_argument("--fixtures", default="", help="Recorded responses passed to fake_github.py")
+    parser.add_argument("--paced", action="store_true", help="Keep the client's rate-limit pacing")
+    parser.add_argument("--json", default="", help="Also write results to this JSON file")
+    args = parser.parse_args()
+    tool_benchmarks(args)
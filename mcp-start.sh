@@ -2,12 +2,37 @@
 set -e
 
 SCRIPT_DIR="$(cd "$(dirname "$0")" && pwd)"
-VENV_DIR="$SCRIPT_DIR/.venv"
+VENV_DIR="${GITHUB_MCP_VENV:-$SCRIPT_DIR/.venv}"
+STAMP="$VENV_DIR/.requirements-stamp"
 
-# Bootstrap venv if missing
-if [ ! -d "$VENV_DIR" ]; then
-    python3 -m venv "$VENV_DIR"
+# Fingerprint of requirements.txt the venv was built from
+requirements_stamp() {
+    cksum < "$SCRIPT_DIR/requirements.txt"
+}
+
+# Create venv if needed, install requirements, precompile server bytecode, record the stamp
+build_env() {
+    [ -x "$VENV_DIR/bin/python" ] || python3 -m venv "$VENV_DIR"
     "$VENV_DIR/bin/pip" install -q -r "$SCRIPT_DIR/requirements.txt"
+    "$VENV_DIR/bin/python" -m compileall -q "$SCRIPT_DIR/server.py" "$SCRIPT_DIR/src"
+    requirements_stamp > "$STAMP"
+}
+
+# Prebuild ahead of time (install/update step) so session startup never resolves dependencies
+if [ "$1" = "--build" ]; then
+    build_env
+    exit 0
+fi
+
+# Prebuilt interpreter with requirements installed: start directly, no venv checks
+if [ -n "$GITHUB_MCP_PYTHON" ]; then
+    exec "$GITHUB_MCP_PYTHON" "$SCRIPT_DIR/server.py"
+fi
+
+# Bootstrap on first launch, or refresh when requirements.txt changed since the build
+if [ ! -x "$VENV_DIR/bin/python" ] || [ "$(cat "$STAMP" 2>/dev/null)" != "$(requirements_stamp)" ]; then
+    build_env
 fi
 
-exec "$VENV_DIR/bin/fastmcp" run "$SCRIPT_DIR/server.py"
+# Run server.py with the venv interpreter directly; the fastmcp CLI adds its own imports before the server's
+exec "$VENV_DIR/bin/python" "$SCRIPT_DIR/server.py"
@@ -1,131 +1,219 @@
 # INFRASTRUCTURE
+import asyncio
+import importlib
+import threading
 from typing import Literal
+from concurrent.futures import ThreadPoolExecutor
 from fastmcp import FastMCP
 from mcp.types import TextContent
 
-from src.github.search_repos import search_repos_workflow
-from src.github.search_code import search_code_workflow
-from src.github.get_repo_tree import get_repo_tree_workflow
-from src.github.get_file_content import get_file_content_workflow
-from src.github.grep_file import grep_file_workflow
-from src.github.grep_repo import grep_repo_workflow
-from src.github.search_items import search_items_workflow
-from src.github.get_issue import get_issue_workflow
-from src.github.get_issue_comments import get_issue_comments_workflow
-from src.github.list_repo_prs import list_repo_prs_workflow
-from src.github.get_pr import get_pr_workflow
-from src.github.get_pr_files import get_pr_files_workflow
-from src.github.get_repo import get_repo_workflow
-from src.github.search_discussions import search_discussions_workflow
-from src.github.list_discussions import list_discussions_workflow
-from src.github.get_discussion import get_discussion_workflow
-from src.github.list_commits import list_commits_workflow
-from src.github.compare_commits import compare_commits_workflow
-from src.github.list_releases import list_releases_workflow
+from src.github.metrics import measure_workflow
+
+TOOL_WORKERS = 32
 
 mcp = FastMCP("GitHub")
+TOOL_EXECUTOR = ThreadPoolExecutor(max_workers=TOOL_WORKERS, thread_name_prefix="github-tool")
+LAZY_FUNCTIONS = {}
+LAZY_LOCK = threading.Lock()
+
+
+# Stand-in for a function in a tool module, imported on first call so startup only pays for FastMCP;
+# keeps the function name so measure_workflow attributes metrics to the right tool
+def lazy_import(module: str, name: str):
+    def load(*args):
+        return resolve_lazy(module, name)(*args)
+    load.__name__ = name
+    return load
+
+
+# Import a tool module once; first loads are serialized so concurrent first calls cannot deadlock on shared imports
+def resolve_lazy(module: str, name: str):
+    function = LAZY_FUNCTIONS.get((module, name))
+    if function is None:
+        with LAZY_LOCK:
+            function = getattr(importlib.import_module(module), name)
+            LAZY_FUNCTIONS[(module, name)] = function
+    return function
+
+
+search_repos_workflow = lazy_import("src.github.search_repos", "search_repos_workflow")
+search_code_workflow = lazy_import("src.github.search_code", "search_code_workflow")
+get_repo_tree_workflow = lazy_import("src.github.get_repo_tree", "get_repo_tree_workflow")
+get_file_content_workflow = lazy_import("src.github.get_file_content", "get_file_content_workflow")
+grep_file_workflow = lazy_import("src.github.grep_file", "grep_file_workflow")
+grep_repo_workflow = lazy_import("src.github.grep_repo", "grep_repo_workflow")
+search_items_workflow = lazy_import("src.github.search_items", "search_items_workflow")
+get_issue_workflow = lazy_import("src.github.get_issue", "get_issue_workflow")
+get_issue_comments_workflow = lazy_import("src.github.get_issue_comments", "get_issue_comments_workflow")
+get_issues_workflow = lazy_import("src.github.get_issues", "get_issues_workflow")
+list_repo_prs_workflow = lazy_import("src.github.list_repo_prs", "list_repo_prs_workflow")
+get_pr_workflow = lazy_import("src.github.get_pr", "get_pr_workflow")
+get_pr_files_workflow = lazy_import("src.github.get_pr_files", "get_pr_files_workflow")
+get_pr_bundle_workflow = lazy_import("src.github.get_pr_bundle", "get_pr_bundle_workflow")
+get_prs_workflow = lazy_import("src.github.get_prs", "get_prs_workflow")
+get_issue_thread_workflow = lazy_import("src.github.get_issue_thread", "get_issue_thread_workflow")
+get_repo_workflow = lazy_import("src.github.get_repo", "get_repo_workflow")
+search_discussions_workflow = lazy_import("src.github.search_discussions", "search_discussions_workflow")
+list_discussions_workflow = lazy_import("src.github.list_discussions", "list_discussions_workflow")
+get_discussion_workflow = lazy_import("src.github.get_discussion", "get_discussion_workflow")
+list_commits_workflow = lazy_import("src.github.list_commits", "list_commits_workflow")
+compare_commits_workflow = lazy_import("src.github.compare_commits", "compare_commits_workflow")
+list_releases_workflow = lazy_import("src.github.list_releases", "list_releases_workflow")
+mirror_repo_workflow = lazy_import("src.github.mirror", "mirror_repo_workflow")
+next_page_workflow = lazy_import("src.github.next_page", "next_page_workflow")
+server_stats_workflow = lazy_import("src.github.server_stats", "server_stats_workflow")
+stats_json = lazy_import("src.github.server_stats", "stats_json")
+
+
+# Run blocking workflow on the tool executor so concurrent calls overlap their network waits; measured per tool
+async def run_workflow(workflow, *args) -> list[TextContent]:
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(TOOL_EXECUTOR, measure_workflow, workflow, *args)
 
 
 # TOOLS
 
 @mcp.tool
-def search_repos(
+async def search_repos(
     query: str,
     sort_by: Literal["stars", "forks", "updated", "best_match"] = "best_match"
 ) -> list[TextContent]:
     """Search repos. Use when user wants to find projects, libraries, or frameworks."""
-    return search_repos_workflow(query, sort_by)
+    return await run_workflow(search_repos_workflow, query, sort_by)
 
 
 @mcp.tool
-def search_code(query: str) -> list[TextContent]:
+async def search_code(query: str) -> list[TextContent]:
     """Search code. Use to find implementation patterns or usage examples across GitHub."""
-    return search_code_workflow(query)
+    return await run_workflow(search_code_workflow, query)
 
 
 @mcp.tool
-def get_repo_tree(owner: str, repo: str, path: str = "", depth: int = -1, pattern: str = "") -> list[TextContent]:
+async def get_repo_tree(owner: str, repo: str, path: str = "", depth: int = -1, pattern: str = "") -> list[TextContent]:
     """Get repo tree. Use to browse repository structure before reading specific files."""
-    return get_repo_tree_workflow(owner, repo, path, depth, pattern)
+    return await run_workflow(get_repo_tree_workflow, owner, repo, path, depth, pattern)
 
 
 @mcp.tool
-def get_file_content(owner: str, repo: str, path: str, metadata_only: bool = False, offset: int = 0, limit: int = 0) -> list[TextContent]:
+async def get_file_content(owner: str, repo: str, path: str, metadata_only: bool = False, offset: int = 0, limit: int = 0) -> list[TextContent]:
     """Get file content. Use after browsing repo tree to read specific files."""
-    return get_file_content_workflow(owner, repo, path, metadata_only, offset, limit)
+    return await run_workflow(get_file_content_workflow, owner, repo, path, metadata_only, offset, limit)
 
 
 @mcp.tool
-def grep_file(owner: str, repo: str, path: str, pattern: str, context_lines: int = 0, max_matches: int = 50) -> list[TextContent]:
-    """Search file content by regex pattern. Use to find specific lines without downloading entire file."""
-    return grep_file_workflow(owner, repo, path, pattern, context_lines, max_matches)
+async def grep_file(
+    owner: str,
+    repo: str,
+    path: str,
+    pattern: str,
+    context_lines: int = 0,
+    max_matches: int = 50,
+    fixed_string: bool = False,
+    ignore_case: bool = False
+) -> list[TextContent]:
+    """Search file content by regex pattern. Use to find specific lines without downloading entire file. fixed_string=True matches the pattern literally."""
+    return await run_workflow(grep_file_workflow, owner, repo, path, pattern, context_lines, max_matches, fixed_string, ignore_case)
 
 
 @mcp.tool
-def grep_repo(owner: str, repo: str, pattern: str, file_pattern: str = "*.csv", path: str = "", max_files: int = 10) -> list[TextContent]:
-    """Search file content across repo by file pattern. Use when search_code fails on data files."""
-    return grep_repo_workflow(owner, repo, pattern, file_pattern, path, max_files)
+async def grep_repo(
+    owner: str,
+    repo: str,
+    pattern: str,
+    file_pattern: str = "*.csv",
+    path: str = "",
+    max_files: int = 10,
+    mode: Literal["api", "archive", "index"] = "api",
+    fixed_string: bool = False,
+    ignore_case: bool = False
+) -> list[TextContent]:
+    """Search file content across repo by file pattern. Use when search_code fails on data files. mode="archive" scans the whole repo tarball in one request; mode="index" builds a local trigram index once per commit so repeated searches are instant."""
+    return await run_workflow(grep_repo_workflow, owner, repo, pattern, file_pattern, path, max_files, mode, fixed_string, ignore_case)
 
 
 @mcp.tool
-def search_items(
+async def search_items(
     query: str,
     type: Literal["issue", "pr"],
     sort_by: Literal["comments", "reactions", "created", "updated", "best_match"] = "best_match"
 ) -> list[TextContent]:
     """Search issues or PRs. Use to find bug reports, feature requests, or code changes."""
-    return search_items_workflow(query, type, sort_by)
+    return await run_workflow(search_items_workflow, query, type, sort_by)
 
 
 @mcp.tool
-def get_issue(owner: str, repo: str, issue_number: int) -> list[TextContent]:
+async def get_issue(owner: str, repo: str, issue_number: int) -> list[TextContent]:
     """Get issue. Use to read full issue details including description."""
-    return get_issue_workflow(owner, repo, issue_number)
+    return await run_workflow(get_issue_workflow, owner, repo, issue_number)
 
 
 @mcp.tool
-def get_issue_comments(owner: str, repo: str, issue_number: int) -> list[TextContent]:
+async def get_issue_comments(owner: str, repo: str, issue_number: int) -> list[TextContent]:
     """Get issue comments. Use to read the discussion thread on an issue."""
-    return get_issue_comments_workflow(owner, repo, issue_number)
+    return await run_workflow(get_issue_comments_workflow, owner, repo, issue_number)
 
 
 @mcp.tool
-def list_repo_prs(
+async def get_issue_thread(owner: str, repo: str, issue_number: int, limit: int = 100) -> list[TextContent]:
+    """Get issue with comments in one call. Use instead of get_issue + get_issue_comments to read a whole thread."""
+    return await run_workflow(get_issue_thread_workflow, owner, repo, issue_number, limit)
+
+
+@mcp.tool
+async def get_issues(refs: list[str], owner: str = "", repo: str = "") -> list[TextContent]:
+    """Get many issues in one call. Use after search_items instead of repeated get_issue; refs are "owner/repo#123" or bare numbers with owner/repo."""
+    return await run_workflow(get_issues_workflow, refs, owner, repo)
+
+
+@mcp.tool
+async def list_repo_prs(
     owner: str,
     repo: str,
     state: Literal["open", "closed", "all"] = "open",
     sort_by: Literal["created", "updated", "popularity", "long-running"] = "created"
 ) -> list[TextContent]:
     """List repo PRs. Use to see recent activity or pending changes in a repository."""
-    return list_repo_prs_workflow(owner, repo, state, sort_by)
+    return await run_workflow(list_repo_prs_workflow, owner, repo, state, sort_by)
 
 
 @mcp.tool
-def get_pr(owner: str, repo: str, pull_number: int) -> list[TextContent]:
+async def get_pr(owner: str, repo: str, pull_number: int) -> list[TextContent]:
     """Get PR. Use to read PR details including description and merge status."""
-    return get_pr_workflow(owner, repo, pull_number)
+    return await run_workflow(get_pr_workflow, owner, repo, pull_number)
 
 
 @mcp.tool
-def get_pr_files(owner: str, repo: str, pull_number: int) -> list[TextContent]:
+async def get_pr_files(owner: str, repo: str, pull_number: int) -> list[TextContent]:
     """Get PR files. Use to see which files were changed in a pull request."""
-    return get_pr_files_workflow(owner, repo, pull_number)
+    return await run_workflow(get_pr_files_workflow, owner, repo, pull_number)
+
+
+@mcp.tool
+async def get_pr_bundle(owner: str, repo: str, pull_number: int, limit: int = 100) -> list[TextContent]:
+    """Get PR with files, reviews and comments in one call. Use instead of get_pr + get_pr_files to review a pull request."""
+    return await run_workflow(get_pr_bundle_workflow, owner, repo, pull_number, limit)
+
+
+@mcp.tool
+async def get_prs(refs: list[str], owner: str = "", repo: str = "") -> list[TextContent]:
+    """Get many PRs in one call. Use after search_items instead of repeated get_pr; refs are "owner/repo#123" or bare numbers with owner/repo."""
+    return await run_workflow(get_prs_workflow, refs, owner, repo)
 
 
 @mcp.tool
-def get_repo(owner: str, repo: str) -> list[TextContent]:
+async def get_repo(owner: str, repo: str) -> list[TextContent]:
     """Get repo metadata. Use to read repository details including topics and license."""
-    return get_repo_workflow(owner, repo)
+    return await run_workflow(get_repo_workflow, owner, repo)
 
 
 @mcp.tool
-def search_discussions(query: str, first: int = 10) -> list[TextContent]:
+async def search_discussions(query: str, first: int = 10) -> list[TextContent]:
     """Search discussions. Use to find Q&A, ideas, or community conversations across GitHub."""
-    return search_discussions_workflow(query, first)
+    return await run_workflow(search_discussions_workflow, query, first)
 
 
 @mcp.tool
-def list_discussions(
+async def list_discussions(
     owner: str,
     repo: str,
     first: int = 10,
@@ -133,23 +221,24 @@ def list_discussions(
     answered: bool | None = None
 ) -> list[TextContent]:
     """List repo discussions. Use to browse discussions in a specific repository."""
-    return list_discussions_workflow(owner, repo, first, category, answered)
+    return await run_workflow(list_discussions_workflow, owner, repo, first, category, answered)
 
 
 @mcp.tool
-def get_discussion(
+async def get_discussion(
     owner: str,
     repo: str,
     number: int,
     comment_limit: int = 50,
-    comment_sort: Literal["upvotes", "chronological"] = "upvotes"
+    comment_sort: Literal["upvotes", "chronological"] = "upvotes",
+    reply_limit: int = 5
 ) -> list[TextContent]:
     """Get discussion. Use to read full discussion with comments sorted by upvotes."""
-    return get_discussion_workflow(owner, repo, number, comment_limit, comment_sort)
+    return await run_workflow(get_discussion_workflow, owner, repo, number, comment_limit, comment_sort, reply_limit)
 
 
 @mcp.tool
-def list_commits(
+async def list_commits(
     owner: str,
     repo: str,
     sha: str = "",
@@ -158,28 +247,54 @@ def list_commits(
     per_page: int = 20
 ) -> list[TextContent]:
     """List commits. Use to browse commit history or find when changes were introduced."""
-    return list_commits_workflow(owner, repo, sha, path, author, per_page)
+    return await run_workflow(list_commits_workflow, owner, repo, sha, path, author, per_page)
 
 
 @mcp.tool
-def compare_commits(
+async def compare_commits(
     owner: str,
     repo: str,
     base: str,
     head: str
 ) -> list[TextContent]:
     """Compare two branches, tags, or SHAs. Use to see changes between versions."""
-    return compare_commits_workflow(owner, repo, base, head)
+    return await run_workflow(compare_commits_workflow, owner, repo, base, head)
 
 
 @mcp.tool
-def list_releases(
+async def list_releases(
     owner: str,
     repo: str,
     per_page: int = 10
 ) -> list[TextContent]:
     """List releases. Use to find versions, changelogs, or breaking changes."""
-    return list_releases_workflow(owner, repo, per_page)
+    return await run_workflow(list_releases_workflow, owner, repo, per_page)
+
+
+@mcp.tool
+async def mirror_repo(owner: str, repo: str) -> list[TextContent]:
+    """Create or refresh a local blob-less git mirror. Use before heavy tree/file/grep research on one repo; those tools then read from the mirror."""
+    return await run_workflow(mirror_repo_workflow, owner, repo)
+
+
+@mcp.tool
+async def next_page(cursor: str) -> list[TextContent]:
+    """Continue a truncated result. Use with the cursor from a [next_page: cursor="..."] hint; served from memory without refetching."""
+    return await run_workflow(next_page_workflow, cursor)
+
+
+@mcp.tool
+async def server_stats() -> list[TextContent]:
+    """Server metrics: per-tool latency p50/p95/p99, upstream calls by endpoint, bytes, cache hit ratios, rate limits. Use to diagnose slow tools."""
+    return await run_workflow(server_stats_workflow)
+
+
+# RESOURCES
+
+@mcp.resource("stats://server", mime_type="application/json")
+def server_stats_resource() -> str:
+    """Server metrics as JSON (same data as the server_stats tool)."""
+    return stats_json()
 
 
 if __name__ == "__main__":
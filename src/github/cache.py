@@ -0,0 +1,72 @@
+# INFRASTRUCTURE
+import threading
+import time
+from collections import OrderedDict
+from src.github.metrics import record_cache_lookup
+
+
+# FUNCTIONS
+
+# Create LRU cache bounded by total entry size, with optional TTL in seconds; named caches report per-tool hit ratios
+def create_cache(max_bytes: int, ttl: float = 0, name: str = "") -> dict:
+    return {
+        "name": name,
+        "entries": OrderedDict(),
+        "bytes": 0,
+        "max_bytes": max_bytes,
+        "ttl": ttl,
+        "lock": threading.Lock(),
+        "stats": {"hits": 0, "misses": 0, "evictions": 0}
+    }
+
+
+# Look up entry and mark it recently used; returns None on miss or expiry
+def cache_get(cache: dict, key):
+    with cache["lock"]:
+        entry = cache["entries"].get(key)
+        if entry is not None and cache["ttl"] and time.monotonic() - entry[2] > cache["ttl"]:
+            del cache["entries"][key]
+            cache["bytes"] -= entry[1]
+            entry = None
+        if entry is None:
+            cache["stats"]["misses"] += 1
+        else:
+            cache["entries"].move_to_end(key)
+            cache["stats"]["hits"] += 1
+    if cache["name"]:
+        record_cache_lookup(cache["name"], entry is not None)
+    return None if entry is None else entry[0]
+
+
+# Store entry and evict least recently used entries beyond the size budget
+def cache_put(cache: dict, key, value, size: int = 1) -> None:
+    if size > cache["max_bytes"]:
+        return
+    with cache["lock"]:
+        old = cache["entries"].pop(key, None)
+        if old is not None:
+            cache["bytes"] -= old[1]
+        cache["entries"][key] = (value, size, time.monotonic())
+        cache["bytes"] += size
+        while cache["bytes"] > cache["max_bytes"]:
+            _, (_, evicted_size, _) = cache["entries"].popitem(last=False)
+            cache["bytes"] -= evicted_size
+            cache["stats"]["evictions"] += 1
+
+
+# Increment a named counter on the cache
+def cache_count(cache: dict, name: str, amount: int = 1) -> None:
+    with cache["lock"]:
+        cache["stats"][name] = cache["stats"].get(name, 0) + amount
+
+
+# Snapshot counters plus current entry count and byte usage
+def cache_stats(cache: dict) -> dict:
+    with cache["lock"]:
+        stats = dict(cache["stats"])
+        stats["entries"] = len(cache["entries"])
+        stats["bytes"] = cache["bytes"]
+        stats["max_bytes"] = cache["max_bytes"]
+    lookups = stats["hits"] + stats["misses"]
+    stats["hit_ratio"] = round(stats["hits"] / lookups, 3) if lookups else 0.0
+    return stats
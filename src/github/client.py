@@ -1,15 +1,48 @@
 # INFRASTRUCTURE
 import os
+import time
+import random
+import hashlib
+import threading
+import requests
+from urllib.parse import urlparse, parse_qs
+from concurrent.futures import Future, ThreadPoolExecutor
+from requests.adapters import HTTPAdapter
+from src.github.cache import create_cache, cache_get, cache_put, cache_count, cache_stats
+from src.github.rate_limit import classify_resource, acquire, record_response
+from src.github.metrics import record_upstream, with_tool_context
 
-GITHUB_API_BASE = "https://api.github.com"
+GITHUB_API_BASE = os.environ.get("GITHUB_API_BASE", "https://api.github.com").rstrip("/")
 GITHUB_TOKEN = os.environ.get("GITHUB_TOKEN", "") or os.environ.get("GH_TOKEN", "")
 RESULTS_PER_PAGE = 20
+DEFAULT_ACCEPT = "application/vnd.github+json"
+POOL_CONNECTIONS = 4
+POOL_MAXSIZE = 32
+RESPONSE_CACHE_BYTES = int(os.environ.get("GITHUB_RESPONSE_CACHE_BYTES", str(64 * 1024 * 1024)))
+RETRY_STATUS = {429, 500, 502, 503, 504}
+MAX_RETRIES = int(os.environ.get("GITHUB_MAX_RETRIES", "3"))
+RETRY_BASE_DELAY = 0.5
+RETRY_MAX_DELAY = 8.0
+RETRY_BUDGET_SECONDS = float(os.environ.get("GITHUB_RETRY_BUDGET", "30"))
+CONNECT_TIMEOUT = float(os.environ.get("GITHUB_CONNECT_TIMEOUT", "10"))
+READ_TIMEOUT = float(os.environ.get("GITHUB_READ_TIMEOUT", "30"))
+MAX_PER_PAGE = 100
+PAGE_CONCURRENCY = int(os.environ.get("GITHUB_PAGE_CONCURRENCY", "4"))
+
+SESSION = None
+SESSION_LOCK = threading.Lock()
+RESPONSE_CACHE = create_cache(RESPONSE_CACHE_BYTES, name="responses")
+RETRY_STATS = {"retries": 0, "retried_calls": 0, "exhausted": 0, "reasons": {}}
+RETRY_LOCK = threading.Lock()
+IN_FLIGHT = {}
+IN_FLIGHT_LOCK = threading.Lock()
+SINGLE_FLIGHT_STATS = {"upstream_calls": 0, "coalesced": 0}
 
 
 # FUNCTIONS
 
 # Build headers with optional auth token
-def build_headers(accept: str = "application/vnd.github+json") -> dict:
+def build_headers(accept: str = DEFAULT_ACCEPT) -> dict:
     headers = {
         "Accept": accept,
         "X-GitHub-Api-Version": "2022-11-28"
@@ -17,3 +50,272 @@ def build_headers(accept: str = "application/vnd.github+json") -> dict:
     if GITHUB_TOKEN:
         headers["Authorization"] = f"Bearer {GITHUB_TOKEN}"
     return headers
+
+
+# Reject owner/repo values that are not single path segments; they are also used as local cache directory names
+def check_repo_ref(owner: str, repo: str) -> None:
+    for name in (owner, repo):
+        if not name or name in (".", "..") or "/" in name or "\\" in name or "\0" in name:
+            raise ValueError(f"Invalid repository '{owner}/{repo}'")
+
+
+# Create session with keep-alive connection pool shared by all hosts
+def build_session() -> requests.Session:
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=POOL_CONNECTIONS, pool_maxsize=POOL_MAXSIZE)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+# Return process-wide session, creating it on first use
+def get_session() -> requests.Session:
+    global SESSION
+    if SESSION is None:
+        with SESSION_LOCK:
+            if SESSION is None:
+                SESSION = build_session()
+    return SESSION
+
+
+# Send request under the rate-limit scheduler, retrying transient failures of idempotent calls.
+# Every attempt has a (connect, read) timeout so a stalled connection fails into the retry path instead of hanging
+def github_request(method: str, url: str, params: dict | None = None, headers: dict | None = None, json_body: dict | None = None, stream: bool = False) -> requests.Response:
+    resource = classify_resource(url)
+    retryable = method == "GET" or resource == "graphql"
+    deadline = time.monotonic() + RETRY_BUDGET_SECONDS
+    attempt = 0
+    while True:
+        acquire(resource)
+        started = time.perf_counter()
+        try:
+            response = get_session().request(method, url, params=params, headers=headers, json=json_body, stream=stream, timeout=(CONNECT_TIMEOUT, READ_TIMEOUT))
+        except (requests.ConnectionError, requests.Timeout) as error:
+            record_upstream(method, url, time.perf_counter() - started, 0, 0)
+            delay = retry_delay(attempt, None)
+            if not retryable or not within_retry_budget(attempt, delay, deadline):
+                raise
+            reason = type(error).__name__
+        else:
+            record_upstream(method, url, time.perf_counter() - started, response_size(response, stream), len(response.request.body or b""))
+            record_response(resource, response.headers, response.status_code)
+            reason = classify_retry(response)
+            delay = retry_delay(attempt, response.headers.get("Retry-After"))
+            if reason is None or not retryable or not within_retry_budget(attempt, delay, deadline):
+                response.raise_for_status()
+                return response
+            response.close()
+
+        record_retry(reason, attempt)
+        time.sleep(delay)
+        attempt += 1
+
+
+# Body bytes received; streamed bodies report Content-Length since they are read later
+def response_size(response: requests.Response, stream: bool) -> int:
+    if stream:
+        return int(response.headers.get("Content-Length", 0))
+    return len(response.content)
+
+
+# Return retry reason for transient failures (5xx, 429, secondary rate limit 403), else None
+def classify_retry(response: requests.Response) -> str | None:
+    if response.status_code in RETRY_STATUS:
+        return str(response.status_code)
+    if response.status_code == 403:
+        if "Retry-After" in response.headers or response.headers.get("X-RateLimit-Remaining") == "0":
+            return "403-rate-limit"
+        if "secondary rate limit" in response.text.lower():
+            return "403-rate-limit"
+    return None
+
+
+# Capped exponential backoff with full jitter; Retry-After takes precedence when present
+def retry_delay(attempt: int, retry_after: str | None) -> float:
+    if retry_after and retry_after.isdigit():
+        return float(retry_after)
+    return random.uniform(0, min(RETRY_MAX_DELAY, RETRY_BASE_DELAY * (2 ** attempt)))
+
+
+# Check per-call retry budget: attempt count and total time
+def within_retry_budget(attempt: int, delay: float, deadline: float) -> bool:
+    if attempt < MAX_RETRIES and time.monotonic() + delay <= deadline:
+        return True
+    with RETRY_LOCK:
+        RETRY_STATS["exhausted"] += 1
+    return False
+
+
+# Count retry by reason; first retry of a call also counts the call
+def record_retry(reason: str, attempt: int) -> None:
+    with RETRY_LOCK:
+        RETRY_STATS["retries"] += 1
+        RETRY_STATS["retried_calls"] += 1 if attempt == 0 else 0
+        RETRY_STATS["reasons"][reason] = RETRY_STATS["reasons"].get(reason, 0) + 1
+
+
+# Report retry counters to surface upstream flakiness
+def retry_stats() -> dict:
+    with RETRY_LOCK:
+        stats = dict(RETRY_STATS)
+        stats["reasons"] = dict(RETRY_STATS["reasons"])
+    return stats
+
+
+# GET REST resource with standard GitHub headers
+def github_get(url: str, params: dict | None = None, accept: str = DEFAULT_ACCEPT, stream: bool = False) -> requests.Response:
+    return github_request("GET", url, params=params, headers=build_headers(accept), stream=stream)
+
+
+# GET JSON resource; identical concurrent calls share one conditional upstream request
+def github_get_json(url: str, params: dict | None = None, accept: str = DEFAULT_ACCEPT):
+    return github_get_page(url, params, accept)[0]
+
+
+# GET JSON resource plus its parsed Link header (rel -> URL)
+def github_get_page(url: str, params: dict | None = None, accept: str = DEFAULT_ACCEPT) -> tuple:
+    key = build_cache_key(url, params, accept)
+    return single_flight(("GET",) + key, lambda: fetch_json_conditional(url, params, accept, key))
+
+
+# Yield items across pages following Link headers, stopping at max_items
+def paginate(url: str, params: dict | None = None, max_items: int | None = None, per_page: int = MAX_PER_PAGE, accept: str = DEFAULT_ACCEPT):
+    if max_items is not None:
+        per_page = max(1, min(per_page, max_items))
+    max_pages = -(-max_items // per_page) if max_items is not None else None
+    yielded = 0
+    for body in iter_pages(url, dict(params or {}, per_page=per_page), accept, max_pages):
+        for item in body:
+            if max_items is not None and yielded >= max_items:
+                return
+            yield item
+            yielded += 1
+
+
+# Yield page bodies in order. Once the first page reveals the last page number, the remaining
+# pages are fetched PAGE_CONCURRENCY at a time; otherwise rel="next" links are followed one by one
+def iter_pages(url: str, params: dict, accept: str, max_pages: int | None):
+    body, links = github_get_page(url, params, accept)
+    yield body
+
+    last_page = page_number(links.get("last"))
+    if last_page is None:
+        fetched = 1
+        while links.get("next") and (max_pages is None or fetched < max_pages):
+            body, links = github_get_page(links["next"], None, accept)
+            fetched += 1
+            yield body
+        return
+
+    if max_pages is not None:
+        last_page = min(last_page, max_pages)
+    pages = list(range(2, last_page + 1))
+    with ThreadPoolExecutor(max_workers=PAGE_CONCURRENCY) as pool:
+        for start in range(0, len(pages), PAGE_CONCURRENCY):
+            window = pages[start:start + PAGE_CONCURRENCY]
+            for body, _ in pool.map(with_tool_context(lambda page: github_get_page(url, dict(params, page=page), accept)), window):
+                yield body
+
+
+# Page number from a Link URL's page query parameter
+def page_number(link: str | None) -> int | None:
+    if not link:
+        return None
+    pages = parse_qs(urlparse(link).query).get("page")
+    return int(pages[0]) if pages else None
+
+
+# Fetch JSON and Link header, revalidating cached copies with If-None-Match / If-Modified-Since
+def fetch_json_conditional(url: str, params: dict | None, accept: str, key: tuple) -> tuple:
+    cached = cache_get(RESPONSE_CACHE, key)
+    headers = build_headers(accept)
+    if cached is not None:
+        if cached["etag"]:
+            headers["If-None-Match"] = cached["etag"]
+        elif cached["last_modified"]:
+            headers["If-Modified-Since"] = cached["last_modified"]
+
+    response = github_request("GET", url, params=params, headers=headers)
+    if response.status_code == 304 and cached is not None:
+        cache_count(RESPONSE_CACHE, "not_modified")
+        return cached["body"], cached["links"]
+
+    body = response.json()
+    links = {rel: link["url"] for rel, link in response.links.items()}
+    etag = response.headers.get("ETag", "")
+    last_modified = response.headers.get("Last-Modified", "")
+    if etag or last_modified:
+        entry = {"etag": etag, "last_modified": last_modified, "body": body, "links": links}
+        cache_put(RESPONSE_CACHE, key, entry, len(response.content))
+    return body, links
+
+
+# Build response cache key from URL, sorted params, media type and token fingerprint
+def build_cache_key(url: str, params: dict | None, accept: str) -> tuple:
+    param_items = tuple(sorted((k, str(v)) for k, v in (params or {}).items()))
+    return (url, param_items, accept, token_fingerprint())
+
+
+# Short SHA-256 fingerprint of the token so keys never hold the credential itself
+def token_fingerprint() -> str:
+    return hashlib.sha256(GITHUB_TOKEN.encode()).hexdigest()[:16] if GITHUB_TOKEN else ""
+
+
+# Run fetch once per key among concurrent callers; followers wait and share the parsed result
+def single_flight(key: tuple, fetch):
+    with IN_FLIGHT_LOCK:
+        future = IN_FLIGHT.get(key)
+        leader = future is None
+        if leader:
+            future = Future()
+            IN_FLIGHT[key] = future
+            SINGLE_FLIGHT_STATS["upstream_calls"] += 1
+        else:
+            SINGLE_FLIGHT_STATS["coalesced"] += 1
+
+    if not leader:
+        return future.result()
+
+    try:
+        result = fetch()
+    except BaseException as error:
+        future.set_exception(error)
+        raise
+    finally:
+        with IN_FLIGHT_LOCK:
+            IN_FLIGHT.pop(key, None)
+    future.set_result(result)
+    return result
+
+
+# Report upstream calls made vs callers served by an in-flight request
+def single_flight_stats() -> dict:
+    with IN_FLIGHT_LOCK:
+        return dict(SINGLE_FLIGHT_STATS)
+
+
+# Report conditional cache counters: hits (revalidated), misses, 304s served from cache
+def response_cache_stats() -> dict:
+    return cache_stats(RESPONSE_CACHE)
+
+
+# Report connection pool usage: opened connections vs requests served
+def pool_stats() -> dict:
+    adapters = {id(adapter): adapter for adapter in get_session().adapters.values()}
+    pools = []
+    for adapter in adapters.values():
+        container = adapter.poolmanager.pools
+        pools.extend(container[key] for key in container.keys())
+
+    opened = sum(pool.num_connections for pool in pools)
+    served = sum(pool.num_requests for pool in pools)
+    idle = sum(1 for pool in pools if pool.pool is not None for conn in list(pool.pool.queue) if conn is not None)
+    reused = max(served - opened, 0)
+    return {
+        "pools": len(pools),
+        "connections_opened": opened,
+        "idle_connections": idle,
+        "requests": served,
+        "reused_requests": reused,
+        "reuse_ratio": round(reused / served, 3) if served else 0.0
+    }
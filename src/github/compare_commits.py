@@ -1,16 +1,17 @@
 # INFRASTRUCTURE
-import requests
 from mcp.types import TextContent
-from src.github.client import GITHUB_API_BASE, build_headers
+from src.github.client import GITHUB_API_BASE, github_get_json
+from src.github.result_store import store_result, cursor_hint
 
 MAX_COMMITS_DISPLAY = 20
 MAX_FILES_DISPLAY = 30
+FILE_STATUS_ICONS = {"added": "A", "removed": "D", "modified": "M", "renamed": "R"}
 
 
 # ORCHESTRATOR
 def compare_commits_workflow(owner: str, repo: str, base: str, head: str) -> list[TextContent]:
     raw_data = fetch_comparison(owner, repo, base, head)
-    formatted = format_comparison(raw_data)
+    formatted = format_comparison(raw_data, (owner, repo, base, head))
     return [TextContent(type="text", text=formatted)]
 
 
@@ -19,13 +20,11 @@ def compare_commits_workflow(owner: str, repo: str, base: str, head: str) -> lis
 # Fetch comparison between two refs
 def fetch_comparison(owner: str, repo: str, base: str, head: str) -> dict:
     url = f"{GITHUB_API_BASE}/repos/{owner}/{repo}/compare/{base}...{head}"
-    response = requests.get(url, headers=build_headers())
-    response.raise_for_status()
-    return response.json()
+    return github_get_json(url)
 
 
-# Format comparison for display
-def format_comparison(data: dict) -> str:
+# Format comparison for display; commits and files past the display limits stay pageable via next_page cursors
+def format_comparison(data: dict, compare_key: tuple = ()) -> str:
     status = data.get("status", "unknown")
     ahead = data.get("ahead_by", 0)
     behind = data.get("behind_by", 0)
@@ -45,23 +44,34 @@ def format_comparison(data: dict) -> str:
     if commits:
         lines.append("## Commits")
         for idx, c in enumerate(commits[:MAX_COMMITS_DISPLAY], 1):
-            sha_short = c["sha"][:7]
-            message = c["commit"]["message"].splitlines()[0][:80]
-            lines.append(f"{idx}. {sha_short} — {message}")
+            lines.append(format_commit_line(idx, c))
         if len(commits) > MAX_COMMITS_DISPLAY:
-            lines.append(f"   ... and {len(commits) - MAX_COMMITS_DISPLAY} more commits")
+            result_id = store_result(("compare_commits",) + compare_key, f"Commits {base_sha}...{head_sha}", commits, format_commit_line)
+            lines.append(f"   ... and {len(commits) - MAX_COMMITS_DISPLAY} more commits {cursor_hint(result_id, MAX_COMMITS_DISPLAY)}")
         lines.append("")
 
     if files:
         lines.append(f"## Files Changed ({len(files)})")
-        status_icons = {"added": "A", "removed": "D", "modified": "M", "renamed": "R"}
-        for f in files[:MAX_FILES_DISPLAY]:
-            icon = status_icons.get(f["status"], f["status"][0].upper())
-            name = f["filename"]
-            if f["status"] == "renamed" and f.get("previous_filename"):
-                name = f"{f['previous_filename']} -> {f['filename']}"
-            lines.append(f"  [{icon}] {name} (+{f['additions']} -{f['deletions']})")
+        for idx, f in enumerate(files[:MAX_FILES_DISPLAY], 1):
+            lines.append(format_file_line(idx, f))
         if len(files) > MAX_FILES_DISPLAY:
-            lines.append(f"  ... and {len(files) - MAX_FILES_DISPLAY} more files")
+            result_id = store_result(("compare_files",) + compare_key, f"Files changed {base_sha}...{head_sha}", files, format_file_line)
+            lines.append(f"  ... and {len(files) - MAX_FILES_DISPLAY} more files {cursor_hint(result_id, MAX_FILES_DISPLAY)}")
 
     return "\n".join(lines)
+
+
+# One numbered commit line
+def format_commit_line(position: int, commit: dict) -> str:
+    sha_short = commit["sha"][:7]
+    message = commit["commit"]["message"].splitlines()[0][:80]
+    return f"{position}. {sha_short} — {message}"
+
+
+# One changed-file line with status icon and line counts
+def format_file_line(position: int, f: dict) -> str:
+    icon = FILE_STATUS_ICONS.get(f["status"], f["status"][0].upper())
+    name = f["filename"]
+    if f["status"] == "renamed" and f.get("previous_filename"):
+        name = f"{f['previous_filename']} -> {f['filename']}"
+    return f"  [{icon}] {name} (+{f['additions']} -{f['deletions']})"
@@ -1,37 +1,34 @@
 # INFRASTRUCTURE
 from typing import Literal
+from concurrent.futures import ThreadPoolExecutor
 from mcp.types import TextContent
-from src.github.graphql_client import graphql_query
+from src.github.graphql_client import BATCH_CONCURRENCY, graphql_collect, graphql_connection
+from src.github.metrics import with_tool_context
+
+MAX_COMMENTS = 1000
+MAX_REPLIES = 100
+INLINE_REPLIES = 5
 
 DISCUSSION_QUERY = """
-query($owner: String!, $repo: String!, $number: Int!, $commentLimit: Int!) {
+query($owner: String!, $repo: String!, $number: Int!, $first: Int!, $details: Boolean!,
+      $commentsPage: Boolean!, $commentsAfter: String, $replyFirst: Int!) {
   repository(owner: $owner, name: $repo) {
     discussion(number: $number) {
-      title
-      body
-      author { login }
-      category { name emoji isAnswerable }
-      upvoteCount
-      createdAt
-      updatedAt
-      isAnswered
-      answer {
-        body
-        author { login }
-        createdAt
-        upvoteCount
-        url
-      }
-      comments(first: $commentLimit) {
+      ...DiscussionDetails @include(if: $details)
+      comments(first: $first, after: $commentsAfter) @include(if: $commentsPage) {
         totalCount
+        pageInfo { hasNextPage endCursor }
         nodes {
+          id
           body
           author { login }
           createdAt
           isAnswer
           upvoteCount
           url
-          replies(first: 5) {
+          replies(first: $replyFirst) {
+            totalCount
+            pageInfo { hasNextPage endCursor }
             nodes {
               body
               author { login }
@@ -44,6 +41,42 @@ query($owner: String!, $repo: String!, $number: Int!, $commentLimit: Int!) {
     }
   }
 }
+
+fragment DiscussionDetails on Discussion {
+  title
+  body
+  author { login }
+  category { name emoji isAnswerable }
+  upvoteCount
+  createdAt
+  updatedAt
+  isAnswered
+  answer {
+    body
+    author { login }
+    createdAt
+    upvoteCount
+    url
+  }
+}
+"""
+
+REPLIES_QUERY = """
+query($id: ID!, $first: Int!, $after: String) {
+  node(id: $id) {
+    ... on DiscussionComment {
+      replies(first: $first, after: $after) {
+        pageInfo { hasNextPage endCursor }
+        nodes {
+          body
+          author { login }
+          createdAt
+          upvoteCount
+        }
+      }
+    }
+  }
+}
 """
 
 
@@ -53,24 +86,33 @@ def get_discussion_workflow(
     repo: str,
     number: int,
     comment_limit: int = 50,
-    comment_sort: Literal["upvotes", "chronological"] = "upvotes"
+    comment_sort: Literal["upvotes", "chronological"] = "upvotes",
+    reply_limit: int = INLINE_REPLIES
 ) -> list[TextContent]:
-    raw_data = fetch_discussion(owner, repo, number, comment_limit)
-    formatted = format_discussion(raw_data, comment_limit, comment_sort)
+    discussion = fetch_discussion(owner, repo, number, comment_limit, comment_sort, reply_limit)
+    formatted = format_discussion(discussion, comment_sort)
     return [TextContent(type="text", text=formatted)]
 
 
 # FUNCTIONS
 
-# Fetch single discussion with comments
-def fetch_discussion(owner: str, repo: str, number: int, comment_limit: int) -> dict:
+# Fetch discussion with comments paged by cursor; upvote sorting reads up to MAX_COMMENTS so it ranks the
+# whole thread, chronological order stops at comment_limit. Only the shown comments get their remaining replies
+def fetch_discussion(owner: str, repo: str, number: int, comment_limit: int, comment_sort: str, reply_limit: int) -> dict | None:
+    budget = MAX_COMMENTS if comment_sort == "upvotes" else min(comment_limit, MAX_COMMENTS)
+    reply_limit = max(0, min(reply_limit, MAX_REPLIES))
     variables = {
         "owner": owner,
         "repo": repo,
         "number": number,
-        "commentLimit": min(comment_limit, 100)
+        "replyFirst": max(1, min(reply_limit, INLINE_REPLIES))
     }
-    return graphql_query(DISCUSSION_QUERY, variables)
+    discussion = graphql_collect(DISCUSSION_QUERY, variables, ("repository", "discussion"), ("comments",), max(1, budget))
+    if discussion is None:
+        return None
+    shown = sort_comments(discussion["comments"]["nodes"], comment_sort, comment_limit)
+    discussion["comments"]["nodes"] = fetch_replies(shown, reply_limit)
+    return discussion
 
 
 # Sort comments by upvotes or keep chronological
@@ -80,9 +122,25 @@ def sort_comments(comments: list, sort_by: str, limit: int) -> list:
     return comments[:limit]
 
 
+# Complete reply lists of the shown comments concurrently, each continuing from its inline replies' cursor
+def fetch_replies(comments: list, reply_limit: int) -> list:
+    with ThreadPoolExecutor(max_workers=BATCH_CONCURRENCY) as pool:
+        return list(pool.map(with_tool_context(lambda c: complete_replies(c, reply_limit)), comments))
+
+
+# Replies of one comment up to reply_limit, paging REPLIES_QUERY after the inline replies when more exist
+def complete_replies(comment: dict, reply_limit: int) -> dict:
+    replies = comment.get("replies") or {"totalCount": 0, "pageInfo": {"hasNextPage": False}, "nodes": []}
+    nodes = replies["nodes"][:reply_limit]
+    if replies["pageInfo"]["hasNextPage"] and len(nodes) < reply_limit:
+        more = graphql_connection(REPLIES_QUERY, {"id": comment["id"]}, ("node", "replies"), reply_limit - len(nodes), replies["pageInfo"]["endCursor"])
+        if more is not None:
+            nodes = nodes + more["nodes"]
+    return dict(comment, replies=dict(replies, nodes=nodes))
+
+
 # Format discussion for display
-def format_discussion(data: dict, comment_limit: int, comment_sort: str) -> str:
-    d = data["repository"]["discussion"]
+def format_discussion(d: dict | None, comment_sort: str) -> str:
     if not d:
         return "Discussion not found."
 
@@ -114,8 +172,7 @@ def format_discussion(data: dict, comment_limit: int, comment_sort: str) -> str:
     # Comments section
     comments_data = d.get("comments") or {}
     total_comments = comments_data.get("totalCount", 0)
-    comments = comments_data.get("nodes") or []
-    sorted_comments = sort_comments(comments, comment_sort, comment_limit)
+    sorted_comments = comments_data.get("nodes") or []
 
     sort_label = "by upvotes" if comment_sort == "upvotes" else "chronological"
     lines.append(f"### Comments ({total_comments} total, showing {len(sorted_comments)} {sort_label})\n")
@@ -127,10 +184,14 @@ def format_discussion(data: dict, comment_limit: int, comment_sort: str) -> str:
         lines.append(c.get("body", ""))
 
         # Replies
-        replies = (c.get("replies") or {}).get("nodes") or []
+        replies_data = c.get("replies") or {}
+        replies = replies_data.get("nodes") or []
         for r in replies:
             r_author = (r.get("author") or {}).get("login", "unknown")
             lines.append(f"  > **@{r_author}**: {r.get('body', '')} ({r.get('upvoteCount', 0)} upvotes)")
+        hidden_replies = replies_data.get("totalCount", 0) - len(replies)
+        if hidden_replies > 0:
+            lines.append(f"  > ({hidden_replies} more replies)")
 
         lines.append("")
 
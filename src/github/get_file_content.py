@@ -1,22 +1,37 @@
 # INFRASTRUCTURE
-import requests
+import os
 import base64
 from mcp.types import TextContent
-from src.github.client import GITHUB_API_BASE, build_headers
+from src.github.client import GITHUB_API_BASE, github_get, github_get_json
+from src.github.cache import create_cache, cache_get, cache_put, cache_stats
+from src.github.mirror import has_mirror, mirror_file
 
+BLOB_CACHE_BYTES = int(os.environ.get("GITHUB_BLOB_CACHE_BYTES", str(128 * 1024 * 1024)))
+PATH_CACHE_ENTRIES = 4096
+PATH_CACHE_TTL = int(os.environ.get("GITHUB_PATH_CACHE_TTL", "60"))
+CONTENTS_MAX_BYTES = 1024 * 1024
+RAW_ACCEPT = "application/vnd.github.raw+json"
+RAW_CHUNK_BYTES = 64 * 1024
 
-# ORCHESTRATOR
-def get_file_content_workflow(owner: str, repo: str, path: str, metadata_only: bool = False, offset: int = 0, limit: int = 0) -> list[TextContent]:
-    raw_response = fetch_file_content(owner, repo, path)
+BLOB_CACHE = create_cache(BLOB_CACHE_BYTES, name="blobs")
+PATH_CACHE = create_cache(PATH_CACHE_ENTRIES, ttl=PATH_CACHE_TTL, name="paths")
 
-    if isinstance(raw_response, list):
-        if metadata_only:
-            return [TextContent(type="text", text=format_dir_metadata(raw_response, path))]
-        raise ValueError(f"Path '{path}' is a directory, not a file. Use get_repo_tree or metadata_only=True.")
 
+# ORCHESTRATOR
+def get_file_content_workflow(owner: str, repo: str, path: str, metadata_only: bool = False, offset: int = 0, limit: int = 0) -> list[TextContent]:
     if metadata_only:
+        raw_response = lookup_file_metadata(owner, repo, path)
+        if isinstance(raw_response, list):
+            return [TextContent(type="text", text=format_dir_metadata(raw_response, path))]
         return [TextContent(type="text", text=format_metadata(raw_response))]
-    return [TextContent(type="text", text=format_file_response(raw_response, offset, limit))]
+
+    metadata, content = load_file(owner, repo, path, stream_large=True)
+    if isinstance(metadata, list):
+        raise ValueError(f"Path '{path}' is a directory, not a file. Use get_repo_tree or metadata_only=True.")
+    if content is None:
+        content_lines, total_lines = read_blob_window(owner, repo, metadata["sha"], offset, limit)
+        return [TextContent(type="text", text=format_file_lines(metadata, content_lines, total_lines, offset, limit))]
+    return [TextContent(type="text", text=format_file_response(metadata, content, offset, limit))]
 
 
 # FUNCTIONS
@@ -24,9 +39,136 @@ def get_file_content_workflow(owner: str, repo: str, path: str, metadata_only: b
 # Fetch file content from GitHub Contents API
 def fetch_file_content(owner: str, repo: str, path: str) -> dict:
     url = f"{GITHUB_API_BASE}/repos/{owner}/{repo}/contents/{path}"
-    response = requests.get(url, headers=build_headers())
-    response.raise_for_status()
-    return response.json()
+    return github_get_json(url)
+
+
+# Resolve file metadata from the path cache, falling back to the Contents API
+def lookup_file_metadata(owner: str, repo: str, path: str) -> dict | list:
+    if has_mirror(owner, repo):
+        return mirror_file(owner, repo, path)[0]
+    metadata = cache_get(PATH_CACHE, (owner, repo, path))
+    if metadata is not None:
+        return metadata
+    raw_response = fetch_file_content(owner, repo, path)
+    if isinstance(raw_response, list):
+        return raw_response
+    return remember_file(owner, repo, path, raw_response)
+
+
+# Load file metadata and raw bytes, serving repeat reads from the blob cache; text is decoded only when formatting.
+# Files over the Contents API limit are downloaded raw, or left to the caller (None) when stream_large
+def load_file(owner: str, repo: str, path: str, stream_large: bool = False) -> tuple[dict | list, bytes | None]:
+    if has_mirror(owner, repo):
+        metadata, data = mirror_file(owner, repo, path)
+        return (metadata, b"") if isinstance(metadata, list) else (metadata, data)
+
+    metadata = cache_get(PATH_CACHE, (owner, repo, path))
+    if metadata is not None:
+        content = cache_get(BLOB_CACHE, metadata["sha"])
+        if content is not None:
+            return metadata, content
+
+    raw_response = fetch_file_content(owner, repo, path)
+    if isinstance(raw_response, list):
+        return raw_response, b""
+
+    metadata = remember_file(owner, repo, path, raw_response)
+    content = cache_get(BLOB_CACHE, metadata["sha"])
+    if content is not None:
+        return metadata, content
+
+    if is_large_file(metadata):
+        if stream_large:
+            return metadata, None
+        content = fetch_raw_blob(owner, repo, metadata["sha"])
+    else:
+        content = decode_content(raw_response)
+    cache_put(BLOB_CACHE, metadata["sha"], content, len(content))
+    return metadata, content
+
+
+# Load raw bytes for a known blob SHA, skipping the network on cache hit
+def load_blob(owner: str, repo: str, path: str, sha: str) -> bytes | None:
+    content = cache_get(BLOB_CACHE, sha)
+    if content is not None:
+        return content
+    metadata, content = load_file(owner, repo, path)
+    if isinstance(metadata, list):
+        return None
+    return content
+
+
+# Record path -> metadata (without content) so later reads can find the blob SHA
+def remember_file(owner: str, repo: str, path: str, raw_response: dict) -> dict:
+    metadata = {key: value for key, value in raw_response.items() if key != "content"}
+    cache_put(PATH_CACHE, (owner, repo, path), metadata)
+    return metadata
+
+
+# Contents API omits content (encoding "none") for files over 1 MB
+def is_large_file(metadata: dict) -> bool:
+    return metadata.get("encoding") == "none" or metadata.get("size", 0) > CONTENTS_MAX_BYTES
+
+
+# Open raw byte stream of a blob via the Git Blobs API
+def open_raw_blob(owner: str, repo: str, sha: str):
+    url = f"{GITHUB_API_BASE}/repos/{owner}/{repo}/git/blobs/{sha}"
+    return github_get(url, accept=RAW_ACCEPT, stream=True)
+
+
+# Download whole blob as bytes (used when the caller needs the full content)
+def fetch_raw_blob(owner: str, repo: str, sha: str) -> bytes:
+    response = open_raw_blob(owner, repo, sha)
+    try:
+        return b"".join(response.iter_content(RAW_CHUNK_BYTES))
+    finally:
+        response.close()
+
+
+# Yield decoded lines of a streamed blob (same boundaries as str.split("\n")); closing the generator closes the connection
+def iter_blob_lines(owner: str, repo: str, sha: str):
+    response = open_raw_blob(owner, repo, sha)
+    try:
+        remainder = b""
+        for chunk in response.iter_content(RAW_CHUNK_BYTES):
+            parts = (remainder + chunk).split(b"\n")
+            remainder = parts.pop()
+            for part in parts:
+                yield part.decode("utf-8", errors="replace")
+        yield remainder.decode("utf-8", errors="replace")
+    finally:
+        response.close()
+
+
+# Stream blob and keep only the offset/limit line window; lines past the window are only counted
+def read_blob_window(owner: str, repo: str, sha: str, offset: int, limit: int) -> tuple[list[str], int]:
+    end = offset + limit if limit > 0 else None
+    window = []
+    newlines = 0
+    remainder = b""
+    response = open_raw_blob(owner, repo, sha)
+    try:
+        for chunk in response.iter_content(RAW_CHUNK_BYTES):
+            if end is not None and newlines >= end:
+                newlines += chunk.count(b"\n")
+                continue
+            parts = (remainder + chunk).split(b"\n")
+            remainder = parts.pop()
+            for part in parts:
+                if newlines >= offset and (end is None or newlines < end):
+                    window.append(part.decode("utf-8", errors="replace"))
+                newlines += 1
+    finally:
+        response.close()
+
+    if newlines >= offset and (end is None or newlines < end):
+        window.append(remainder.decode("utf-8", errors="replace"))
+    return window, newlines + 1
+
+
+# Report blob and path cache counters
+def blob_cache_stats() -> dict:
+    return {"blobs": cache_stats(BLOB_CACHE), "paths": cache_stats(PATH_CACHE)}
 
 
 # Format directory metadata from Contents API list response
@@ -52,13 +194,9 @@ def format_metadata(raw_response: dict) -> str:
     return "\n".join(lines)
 
 
-# Decode base64 content and format response with optional line range
-def format_file_response(raw_response: dict, offset: int = 0, limit: int = 0) -> str:
-    if raw_response.get("type") != "file":
-        raise ValueError(f"Path is not a file, got type: {raw_response.get('type')}")
-
-    decoded_content = decode_content(raw_response)
-    content_lines = decoded_content.split("\n")
+# Format file content with optional line range; invalid UTF-8 is replaced instead of failing the read
+def format_file_response(raw_response: dict, content: bytes, offset: int = 0, limit: int = 0) -> str:
+    content_lines = content.decode("utf-8", errors="replace").split("\n")
     total_lines = len(content_lines)
 
     if limit > 0:
@@ -66,6 +204,14 @@ def format_file_response(raw_response: dict, offset: int = 0, limit: int = 0) ->
     elif offset > 0:
         content_lines = content_lines[offset:]
 
+    return format_file_lines(raw_response, content_lines, total_lines, offset, limit)
+
+
+# Format file metadata and an already-selected line window
+def format_file_lines(raw_response: dict, content_lines: list[str], total_lines: int, offset: int = 0, limit: int = 0) -> str:
+    if raw_response.get("type") != "file":
+        raise ValueError(f"Path is not a file, got type: {raw_response.get('type')}")
+
     path = raw_response["path"]
     name = raw_response["name"]
     size = raw_response["size"]
@@ -88,12 +234,12 @@ def format_file_response(raw_response: dict, offset: int = 0, limit: int = 0) ->
     return "\n".join(lines)
 
 
-# Decode base64 file content to UTF-8 string
-def decode_content(raw_response: dict) -> str:
+# Decode base64 file content to raw bytes
+def decode_content(raw_response: dict) -> bytes:
     content = raw_response.get("content", "")
     encoding = raw_response.get("encoding", "")
 
     if encoding == "base64" and content:
         content_clean = content.replace("\n", "")
-        return base64.b64decode(content_clean).decode("utf-8")
-    return content
+        return base64.b64decode(content_clean)
+    return content.encode("utf-8")
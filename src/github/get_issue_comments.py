@@ -1,9 +1,11 @@
 # INFRASTRUCTURE
-import requests
 from mcp.types import TextContent
-from src.github.client import GITHUB_API_BASE, build_headers
+from src.github.client import GITHUB_API_BASE, paginate
+from src.github.result_store import store_result, cursor_hint
 
-COMMENTS_PER_PAGE = 30
+COMMENTS_PER_PAGE = 100
+MAX_COMMENTS = 500
+MAX_COMMENTS_DISPLAY = 20
 
 
 # ORCHESTRATOR
@@ -15,16 +17,13 @@ def get_issue_comments_workflow(owner: str, repo: str, issue_number: int) -> lis
 
 # FUNCTIONS
 
-# Fetch comments from GitHub API
+# Fetch comments across pages, up to MAX_COMMENTS
 def fetch_comments(owner: str, repo: str, issue_number: int) -> list:
     url = f"{GITHUB_API_BASE}/repos/{owner}/{repo}/issues/{issue_number}/comments"
-    params = {"per_page": COMMENTS_PER_PAGE}
-    response = requests.get(url, params=params, headers=build_headers())
-    response.raise_for_status()
-    return response.json()
+    return list(paginate(url, max_items=MAX_COMMENTS, per_page=COMMENTS_PER_PAGE))
 
 
-# Format comments for display
+# Format the first MAX_COMMENTS_DISPLAY comments for display; the full thread goes to the result store behind a next_page cursor
 def format_comments(comments: list, owner: str, repo: str, issue_number: int) -> str:
     lines = []
 
@@ -35,12 +34,24 @@ def format_comments(comments: list, owner: str, repo: str, issue_number: int) ->
         lines.append("No comments on this issue.")
         return "\n".join(lines)
 
-    for idx, comment in enumerate(comments, 1):
-        lines.append(f"--- Comment {idx} ---")
-        lines.append(f"Author: {comment['user']['login']}")
-        lines.append(f"Date: {comment['created_at']}")
-        lines.append("")
-        lines.append(comment.get("body") or "(Empty comment)")
-        lines.append("")
+    for idx, comment in enumerate(comments[:MAX_COMMENTS_DISPLAY], 1):
+        lines.append(format_comment(idx, comment))
 
+    if len(comments) > MAX_COMMENTS_DISPLAY:
+        size = sum(len(comment.get("body") or "") for comment in comments)
+        result_id = store_result(("issue_comments", owner, repo, issue_number), f"Comments on {owner}/{repo}#{issue_number}", comments, format_comment, size)
+        lines.append(f"... and {len(comments) - MAX_COMMENTS_DISPLAY} more comments {cursor_hint(result_id, MAX_COMMENTS_DISPLAY)}")
+
+    return "\n".join(lines)
+
+
+# One comment with author, date and body; also rendered by next_page
+def format_comment(position: int, comment: dict) -> str:
+    lines = []
+    lines.append(f"--- Comment {position} ---")
+    lines.append(f"Author: {comment['user']['login']}")
+    lines.append(f"Date: {comment['created_at']}")
+    lines.append("")
+    lines.append(comment.get("body") or "(Empty comment)")
+    lines.append("")
     return "\n".join(lines)
@@ -0,0 +1,91 @@
+# INFRASTRUCTURE
+from mcp.types import TextContent
+from src.github.graphql_client import graphql_collect
+from src.github.get_pr_bundle import format_bundle_comments
+
+MAX_ITEMS = 100
+
+ISSUE_THREAD_QUERY = """
+query($owner: String!, $repo: String!, $number: Int!, $first: Int!, $details: Boolean!,
+      $commentsPage: Boolean!, $commentsAfter: String) {
+  repository(owner: $owner, name: $repo) {
+    issue(number: $number) {
+      ...IssueDetails @include(if: $details)
+      comments(first: $first, after: $commentsAfter) @include(if: $commentsPage) {
+        totalCount
+        pageInfo { hasNextPage endCursor }
+        nodes {
+          author { login }
+          body
+          createdAt
+        }
+      }
+    }
+  }
+}
+
+fragment IssueDetails on Issue {
+  number
+  title
+  body
+  state
+  stateReason
+  author { login }
+  createdAt
+  updatedAt
+  closedAt
+  url
+  labels(first: 20) { nodes { name } }
+  assignees(first: 10) { nodes { login } }
+}
+"""
+
+
+# ORCHESTRATOR
+def get_issue_thread_workflow(owner: str, repo: str, issue_number: int, limit: int = MAX_ITEMS) -> list[TextContent]:
+    issue = fetch_issue_thread(owner, repo, issue_number, limit)
+    if issue is None:
+        raise ValueError(f"Issue {owner}/{repo}#{issue_number} not found")
+    formatted_string = format_issue_thread(issue)
+    return [TextContent(type="text", text=formatted_string)]
+
+
+# FUNCTIONS
+
+# Fetch issue details and comments in one query; extra comment pages follow by cursor
+def fetch_issue_thread(owner: str, repo: str, issue_number: int, limit: int) -> dict | None:
+    variables = {"owner": owner, "repo": repo, "number": issue_number}
+    return graphql_collect(ISSUE_THREAD_QUERY, variables, ("repository", "issue"), ("comments",), limit)
+
+
+# Format issue header as in get_issue, followed by its comments
+def format_issue_thread(issue: dict) -> str:
+    lines = []
+
+    state = issue["state"]
+    if issue.get("stateReason") and state == "CLOSED":
+        state += f" ({issue['stateReason']})"
+
+    lines.append(f"# {issue['title']}")
+    lines.append(f"State: {state} | #{issue['number']}")
+    lines.append(f"Author: {(issue.get('author') or {}).get('login', 'ghost')}")
+    lines.append(f"Created: {issue['createdAt']} | Updated: {issue['updatedAt']}")
+
+    labels = ", ".join(l["name"] for l in issue.get("labels", {}).get("nodes", []))
+    if labels:
+        lines.append(f"Labels: {labels}")
+
+    assignees = ", ".join(a["login"] for a in issue.get("assignees", {}).get("nodes", []))
+    if assignees:
+        lines.append(f"Assignees: {assignees}")
+
+    lines.append(f"Comments: {issue['comments']['totalCount']}")
+    lines.append(f"URL: {issue['url']}")
+
+    lines.append("\n---\n")
+    lines.append(issue.get("body") or "(No description provided)")
+
+    lines.append("")
+    lines.extend(format_bundle_comments(issue["comments"]))
+
+    return "\n".join(lines)
@@ -0,0 +1,95 @@
+# INFRASTRUCTURE
+import re
+from mcp.types import TextContent
+from src.github.graphql_client import graphql_batch
+
+MAX_ITEMS = 100
+MAX_BODY_CHARS = 2000
+REF_PATTERN = re.compile(r"^(?:([\w.-]+)/([\w.-]+)#|#)?(\d+)$")
+
+ISSUE_FRAGMENT = """
+fragment IssueSummary on Issue {
+  number
+  title
+  body
+  state
+  stateReason
+  author { login }
+  createdAt
+  updatedAt
+  url
+  labels(first: 20) { nodes { name } }
+  comments { totalCount }
+}
+"""
+
+
+# ORCHESTRATOR
+def get_issues_workflow(refs: list[str], owner: str = "", repo: str = "") -> list[TextContent]:
+    parsed = parse_item_refs(refs, owner, repo)
+    issues = graphql_batch("issue", ISSUE_FRAGMENT, "IssueSummary", parsed)
+    formatted_string = format_issues(parsed, issues)
+    return [TextContent(type="text", text=formatted_string)]
+
+
+# FUNCTIONS
+
+# Parse "owner/repo#123" refs; bare "123" or "#123" use the default owner and repo
+def parse_item_refs(refs: list[str], owner: str, repo: str) -> list[tuple[str, str, int]]:
+    if not refs:
+        raise ValueError("No item references given")
+    if len(refs) > MAX_ITEMS:
+        raise ValueError(f"Too many items: {len(refs)} (max {MAX_ITEMS})")
+    parsed = []
+    for ref in refs:
+        match = REF_PATTERN.match(str(ref).strip())
+        if not match:
+            raise ValueError(f"Invalid reference '{ref}', expected owner/repo#number")
+        ref_owner, ref_repo, number = match.groups()
+        if ref_owner is None:
+            if not owner or not repo:
+                raise ValueError(f"Reference '{ref}' has no repository and no default owner/repo was given")
+            ref_owner, ref_repo = owner, repo
+        parsed.append((ref_owner, ref_repo, int(number)))
+    return parsed
+
+
+# Format issues in input order, with a truncated body each
+def format_issues(refs: list[tuple[str, str, int]], issues: list[dict | None]) -> str:
+    found = sum(1 for issue in issues if issue is not None)
+    lines = [f"Fetched {found} of {len(refs)} issues\n"]
+
+    for (owner, repo, number), issue in zip(refs, issues):
+        lines.append("=" * 60)
+        if issue is None:
+            lines.append(f"{owner}/{repo}#{number}: not found (or not an issue)\n")
+            continue
+
+        state = issue["state"]
+        if issue.get("stateReason") and state == "CLOSED":
+            state += f" ({issue['stateReason']})"
+
+        lines.append(f"# {owner}/{repo}#{issue['number']}: {issue['title']}")
+        lines.append(f"State: {state} | Author: {(issue.get('author') or {}).get('login', 'ghost')}")
+        lines.append(f"Created: {issue['createdAt']} | Updated: {issue['updatedAt']}")
+
+        labels = ", ".join(l["name"] for l in issue.get("labels", {}).get("nodes", []))
+        if labels:
+            lines.append(f"Labels: {labels}")
+
+        lines.append(f"Comments: {issue['comments']['totalCount']}")
+        lines.append(f"URL: {issue['url']}")
+        lines.append("")
+        lines.append(truncate_body(issue.get("body"), f"get_issue_thread: owner=\"{owner}\" repo=\"{repo}\" issue_number={number}"))
+        lines.append("")
+
+    return "\n".join(lines)
+
+
+# Body preview up to MAX_BODY_CHARS, pointing at the single-item tool when cut
+def truncate_body(body: str | None, hint: str) -> str:
+    if not body:
+        return "(No description provided)"
+    if len(body) <= MAX_BODY_CHARS:
+        return body
+    return f"{body[:MAX_BODY_CHARS]}... (truncated)\n[{hint}]"
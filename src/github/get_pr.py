@@ -1,7 +1,6 @@
 # INFRASTRUCTURE
-import requests
 from mcp.types import TextContent
-from src.github.client import GITHUB_API_BASE, build_headers
+from src.github.client import GITHUB_API_BASE, github_get_json
 
 
 # ORCHESTRATOR
@@ -16,9 +15,7 @@ def get_pr_workflow(owner: str, repo: str, pull_number: int) -> list[TextContent
 # Fetch single PR from GitHub API
 def fetch_pr(owner: str, repo: str, pull_number: int) -> dict:
     url = f"{GITHUB_API_BASE}/repos/{owner}/{repo}/pulls/{pull_number}"
-    response = requests.get(url, headers=build_headers())
-    response.raise_for_status()
-    return response.json()
+    return github_get_json(url)
 
 
 # Format PR for display
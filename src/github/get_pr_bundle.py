@@ -0,0 +1,174 @@
+# INFRASTRUCTURE
+from mcp.types import TextContent
+from src.github.graphql_client import graphql_collect
+
+MAX_ITEMS = 100
+MAX_REVIEW_BODY = 500
+
+PR_BUNDLE_QUERY = """
+query($owner: String!, $repo: String!, $number: Int!, $first: Int!, $details: Boolean!,
+      $commentsPage: Boolean!, $commentsAfter: String,
+      $reviewsPage: Boolean!, $reviewsAfter: String,
+      $filesPage: Boolean!, $filesAfter: String) {
+  repository(owner: $owner, name: $repo) {
+    pullRequest(number: $number) {
+      ...PullRequestDetails @include(if: $details)
+      comments(first: $first, after: $commentsAfter) @include(if: $commentsPage) {
+        totalCount
+        pageInfo { hasNextPage endCursor }
+        nodes {
+          author { login }
+          body
+          createdAt
+        }
+      }
+      reviews(first: $first, after: $reviewsAfter) @include(if: $reviewsPage) {
+        totalCount
+        pageInfo { hasNextPage endCursor }
+        nodes {
+          author { login }
+          state
+          body
+          submittedAt
+        }
+      }
+      files(first: $first, after: $filesAfter) @include(if: $filesPage) {
+        totalCount
+        pageInfo { hasNextPage endCursor }
+        nodes {
+          path
+          additions
+          deletions
+          changeType
+        }
+      }
+    }
+  }
+}
+
+fragment PullRequestDetails on PullRequest {
+  number
+  title
+  body
+  state
+  isDraft
+  merged
+  mergedAt
+  mergedBy { login }
+  author { login }
+  createdAt
+  updatedAt
+  headRefName
+  baseRefName
+  additions
+  deletions
+  changedFiles
+  commits { totalCount }
+  mergeable
+  reviewDecision
+  url
+  labels(first: 20) { nodes { name } }
+}
+"""
+
+
+# ORCHESTRATOR
+def get_pr_bundle_workflow(owner: str, repo: str, pull_number: int, limit: int = MAX_ITEMS) -> list[TextContent]:
+    pr = fetch_pr_bundle(owner, repo, pull_number, limit)
+    if pr is None:
+        raise ValueError(f"Pull request {owner}/{repo}#{pull_number} not found")
+    formatted_string = format_pr_bundle(pr)
+    return [TextContent(type="text", text=formatted_string)]
+
+
+# FUNCTIONS
+
+# Fetch PR details, comments, reviews and files in one query; extra pages follow by cursor
+def fetch_pr_bundle(owner: str, repo: str, pull_number: int, limit: int) -> dict | None:
+    variables = {"owner": owner, "repo": repo, "number": pull_number}
+    return graphql_collect(PR_BUNDLE_QUERY, variables, ("repository", "pullRequest"), ("comments", "reviews", "files"), limit)
+
+
+# Format PR bundle: header as in get_pr, then files, reviews and comments
+def format_pr_bundle(pr: dict) -> str:
+    lines = []
+
+    state = "MERGED" if pr.get("merged") else pr["state"]
+    if pr.get("isDraft"):
+        state += " (DRAFT)"
+
+    lines.append(f"# {pr['title']}")
+    lines.append(f"State: {state} | #{pr['number']}")
+    lines.append(f"Author: {(pr.get('author') or {}).get('login', 'ghost')}")
+    lines.append(f"Branch: {pr['headRefName']} -> {pr['baseRefName']}")
+    lines.append(f"Created: {pr['createdAt']} | Updated: {pr['updatedAt']}")
+
+    if pr.get("mergedAt"):
+        lines.append(f"Merged: {pr['mergedAt']} by {(pr.get('mergedBy') or {}).get('login', 'unknown')}")
+
+    labels = ", ".join(l["name"] for l in pr.get("labels", {}).get("nodes", []))
+    if labels:
+        lines.append(f"Labels: {labels}")
+
+    lines.append(f"Commits: {pr['commits']['totalCount']} | Additions: +{pr.get('additions', 0)} | Deletions: -{pr.get('deletions', 0)}")
+    lines.append(f"Changed Files: {pr.get('changedFiles', 0)}")
+    lines.append(f"Mergeable: {pr.get('mergeable', 'UNKNOWN')} | Review Decision: {pr.get('reviewDecision') or 'NONE'}")
+    lines.append(f"URL: {pr['url']}")
+
+    lines.append("\n---\n")
+    lines.append(pr.get("body") or "(No description provided)")
+
+    lines.append("")
+    lines.extend(format_bundle_files(pr["files"]))
+    lines.extend(format_bundle_reviews(pr["reviews"]))
+    lines.extend(format_bundle_comments(pr["comments"]))
+
+    return "\n".join(lines)
+
+
+# Format file stats as in get_pr_files (GraphQL has no patches)
+def format_bundle_files(files: dict) -> list[str]:
+    nodes = files["nodes"]
+    total_additions = sum(f.get("additions", 0) for f in nodes)
+    total_deletions = sum(f.get("deletions", 0) for f in nodes)
+    lines = [f"## Files Changed ({len(nodes)} of {files['totalCount']}) | +{total_additions} -{total_deletions}\n"]
+    for f in nodes:
+        status = f["changeType"].lower()
+        status_icon = {"added": "+", "deleted": "-", "modified": "M", "renamed": "R"}.get(status, "?")
+        lines.append(f"[{status_icon}] {f['path']}")
+        lines.append(f"    +{f.get('additions', 0)} -{f.get('deletions', 0)} | Status: {status}")
+    lines.append("")
+    return lines
+
+
+# Format reviews with state and a body preview
+def format_bundle_reviews(reviews: dict) -> list[str]:
+    nodes = reviews["nodes"]
+    lines = [f"## Reviews ({len(nodes)} of {reviews['totalCount']})\n"]
+    for idx, review in enumerate(nodes, 1):
+        lines.append(f"--- Review {idx} ---")
+        lines.append(f"Author: {(review.get('author') or {}).get('login', 'ghost')} | State: {review['state']}")
+        lines.append(f"Date: {review.get('submittedAt') or 'pending'}")
+        body = review.get("body") or ""
+        if body:
+            preview = body[:MAX_REVIEW_BODY]
+            if len(body) > MAX_REVIEW_BODY:
+                preview += "... (truncated)"
+            lines.append("")
+            lines.append(preview)
+        lines.append("")
+    return lines
+
+
+# Format comments as in get_issue_comments
+def format_bundle_comments(comments: dict) -> list[str]:
+    nodes = comments["nodes"]
+    lines = [f"## Comments ({len(nodes)} of {comments['totalCount']})\n"]
+    for idx, comment in enumerate(nodes, 1):
+        lines.append(f"--- Comment {idx} ---")
+        lines.append(f"Author: {(comment.get('author') or {}).get('login', 'ghost')}")
+        lines.append(f"Date: {comment['createdAt']}")
+        lines.append("")
+        lines.append(comment.get("body") or "(Empty comment)")
+        lines.append("")
+    return lines
@@ -1,10 +1,12 @@
 # INFRASTRUCTURE
-import requests
 from mcp.types import TextContent
-from src.github.client import GITHUB_API_BASE, build_headers
+from src.github.client import GITHUB_API_BASE, paginate
+from src.github.result_store import store_result, cursor_hint
 
 FILES_PER_PAGE = 100
+MAX_FILES = 3000
 MAX_PATCH_PREVIEW = 500
+MAX_FILES_DISPLAY = 30
 
 
 # ORCHESTRATOR
@@ -16,16 +18,15 @@ def get_pr_files_workflow(owner: str, repo: str, pull_number: int) -> list[TextC
 
 # FUNCTIONS
 
-# Fetch PR files from GitHub API
+# Fetch all PR files across pages (GitHub lists at most 3000)
 def fetch_pr_files(owner: str, repo: str, pull_number: int) -> list:
     url = f"{GITHUB_API_BASE}/repos/{owner}/{repo}/pulls/{pull_number}/files"
-    params = {"per_page": FILES_PER_PAGE}
-    response = requests.get(url, params=params, headers=build_headers())
-    response.raise_for_status()
-    return response.json()
+    return list(paginate(url, max_items=MAX_FILES, per_page=FILES_PER_PAGE))
 
 
-# Format PR files for display
+# Format the first MAX_FILES_DISPLAY files for display; when files are left out or patch previews are cut, all files
+# with full patches go to the result store, each cut preview links a next_page cursor starting at its file,
+# and a final cursor points at the files not shown
 def format_pr_files(files: list, owner: str, repo: str, pull_number: int) -> str:
     lines = []
 
@@ -39,21 +40,42 @@ def format_pr_files(files: list, owner: str, repo: str, pull_number: int) -> str
         lines.append("No files changed in this PR.")
         return "\n".join(lines)
 
-    for f in files:
-        status_icon = {"added": "+", "removed": "-", "modified": "M", "renamed": "R"}.get(f["status"], "?")
-        lines.append(f"[{status_icon}] {f['filename']}")
-        lines.append(f"    +{f.get('additions', 0)} -{f.get('deletions', 0)} | Status: {f['status']}")
-
-        if f.get("previous_filename"):
-            lines.append(f"    Renamed from: {f['previous_filename']}")
+    shown = files[:MAX_FILES_DISPLAY]
+    result_id = None
+    if len(files) > len(shown) or any(len(f.get("patch", "")) > MAX_PATCH_PREVIEW for f in shown):
+        size = sum(len(f.get("patch", "")) + len(f["filename"]) for f in files)
+        result_id = store_result(("pr_files", owner, repo, pull_number), f"Files Changed in {owner}/{repo}#{pull_number} (full patches)", files, format_full_file, size)
 
+    for idx, f in enumerate(shown):
         patch = f.get("patch", "")
-        if patch:
-            preview = patch[:MAX_PATCH_PREVIEW]
-            if len(patch) > MAX_PATCH_PREVIEW:
-                preview += "\n    ... (truncated)"
-            lines.append(f"    Preview:\n    {preview.replace(chr(10), chr(10) + '    ')}")
-
+        truncated_hint = ""
+        if len(patch) > MAX_PATCH_PREVIEW:
+            truncated_hint = f"\n    ... (truncated, full patch: {cursor_hint(result_id, idx)})"
+        lines.extend(format_file_block(f, patch[:MAX_PATCH_PREVIEW], truncated_hint))
         lines.append("")
 
+    if len(files) > len(shown):
+        lines.append(f"... and {len(files) - len(shown)} more files {cursor_hint(result_id, len(shown))}")
+
     return "\n".join(lines)
+
+
+# File header lines plus an indented patch (preview or full) and optional trailer after it
+def format_file_block(f: dict, patch: str, trailer: str = "", label: str = "Preview") -> list[str]:
+    lines = []
+    status_icon = {"added": "+", "removed": "-", "modified": "M", "renamed": "R"}.get(f["status"], "?")
+    lines.append(f"[{status_icon}] {f['filename']}")
+    lines.append(f"    +{f.get('additions', 0)} -{f.get('deletions', 0)} | Status: {f['status']}")
+
+    if f.get("previous_filename"):
+        lines.append(f"    Renamed from: {f['previous_filename']}")
+
+    if patch:
+        text = patch + trailer
+        lines.append(f"    {label}:\n    {text.replace(chr(10), chr(10) + '    ')}")
+    return lines
+
+
+# One stored file with its complete patch, rendered by next_page
+def format_full_file(position: int, f: dict) -> str:
+    return "\n".join(format_file_block(f, f.get("patch", ""), label="Patch")) + "\n"
@@ -0,0 +1,75 @@
+# INFRASTRUCTURE
+from mcp.types import TextContent
+from src.github.graphql_client import graphql_batch
+from src.github.get_issues import parse_item_refs, truncate_body
+
+PR_FRAGMENT = """
+fragment PullRequestSummary on PullRequest {
+  number
+  title
+  body
+  state
+  isDraft
+  merged
+  mergedAt
+  author { login }
+  createdAt
+  updatedAt
+  headRefName
+  baseRefName
+  additions
+  deletions
+  changedFiles
+  reviewDecision
+  url
+  labels(first: 20) { nodes { name } }
+  comments { totalCount }
+}
+"""
+
+
+# ORCHESTRATOR
+def get_prs_workflow(refs: list[str], owner: str = "", repo: str = "") -> list[TextContent]:
+    parsed = parse_item_refs(refs, owner, repo)
+    prs = graphql_batch("pullRequest", PR_FRAGMENT, "PullRequestSummary", parsed)
+    formatted_string = format_prs(parsed, prs)
+    return [TextContent(type="text", text=formatted_string)]
+
+
+# FUNCTIONS
+
+# Format PRs in input order, with a truncated body each
+def format_prs(refs: list[tuple[str, str, int]], prs: list[dict | None]) -> str:
+    found = sum(1 for pr in prs if pr is not None)
+    lines = [f"Fetched {found} of {len(refs)} pull requests\n"]
+
+    for (owner, repo, number), pr in zip(refs, prs):
+        lines.append("=" * 60)
+        if pr is None:
+            lines.append(f"{owner}/{repo}#{number}: not found (or not a pull request)\n")
+            continue
+
+        state = "MERGED" if pr.get("merged") else pr["state"]
+        if pr.get("isDraft"):
+            state += " (DRAFT)"
+
+        lines.append(f"# {owner}/{repo}#{pr['number']}: {pr['title']}")
+        lines.append(f"State: {state} | Author: {(pr.get('author') or {}).get('login', 'ghost')}")
+        lines.append(f"Branch: {pr['headRefName']} -> {pr['baseRefName']}")
+        lines.append(f"Created: {pr['createdAt']} | Updated: {pr['updatedAt']}")
+
+        if pr.get("mergedAt"):
+            lines.append(f"Merged: {pr['mergedAt']}")
+
+        labels = ", ".join(l["name"] for l in pr.get("labels", {}).get("nodes", []))
+        if labels:
+            lines.append(f"Labels: {labels}")
+
+        lines.append(f"Changed Files: {pr.get('changedFiles', 0)} | Additions: +{pr.get('additions', 0)} | Deletions: -{pr.get('deletions', 0)}")
+        lines.append(f"Comments: {pr['comments']['totalCount']} | Review Decision: {pr.get('reviewDecision') or 'NONE'}")
+        lines.append(f"URL: {pr['url']}")
+        lines.append("")
+        lines.append(truncate_body(pr.get("body"), f"get_pr_bundle: owner=\"{owner}\" repo=\"{repo}\" pull_number={number}"))
+        lines.append("")
+
+    return "\n".join(lines)
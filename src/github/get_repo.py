@@ -1,26 +1,17 @@
 # INFRASTRUCTURE
-import requests
 from mcp.types import TextContent
-from src.github.client import GITHUB_API_BASE, build_headers
+from src.github.repo_metadata import get_repo_data
 
 
 # ORCHESTRATOR
 def get_repo_workflow(owner: str, repo: str) -> list[TextContent]:
-    raw_data = fetch_repo(owner, repo)
+    raw_data = get_repo_data(owner, repo)
     formatted = format_repo(raw_data)
     return [TextContent(type="text", text=formatted)]
 
 
 # FUNCTIONS
 
-# Fetch repository metadata from GitHub API
-def fetch_repo(owner: str, repo: str) -> dict:
-    url = f"{GITHUB_API_BASE}/repos/{owner}/{repo}"
-    response = requests.get(url, headers=build_headers())
-    response.raise_for_status()
-    return response.json()
-
-
 # Format repository metadata for display
 def format_repo(data: dict) -> str:
     full_name = data.get("full_name", "")
@@ -33,6 +24,9 @@ def format_repo(data: dict) -> str:
     updated = data.get("updated_at", "")[:10]
     open_issues = data.get("open_issues_count", 0)
     default_branch = data.get("default_branch", "main")
+    visibility = data.get("visibility", "public")
+    if data.get("archived"):
+        visibility += " (archived)"
     url = data.get("html_url", "")
 
     topics_str = ", ".join(topics) if topics else "None"
@@ -46,6 +40,7 @@ def format_repo(data: dict) -> str:
         f"- Updated: {updated}",
         f"- Open Issues: {open_issues}",
         f"- Default Branch: {default_branch}",
+        f"- Visibility: {visibility}",
         f"- URL: {url}"
     ]
 
@@ -1,112 +1,210 @@
 # INFRASTRUCTURE
-import requests
-from fnmatch import fnmatch
-from os.path import basename
+import os
+from concurrent.futures import ThreadPoolExecutor
 from mcp.types import TextContent
-from src.github.client import GITHUB_API_BASE, build_headers
+from src.github.client import GITHUB_API_BASE, github_get_json
+from src.github.cache import create_cache, cache_get, cache_put, cache_stats
+from src.github.repo_metadata import resolve_default_branch
+from src.github.mirror import has_mirror, mirror_head, mirror_tree_sha, mirror_tree
+from src.github.path_index import build_path_index, subtree_index, query_depth, query_pattern
+from src.github.metrics import with_tool_context
+from src.github.result_store import store_result, cursor_hint
 
 MAX_TREE_CHARS = 1000
 PATTERN_RESULTS_LIMIT = 50
+TREE_DISPLAY_LIMIT = 50
+TREE_CACHE_BYTES = int(os.environ.get("GITHUB_TREE_CACHE_BYTES", str(256 * 1024 * 1024)))
+TREE_ENTRY_BYTES = 200
+INDEX_ENTRY_BYTES = 100
+REF_CACHE_ENTRIES = 1024
+REF_TTL = int(os.environ.get("GITHUB_REF_TTL", "60"))
+TREE_CONCURRENCY = int(os.environ.get("GITHUB_TREE_CONCURRENCY", "8"))
+MAX_TREE_ENTRIES = int(os.environ.get("GITHUB_MAX_TREE_ENTRIES", "200000"))
+
+TREE_CACHE = create_cache(TREE_CACHE_BYTES, name="trees")
+PATH_INDEX_CACHE = create_cache(TREE_CACHE_BYTES, name="path_indexes")
+REF_CACHE = create_cache(REF_CACHE_ENTRIES, ttl=REF_TTL, name="refs")
 
 
 # ORCHESTRATOR
 def get_repo_tree_workflow(owner: str, repo: str, path: str = "", depth: int = -1, pattern: str = "") -> list[TextContent]:
-    default_branch = fetch_default_branch(owner, repo)
-    tree_sha = get_tree_sha(owner, repo, default_branch, path)
-
     if pattern:
-        raw_tree = fetch_tree(owner, repo, tree_sha, recursive=True)
-        truncated = raw_tree.get("truncated", False)
-        matches = filter_by_pattern(raw_tree, pattern)
-        return [TextContent(type="text", text=format_matches(matches, pattern, path, truncated))]
+        index = resolve_path_index(owner, repo, path)
+        matches = query_pattern(index, pattern, PATTERN_RESULTS_LIMIT)
+        return [TextContent(type="text", text=format_matches(matches, pattern, path, index["truncated"]))]
 
-    recursive = depth != 1
-    raw_tree = fetch_tree(owner, repo, tree_sha, recursive)
-    formatted_string = format_tree_response(raw_tree, path, depth)
+    index = resolve_path_index(owner, repo, path, recursive=depth != 1)
+    formatted_string = format_tree_response(index, path, depth, (owner, repo))
     return [TextContent(type="text", text=formatted_string)]
 
 
 # FUNCTIONS
 
-# Get default branch name for repository
-def fetch_default_branch(owner: str, repo: str) -> str:
-    url = f"{GITHUB_API_BASE}/repos/{owner}/{repo}"
-    headers = build_headers()
-
-    response = requests.get(url, headers=headers)
-    response.raise_for_status()
-    return response.json()["default_branch"]
-
-
 # Get tree SHA for specific path or root
 def get_tree_sha(owner: str, repo: str, branch: str, path: str) -> str:
     if not path:
         url = f"{GITHUB_API_BASE}/repos/{owner}/{repo}/branches/{branch}"
-        headers = build_headers()
-        response = requests.get(url, headers=headers)
-        response.raise_for_status()
-        return response.json()["commit"]["commit"]["tree"]["sha"]
+        return github_get_json(url)["commit"]["commit"]["tree"]["sha"]
 
     url = f"{GITHUB_API_BASE}/repos/{owner}/{repo}/contents/{path}"
     params = {"ref": branch}
-    headers = build_headers("application/vnd.github.object+json")
-    response = requests.get(url, params=params, headers=headers)
-    response.raise_for_status()
-
-    data = response.json()
+    data = github_get_json(url, params=params, accept="application/vnd.github.object+json")
     if data.get("type") == "dir":
         return data["sha"]
 
     raise ValueError(f"Path '{path}' is not a directory")
 
 
+# Get head commit SHA of a branch
+def fetch_commit_sha(owner: str, repo: str, branch: str) -> str:
+    url = f"{GITHUB_API_BASE}/repos/{owner}/{repo}/branches/{branch}"
+    return github_get_json(url)["commit"]["sha"]
+
+
 # Fetch tree structure from GitHub Git Trees API
 def fetch_tree(owner: str, repo: str, tree_sha: str, recursive: bool = True) -> dict:
     url = f"{GITHUB_API_BASE}/repos/{owner}/{repo}/git/trees/{tree_sha}"
     params = {"recursive": "true"} if recursive else {}
-    headers = build_headers()
+    return github_get_json(url, params=params)
+
+
+# Resolve default branch and path to a tree SHA, caching each step with its own TTL
+def resolve_tree_sha(owner: str, repo: str, path: str = "") -> str:
+    if has_mirror(owner, repo):
+        return mirror_tree_sha(owner, repo, path)
+    default_branch = resolve_default_branch(owner, repo)
+    ref_key = (owner, repo, default_branch, path)
+    tree_sha = cache_get(REF_CACHE, ref_key)
+    if tree_sha is None:
+        tree_sha = get_tree_sha(owner, repo, default_branch, path)
+        cache_put(REF_CACHE, ref_key, tree_sha)
+    return tree_sha
+
+
+# Resolve default branch head commit SHA through REF_CACHE
+def resolve_commit_sha(owner: str, repo: str) -> str:
+    if has_mirror(owner, repo):
+        return mirror_head(owner, repo)
+    default_branch = resolve_default_branch(owner, repo)
+    ref_key = (owner, repo, default_branch, None)
+    commit_sha = cache_get(REF_CACHE, ref_key)
+    if commit_sha is None:
+        commit_sha = fetch_commit_sha(owner, repo, default_branch)
+        cache_put(REF_CACHE, ref_key, commit_sha)
+    return commit_sha
+
+
+# Return parsed tree by SHA; trees are immutable so cached entries never expire
+def load_tree(owner: str, repo: str, tree_sha: str, recursive: bool = True) -> dict:
+    raw_tree = cache_get(TREE_CACHE, (owner, repo, tree_sha, recursive))
+    if raw_tree is not None:
+        return raw_tree
+
+    if not recursive:
+        full_tree = cache_get(TREE_CACHE, (owner, repo, tree_sha, True))
+        if full_tree is not None and not full_tree.get("truncated", False):
+            children = [item for item in full_tree.get("tree", []) if "/" not in item["path"]]
+            return {"sha": tree_sha, "tree": children, "truncated": False}
+
+    if has_mirror(owner, repo):
+        raw_tree = mirror_tree(owner, repo, tree_sha, recursive)
+    else:
+        raw_tree = fetch_tree(owner, repo, tree_sha, recursive)
+        if recursive and raw_tree.get("truncated", False):
+            raw_tree = assemble_tree(owner, repo, tree_sha)
+    size = len(raw_tree.get("tree", [])) * TREE_ENTRY_BYTES
+    cache_put(TREE_CACHE, (owner, repo, tree_sha, recursive), raw_tree, size)
+    return raw_tree
+
+
+# Path index for a directory. Subdirectories of a cached complete root index are derived from it
+# without resolving their tree SHA upstream
+def resolve_path_index(owner: str, repo: str, path: str = "", recursive: bool = True) -> dict:
+    if path.strip("/"):
+        root = cache_get(PATH_INDEX_CACHE, (owner, repo, resolve_tree_sha(owner, repo), True))
+        if root is not None and not root["truncated"]:
+            return subtree_index(root, path)
+    return load_path_index(owner, repo, resolve_tree_sha(owner, repo, path), recursive)
+
+
+# Return path index for a tree SHA, built once from load_tree; a recursive index also serves shallow queries
+def load_path_index(owner: str, repo: str, tree_sha: str, recursive: bool = True) -> dict:
+    index = cache_get(PATH_INDEX_CACHE, (owner, repo, tree_sha, True))
+    if index is None and not recursive:
+        index = cache_get(PATH_INDEX_CACHE, (owner, repo, tree_sha, False))
+    if index is None:
+        index = build_path_index(load_tree(owner, repo, tree_sha, recursive))
+        cache_put(PATH_INDEX_CACHE, (owner, repo, tree_sha, recursive), index, len(index["items"]) * INDEX_ENTRY_BYTES)
+    return index
+
+
+# Rebuild a truncated recursive tree level by level, fetching subtrees in parallel by SHA.
+# Stays truncated only when the listing exceeds MAX_TREE_ENTRIES
+def assemble_tree(owner: str, repo: str, tree_sha: str) -> dict:
+    root = load_tree(owner, repo, tree_sha, recursive=False)
+    items = list(root.get("tree", []))
+    pending = [(f"{item['path']}/", item["sha"]) for item in items if item["type"] == "tree"]
+    truncated = False
+
+    with ThreadPoolExecutor(max_workers=TREE_CONCURRENCY) as pool:
+        while pending and not truncated:
+            listings = pool.map(with_tool_context(lambda subtree: fetch_subtree(owner, repo, subtree[1])), pending)
+            next_pending = []
+            for (prefix, _), (listing, complete) in zip(pending, listings):
+                for item in listing:
+                    items.append(dict(item, path=prefix + item["path"]))
+                    if not complete and item["type"] == "tree":
+                        next_pending.append((f"{prefix}{item['path']}/", item["sha"]))
+            truncated = len(items) > MAX_TREE_ENTRIES
+            pending = next_pending
+
+    items = sorted(items[:MAX_TREE_ENTRIES], key=lambda item: item["path"])
+    return {"sha": tree_sha, "tree": items, "truncated": truncated}
+
+
+# Fetch subtree recursively; when that is truncated too, return its direct children to descend further
+def fetch_subtree(owner: str, repo: str, tree_sha: str) -> tuple[list[dict], bool]:
+    raw_tree = cache_get(TREE_CACHE, (owner, repo, tree_sha, True))
+    if raw_tree is None:
+        raw_tree = fetch_tree(owner, repo, tree_sha, recursive=True)
+    if not raw_tree.get("truncated", False):
+        cache_put(TREE_CACHE, (owner, repo, tree_sha, True), raw_tree, len(raw_tree.get("tree", [])) * TREE_ENTRY_BYTES)
+        return raw_tree.get("tree", []), True
+    return load_tree(owner, repo, tree_sha, recursive=False).get("tree", []), False
 
-    response = requests.get(url, params=params, headers=headers)
-    response.raise_for_status()
-    return response.json()
 
+# Report tree and ref-resolution cache counters
+def tree_cache_stats() -> dict:
+    return {"trees": cache_stats(TREE_CACHE), "path_indexes": cache_stats(PATH_INDEX_CACHE), "refs": cache_stats(REF_CACHE)}
 
-# Format tree response with depth filtering and root-level prioritization
-def format_tree_response(raw_tree: dict, base_path: str, depth: int = -1) -> str:
-    tree_items = raw_tree.get("tree", [])
 
-    truncated = raw_tree.get("truncated", False)
+# Format tree response from the path index: depth buckets give counts and the shallowest 50 items directly.
+# Entries past those 50 directories and 50 files are kept in the result store behind a next_page cursor
+def format_tree_response(index: dict, base_path: str, depth: int = -1, repo_key: tuple = ()) -> str:
+    truncated = index["truncated"]
 
-    if not tree_items:
+    if not index["items"]:
         lines = []
         lines.append(f"Directory: {base_path if base_path else '/'}\n")
         if truncated:
-            lines.append("WARNING: Repository tree was truncated by GitHub API. Results may be incomplete.")
+            lines.append(f"WARNING: Repository tree exceeds {MAX_TREE_ENTRIES:,} entries. Results may be incomplete.")
             lines.append("Use 'path' parameter to browse specific subdirectories or 'depth=1' for shallow listing.\n")
         lines.append("Empty directory.")
         return "\n".join(lines)
 
-    if depth > 0:
-        tree_items = [item for item in tree_items if item["path"].count("/") < depth]
-
-    dirs = sorted(
-        [item for item in tree_items if item["type"] == "tree"],
-        key=lambda item: item["path"].count("/")
-    )
-    files = sorted(
-        [item for item in tree_items if item["type"] == "blob"],
-        key=lambda item: item["path"].count("/")
-    )
+    dir_count, all_dirs = query_depth(index, "tree", depth, None)
+    file_count, all_files = query_depth(index, "blob", depth, None)
+    dirs = all_dirs[:TREE_DISPLAY_LIMIT]
+    files = all_files[:TREE_DISPLAY_LIMIT]
 
     content_lines = []
-    content_lines.append(f"Directories ({len(dirs)}):")
-    for item in dirs[:50]:
-        content_lines.append(f"  {item['path']}/")
+    content_lines.append(f"Directories ({dir_count}):")
+    for item in dirs:
+        content_lines.append(format_tree_entry(0, item))
 
-    content_lines.append(f"\nFiles ({len(files)}):")
-    for item in files[:50]:
-        size = item.get("size", 0)
-        content_lines.append(f"  {item['path']} ({size:,} bytes)")
+    content_lines.append(f"\nFiles ({file_count}):")
+    for item in files:
+        content_lines.append(format_tree_entry(0, item))
 
     output_truncated = len("\n".join(content_lines)) > MAX_TREE_CHARS
 
@@ -114,24 +212,32 @@ def format_tree_response(raw_tree: dict, base_path: str, depth: int = -1) -> str
     lines.append(f"Directory: {base_path if base_path else '/'}\n")
 
     if truncated:
-        lines.append("WARNING: Repository tree was truncated by GitHub API. Results may be incomplete.")
+        lines.append(f"WARNING: Repository tree exceeds {MAX_TREE_ENTRIES:,} entries. Results may be incomplete.")
         lines.append("Use 'path' parameter to browse specific subdirectories or 'depth=1' for shallow listing.\n")
     if output_truncated:
-        lines.append(f"WARNING: Output truncated (>{MAX_TREE_CHARS} chars). Showing top 50 directories and 50 files.")
+        lines.append(f"WARNING: Output truncated (>{MAX_TREE_CHARS} chars). Showing top {TREE_DISPLAY_LIMIT} directories and {TREE_DISPLAY_LIMIT} files.")
         lines.append("Use 'path' parameter or 'depth=1' to narrow results.\n")
 
     lines.extend(content_lines)
+
+    remaining = all_dirs[TREE_DISPLAY_LIMIT:] + all_files[TREE_DISPLAY_LIMIT:]
+    if remaining:
+        title = f"Directory: {base_path if base_path else '/'} (remaining entries)"
+        result_id = store_result(("tree",) + repo_key + (base_path, depth), title, remaining, format_tree_entry, len(remaining) * INDEX_ENTRY_BYTES)
+        lines.append(f"\n{len(remaining)} more entries: {cursor_hint(result_id, 0)}")
     return "\n".join(lines)
 
 
-# Filter tree items by glob pattern against filename or full path
-def filter_by_pattern(raw_tree: dict, pattern: str) -> list[dict]:
-    items = [item for item in raw_tree.get("tree", []) if item["type"] == "blob"]
-    has_slash = "/" in pattern
-    return [
-        item for item in items
-        if fnmatch(item["path"] if has_slash else basename(item["path"]), pattern)
-    ][:PATTERN_RESULTS_LIMIT]
+# One tree listing line; directories end in "/"
+def format_tree_entry(position: int, item: dict) -> str:
+    if item["type"] == "tree":
+        return f"  {item['path']}/"
+    return f"  {item['path']}{format_size(item)}"
+
+
+# Size suffix for a tree entry; mirror trees have no sizes since blobs are not downloaded
+def format_size(item: dict) -> str:
+    return f" ({item['size']:,} bytes)" if "size" in item else ""
 
 
 # Format matching files as text output
@@ -141,7 +247,7 @@ def format_matches(matches: list[dict], pattern: str, base_path: str, truncated:
     lines.append(f"Search: \"{pattern}\" in {scope}\n")
 
     if truncated:
-        lines.append("WARNING: Repository tree was truncated by GitHub API. Results may be incomplete.")
+        lines.append(f"WARNING: Repository tree exceeds {MAX_TREE_ENTRIES:,} entries. Results may be incomplete.")
         lines.append("Use the 'path' parameter to search within a specific directory for complete results.\n")
 
     if not matches:
@@ -150,7 +256,6 @@ def format_matches(matches: list[dict], pattern: str, base_path: str, truncated:
 
     lines.append(f"Matches ({len(matches)}):")
     for item in matches:
-        size = item.get("size", 0)
-        lines.append(f"  {item['path']} ({size:,} bytes)")
+        lines.append(f"  {item['path']}{format_size(item)}")
 
     return "\n".join(lines)
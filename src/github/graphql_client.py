@@ -1,25 +1,169 @@
 # INFRASTRUCTURE
-import requests
-from src.github.client import GITHUB_TOKEN
+import os
+import json
+from concurrent.futures import ThreadPoolExecutor
+from src.github.client import GITHUB_TOKEN, github_request, single_flight, token_fingerprint
+from src.github.rate_limit import record_graphql_cost, remaining_budget
+from src.github.metrics import with_tool_context
 
-GITHUB_GRAPHQL = "https://api.github.com/graphql"
+GITHUB_GRAPHQL = os.environ.get("GITHUB_GRAPHQL", "https://api.github.com/graphql")
+MAX_PAGE_SIZE = 100
+BATCH_SIZE = int(os.environ.get("GITHUB_GRAPHQL_BATCH_SIZE", "50"))
+BATCH_CONCURRENCY = int(os.environ.get("GITHUB_GRAPHQL_BATCH_CONCURRENCY", "4"))
+LOW_BUDGET_POINTS = int(os.environ.get("GITHUB_GRAPHQL_LOW_POINTS", "500"))
+MIN_PAGE_SIZE = 5
+RATE_LIMIT_SELECTION = "rateLimit { cost remaining resetAt limit }"
 
 
 # FUNCTIONS
 
-# Execute GraphQL query against GitHub API
-def graphql_query(query: str, variables: dict) -> dict:
+# Execute GraphQL query; identical concurrent queries share one upstream call
+def graphql_query(query: str, variables: dict, partial: bool = False) -> dict:
+    key = ("POST", GITHUB_GRAPHQL, query, json.dumps(variables, sort_keys=True), partial, token_fingerprint())
+    return single_flight(key, lambda: post_graphql(query, variables, partial))
+
+
+# POST query and variables to GitHub GraphQL API; with partial, errors next to data (e.g. one missing
+# alias in a batch) leave that field null instead of failing the whole query
+def post_graphql(query: str, variables: dict, partial: bool = False) -> dict:
     headers = {
         "Authorization": f"Bearer {GITHUB_TOKEN}",
         "Content-Type": "application/json"
     }
-    response = requests.post(
+    response = github_request(
+        "POST",
         GITHUB_GRAPHQL,
         headers=headers,
-        json={"query": query, "variables": variables}
+        json_body={"query": with_rate_limit(query), "variables": variables}
     )
-    response.raise_for_status()
     data = response.json()
-    if "errors" in data:
+    rate_limit = (data.get("data") or {}).pop("rateLimit", None)
+    if rate_limit:
+        record_graphql_cost(rate_limit)
+    if "errors" in data and not (partial and data.get("data")):
         raise Exception(f"GraphQL Error: {data['errors']}")
     return data["data"]
+
+
+# Add a rateLimit selection to the operation's top-level selection set, so every response reports its point cost
+def with_rate_limit(query: str) -> str:
+    if "rateLimit" in query:
+        return query
+    depth = 0
+    for idx, ch in enumerate(query):
+        if ch == "(":
+            depth += 1
+        elif ch == ")":
+            depth -= 1
+        elif ch == "{" and depth == 0:
+            return f"{query[:idx + 1]}\n  {RATE_LIMIT_SELECTION}{query[idx + 1:]}"
+    return query
+
+
+# Shrink a requested page size when remaining GraphQL points drop below LOW_BUDGET_POINTS, proportionally
+# to what is left (never below MIN_PAGE_SIZE), so long sessions page in smaller steps instead of failing
+def adaptive_page_size(requested: int) -> int:
+    remaining, _ = remaining_budget("graphql")
+    if remaining is None or remaining >= LOW_BUDGET_POINTS:
+        return requested
+    return max(min(requested, MIN_PAGE_SIZE), requested * remaining // LOW_BUDGET_POINTS)
+
+
+# Lazily yield pages of the connection at path, passing "$first" and "$after" cursors, until the connection
+# ends or max_items nodes were yielded. Start from an existing cursor with after. Pages are fetched on demand
+def graphql_pages(query: str, variables: dict, path: tuple[str, ...], max_items: int, after: str | None = None):
+    fetched = 0
+    while fetched < max_items:
+        first = adaptive_page_size(max(1, min(MAX_PAGE_SIZE, max_items - fetched)))
+        connection = dig(graphql_query(query, dict(variables, first=first, after=after)), path)
+        if connection is None:
+            return
+        nodes = connection["nodes"][:max_items - fetched]
+        fetched += len(nodes)
+        yield dict(connection, nodes=nodes)
+        if not connection["pageInfo"]["hasNextPage"] or not nodes:
+            return
+        after = connection["pageInfo"]["endCursor"]
+
+
+# Collect graphql_pages into one connection: fields of the first page, nodes of all pages, last pageInfo.
+# Returns None when the connection does not exist
+def graphql_connection(query: str, variables: dict, path: tuple[str, ...], max_items: int, after: str | None = None) -> dict | None:
+    merged = None
+    for page in graphql_pages(query, variables, path, max_items, after):
+        if merged is None:
+            merged = dict(page, nodes=list(page["nodes"]))
+        else:
+            merged["nodes"].extend(page["nodes"])
+            merged["pageInfo"] = page["pageInfo"]
+    return merged
+
+
+# Run a query whose connections take "<name>After" cursors and "<name>Page" include flags, re-running it
+# for connections with more pages until each holds max_items nodes. Details are fetched only on the first
+# call ($details flag). Returns the node at path with all pages merged, or None when it does not exist
+def graphql_collect(query: str, variables: dict, path: tuple[str, ...], connections: tuple[str, ...], max_items: int) -> dict | None:
+    page_size = max(1, min(MAX_PAGE_SIZE, max_items))
+    flags = {f"{name}Page": True for name in connections}
+    node = dig(graphql_query(query, dict(variables, first=adaptive_page_size(page_size), details=True, **flags)), path)
+    if node is None:
+        return None
+
+    node = dict(node)
+    for name in connections:
+        node[name] = dict(node[name], nodes=list(node[name]["nodes"]))
+
+    pending = [name for name in connections if has_more_nodes(node[name], max_items)]
+    while pending:
+        page_variables = dict(variables, first=adaptive_page_size(page_size), details=False)
+        for name in connections:
+            page_variables[f"{name}Page"] = name in pending
+            page_variables[f"{name}After"] = node[name]["pageInfo"]["endCursor"] if name in pending else None
+        page = dig(graphql_query(query, page_variables), path)
+        for name in pending:
+            node[name]["nodes"].extend(page[name]["nodes"])
+            node[name]["pageInfo"] = page[name]["pageInfo"]
+        pending = [name for name in pending if has_more_nodes(node[name], max_items)]
+
+    for name in connections:
+        node[name]["nodes"] = node[name]["nodes"][:max_items]
+    return node
+
+
+# True when a connection has another page and fewer than max_items nodes so far
+def has_more_nodes(connection: dict, max_items: int) -> bool:
+    return connection["pageInfo"]["hasNextPage"] and len(connection["nodes"]) < max_items
+
+
+# Walk nested keys, returning None when any level is missing
+def dig(data: dict, path: tuple[str, ...]):
+    for key in path:
+        if data is None:
+            return None
+        data = data.get(key)
+    return data
+
+
+# Fetch one object per (owner, repo, number) through aliased repository lookups, BATCH_SIZE aliases per
+# query (fewer when points run low) and BATCH_CONCURRENCY queries in flight. field is the repository field ("issue", "pullRequest"),
+# fragment a GraphQL fragment named fragment_name. Returns objects in input order, None where missing
+def graphql_batch(field: str, fragment: str, fragment_name: str, refs: list[tuple[str, str, int]]) -> list[dict | None]:
+    batch_size = adaptive_page_size(BATCH_SIZE)
+    chunks = [refs[start:start + batch_size] for start in range(0, len(refs), batch_size)]
+    with ThreadPoolExecutor(max_workers=max(1, min(BATCH_CONCURRENCY, len(chunks)))) as pool:
+        results = pool.map(with_tool_context(lambda chunk: fetch_batch(field, fragment, fragment_name, chunk)), chunks)
+        return [node for chunk_nodes in results for node in chunk_nodes]
+
+
+# One aliased query for a chunk: a0: repository(owner: $o0, name: $r0) { field(number: $n0) { ...fragment } }
+def fetch_batch(field: str, fragment: str, fragment_name: str, chunk: list[tuple[str, str, int]]) -> list[dict | None]:
+    declarations = []
+    selections = []
+    variables = {}
+    for idx, (owner, repo, number) in enumerate(chunk):
+        declarations.append(f"$o{idx}: String!, $r{idx}: String!, $n{idx}: Int!")
+        selections.append(f"  a{idx}: repository(owner: $o{idx}, name: $r{idx}) {{ {field}(number: $n{idx}) {{ ...{fragment_name} }} }}")
+        variables.update({f"o{idx}": owner, f"r{idx}": repo, f"n{idx}": number})
+    query = "query(" + ", ".join(declarations) + ") {\n" + "\n".join(selections) + "\n}\n" + fragment
+    data = graphql_query(query, variables, partial=True)
+    return [dig(data, (f"a{idx}", field)) for idx in range(len(chunk))]
@@ -0,0 +1,139 @@
+# INFRASTRUCTURE
+import re
+from functools import lru_cache
+
+PATTERN_CACHE_SIZE = 256
+REGEX_METACHARS = set(".^$*+?{}[]\\|()")
+
+
+# FUNCTIONS
+
+# Compile patterns once per (patterns, mode) combination; LRU keeps hot patterns compiled
+@lru_cache(maxsize=PATTERN_CACHE_SIZE)
+def build_matcher(patterns: tuple[str, ...], fixed_string: bool = False, ignore_case: bool = False, binary: bool = True) -> dict:
+    literal = None
+    if is_literal_search(patterns, fixed_string, ignore_case):
+        literal = patterns[0].encode("utf-8") if binary else patterns[0]
+
+    sources = [re.escape(p) if fixed_string else p for p in patterns]
+    source = sources[0] if len(sources) == 1 else "|".join(f"(?:{s})" for s in sources)
+    flags = re.MULTILINE | (re.IGNORECASE if ignore_case else 0)
+    regex = re.compile(source.encode("utf-8") if binary else source, flags)
+
+    return {
+        "literal": literal,
+        "regex": regex,
+        "binary": binary,
+        "newline": b"\n" if binary else "\n"
+    }
+
+
+# Compile patterns up front so an invalid regex fails once, before any file is fetched
+def check_patterns(patterns: tuple[str, ...], fixed_string: bool = False, ignore_case: bool = False) -> None:
+    try:
+        build_matcher(patterns, fixed_string, ignore_case)
+    except re.error as e:
+        raise ValueError(f"Invalid pattern '{'|'.join(patterns)}': {e}")
+
+
+# True when pattern has no regex metacharacters and can be searched with find()
+def is_literal(pattern: str) -> bool:
+    return bool(pattern) and not any(ch in REGEX_METACHARS for ch in pattern)
+
+
+# Single case-sensitive literal: searchable with find() on UTF-8 bytes exactly
+def is_literal_search(patterns: tuple[str, ...], fixed_string: bool, ignore_case: bool) -> bool:
+    return len(patterns) == 1 and not ignore_case and (fixed_string or is_literal(patterns[0]))
+
+
+# Get matcher suited to the data. Bytes stay undecoded for literal searches, and for regexes
+# when data and patterns are ASCII (where bytes and text regex semantics agree); otherwise decode once
+def prepare_search(data: bytes | str, patterns: tuple[str, ...], fixed_string: bool = False, ignore_case: bool = False) -> tuple[dict, bytes | str]:
+    if isinstance(data, bytes) and not is_literal_search(patterns, fixed_string, ignore_case):
+        if not (all(p.isascii() for p in patterns) and data.isascii()):
+            data = data.decode("utf-8", errors="replace")
+    return build_matcher(patterns, fixed_string, ignore_case, isinstance(data, bytes)), data
+
+
+# Test a single line against the matcher
+def line_matches(matcher: dict, line: bytes | str) -> bool:
+    if matcher["literal"] is not None:
+        return matcher["literal"] in line
+    return matcher["regex"].search(line) is not None
+
+
+# Offset of the next candidate match at or after pos, or -1
+def find_candidate(matcher: dict, data: bytes | str, pos: int) -> int:
+    if matcher["literal"] is not None:
+        return data.find(matcher["literal"], pos)
+    found = matcher["regex"].search(data, pos)
+    return found.start() if found else -1
+
+
+# Search whole buffer without splitting it into lines; line numbers are computed only around matches
+def search_text(data: bytes | str, patterns: tuple[str, ...], context_lines: int = 0, max_matches: int = 50, fixed_string: bool = False, ignore_case: bool = False) -> tuple[list[dict], int]:
+    matcher, data = prepare_search(data, patterns, fixed_string, ignore_case)
+    newline = matcher["newline"]
+    results = []
+    pos = 0
+    line_no = 0
+    counted_to = 0
+
+    while len(results) < max_matches and pos <= len(data):
+        offset = find_candidate(matcher, data, pos)
+        if offset < 0:
+            break
+        line_start = data.rfind(newline, 0, offset) + 1
+        line_end = data.find(newline, offset)
+        if line_end < 0:
+            line_end = len(data)
+        pos = line_end + 1
+
+        if matcher["literal"] is None and not line_matches(matcher, data[line_start:line_end]):
+            continue
+
+        line_no += data.count(newline, counted_to, line_start)
+        counted_to = line_start
+        results.append(build_match(data, newline, line_no, line_start, line_end, context_lines))
+
+    total_lines = data.count(newline) + 1
+    for match in results:
+        match["end"] = min(match["end"], total_lines)
+    return results, total_lines
+
+
+# Build match dict with surrounding context lines, walking outwards from the matched line
+def build_match(data: bytes | str, newline, line_no: int, line_start: int, line_end: int, context_lines: int) -> dict:
+    before = []
+    start = line_start
+    for _ in range(context_lines):
+        if start == 0:
+            break
+        prev_start = data.rfind(newline, 0, start - 1) + 1
+        before.insert(0, data[prev_start:start - 1])
+        start = prev_start
+
+    after = []
+    end = line_end
+    for _ in range(context_lines):
+        if end >= len(data):
+            break
+        next_end = data.find(newline, end + 1)
+        if next_end < 0:
+            next_end = len(data)
+        after.append(data[end + 1:next_end])
+        end = next_end
+
+    texts = before + [data[line_start:line_end]] + after
+    first = line_no - len(before)
+    return {
+        "match_line": line_no,
+        "start": first,
+        "end": line_no + context_lines + 1,
+        "lines": [(first + i, decode_line(text)) for i, text in enumerate(texts)]
+    }
+
+
+# Decode a matched or context line; invalid UTF-8 is replaced instead of failing the search
+def decode_line(text: bytes | str) -> str:
+    return text.decode("utf-8", errors="replace") if isinstance(text, bytes) else text
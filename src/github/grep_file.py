@@ -1,52 +1,74 @@
 # INFRASTRUCTURE
-import re
+from collections import deque
 from mcp.types import TextContent
-from src.github.get_file_content import fetch_file_content, decode_content
+from src.github.get_file_content import load_file, iter_blob_lines
+from src.github.grep_engine import build_matcher, line_matches, search_text
 
 MAX_MATCHES = 50
 
 
 # ORCHESTRATOR
-def grep_file_workflow(owner: str, repo: str, path: str, pattern: str, context_lines: int = 0, max_matches: int = MAX_MATCHES) -> list[TextContent]:
-    raw_response = fetch_file_content(owner, repo, path)
+def grep_file_workflow(owner: str, repo: str, path: str, pattern: str, context_lines: int = 0, max_matches: int = MAX_MATCHES, fixed_string: bool = False, ignore_case: bool = False) -> list[TextContent]:
+    metadata, content = load_file(owner, repo, path, stream_large=True)
 
-    if isinstance(raw_response, list):
+    if isinstance(metadata, list):
         raise ValueError(f"Path '{path}' is a directory, not a file.")
 
-    content = decode_content(raw_response)
-    lines = content.split("\n")
-    matches = search_lines(lines, pattern, context_lines, max_matches)
-    return [TextContent(type="text", text=format_grep_response(matches, path, pattern, len(lines)))]
+    if content is None:
+        matcher = build_matcher((pattern,), fixed_string, ignore_case, binary=False)
+        lines = iter_blob_lines(owner, repo, metadata["sha"])
+        try:
+            matches, total_lines, complete = stream_search_lines(lines, matcher, context_lines, max_matches)
+        finally:
+            lines.close()
+        return [TextContent(type="text", text=format_grep_response(matches, path, pattern, total_lines, complete))]
 
+    matches, total_lines = search_text(content, (pattern,), context_lines, max_matches, fixed_string, ignore_case)
+    return [TextContent(type="text", text=format_grep_response(matches, path, pattern, total_lines))]
 
-# FUNCTIONS
-
-# Find lines matching regex pattern with optional context
-def search_lines(lines: list[str], pattern: str, context_lines: int, max_matches: int) -> list[dict]:
-    compiled = re.compile(pattern)
-    match_indices = [i for i, line in enumerate(lines) if compiled.search(line)]
 
-    if not match_indices:
-        return []
+# FUNCTIONS
 
+# Search a line stream with a ring buffer for leading context; stops once max_matches are complete
+def stream_search_lines(lines, matcher: dict, context_lines: int, max_matches: int) -> tuple[list[dict], int, bool]:
+    before = deque(maxlen=context_lines)
     results = []
-    for idx in match_indices[:max_matches]:
-        start = max(0, idx - context_lines)
-        end = min(len(lines), idx + context_lines + 1)
-        results.append({
-            "match_line": idx,
-            "start": start,
-            "end": end,
-            "lines": [(i, lines[i]) for i in range(start, end)]
-        })
-
-    return results
+    pending = []
+    line_count = 0
+
+    for idx, line in enumerate(lines):
+        line_count = idx + 1
+        for match in pending:
+            match["lines"].append((idx, line))
+        pending = [match for match in pending if idx + 1 < match["end"]]
+
+        if len(results) < max_matches and line_matches(matcher, line):
+            match = {
+                "match_line": idx,
+                "start": max(0, idx - context_lines),
+                "end": idx + context_lines + 1,
+                "lines": list(before) + [(idx, line)]
+            }
+            results.append(match)
+            if context_lines > 0:
+                pending.append(match)
+
+        if len(results) >= max_matches and not pending:
+            return results, line_count, False
+        before.append((idx, line))
+
+    for match in results:
+        match["end"] = min(match["end"], line_count)
+    return results, line_count, True
 
 
 # Format grep results as text output
-def format_grep_response(matches: list[dict], path: str, pattern: str, total_lines: int) -> str:
+def format_grep_response(matches: list[dict], path: str, pattern: str, total_lines: int, complete: bool = True) -> str:
     output = []
-    output.append(f"File: {path} ({total_lines:,} lines)")
+    if complete:
+        output.append(f"File: {path} ({total_lines:,} lines)")
+    else:
+        output.append(f"File: {path} (scan stopped at line {total_lines:,} after max_matches)")
     output.append(f"Pattern: \"{pattern}\"")
 
     if not matches:
@@ -1,53 +1,158 @@
 # INFRASTRUCTURE
-import re
+import os
+import tarfile
+from typing import Literal
+from concurrent.futures import ThreadPoolExecutor
 from mcp.types import TextContent
-from src.github.get_repo_tree import fetch_default_branch, get_tree_sha, fetch_tree
-from src.github.get_repo_tree import filter_by_pattern
-from src.github.get_file_content import fetch_file_content, decode_content
-from src.github.grep_file import search_lines
+from src.github.client import GITHUB_API_BASE, github_get
+from src.github.get_repo_tree import MAX_TREE_ENTRIES, PATTERN_RESULTS_LIMIT, resolve_commit_sha, resolve_path_index
+from src.github.path_index import query_pattern, matches_file_pattern
+from src.github.get_file_content import CONTENTS_MAX_BYTES, load_blob, iter_blob_lines
+from src.github.grep_engine import check_patterns, build_matcher, search_text
+from src.github.grep_file import stream_search_lines
+from src.github.trigram_index import load_index, find_candidates, read_indexed_file
+from src.github.metrics import with_tool_context
+from src.github.result_store import store_result, cursor_hint
 
 MAX_FILES = 10
 MAX_MATCHES_PER_FILE = 3
+INDEX_DISPLAY_FILES = 20
+GREP_CONCURRENCY = int(os.environ.get("GITHUB_GREP_CONCURRENCY", "8"))
+ARCHIVE_MAX_FILE_BYTES = int(os.environ.get("GITHUB_ARCHIVE_MAX_FILE_BYTES", str(20 * 1024 * 1024)))
 
 
 # ORCHESTRATOR
-def grep_repo_workflow(owner: str, repo: str, pattern: str, file_pattern: str = "*.csv", path: str = "", max_files: int = MAX_FILES) -> list[TextContent]:
-    default_branch = fetch_default_branch(owner, repo)
-    tree_sha = get_tree_sha(owner, repo, default_branch, path)
-    raw_tree = fetch_tree(owner, repo, tree_sha, recursive=True)
-    truncated = raw_tree.get("truncated", False)
-    matching_files = filter_by_pattern(raw_tree, file_pattern)
-    results = grep_matching_files(owner, repo, matching_files[:max_files], pattern, path)
+def grep_repo_workflow(owner: str, repo: str, pattern: str, file_pattern: str = "*.csv", path: str = "", max_files: int = MAX_FILES, mode: Literal["api", "archive", "index"] = "api", fixed_string: bool = False, ignore_case: bool = False) -> list[TextContent]:
+    patterns = (pattern,)
+    check_patterns(patterns, fixed_string, ignore_case)
+    if mode == "index":
+        commit_sha = resolve_commit_sha(owner, repo)
+        index = load_index(owner, repo, commit_sha)
+        results, candidates = grep_index(index, patterns, file_pattern, path, fixed_string, ignore_case)
+        search_key = (owner, repo, commit_sha, pattern, file_pattern, path, fixed_string, ignore_case)
+        return [TextContent(type="text", text=format_index_results(results, pattern, file_pattern, path, commit_sha, len(index["files"]), candidates, search_key))]
+
+    if mode == "archive":
+        commit_sha = resolve_commit_sha(owner, repo)
+        results, scanned, complete = grep_archive(owner, repo, commit_sha, patterns, file_pattern, path, max_files, fixed_string, ignore_case)
+        return [TextContent(type="text", text=format_archive_results(results, pattern, file_pattern, path, scanned, max_files, complete))]
+
+    index = resolve_path_index(owner, repo, path)
+    truncated = index["truncated"]
+    matching_files = query_pattern(index, file_pattern, PATTERN_RESULTS_LIMIT)
+    results = grep_matching_files(owner, repo, matching_files[:max_files], patterns, path, fixed_string, ignore_case)
     return [TextContent(type="text", text=format_grep_repo_results(results, pattern, file_pattern, path, len(matching_files), max_files, truncated))]
 
 
 # FUNCTIONS
 
-# Grep content of each matching file for regex pattern
-def grep_matching_files(owner: str, repo: str, files: list[dict], pattern: str, base_path: str = "") -> list[dict]:
+# Grep matching files on a bounded worker pool, keeping results in input order.
+# A file that fails (404 race, exhausted retries) becomes an error result instead of failing the whole search
+def grep_matching_files(owner: str, repo: str, files: list[dict], patterns: tuple[str, ...], base_path: str = "", fixed_string: bool = False, ignore_case: bool = False) -> list[dict]:
+    if not files:
+        return []
+    workers = max(1, min(GREP_CONCURRENCY, len(files)))
+    search = with_tool_context(grep_single_file)
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        futures = [(file_item, pool.submit(search, owner, repo, file_item, patterns, base_path, fixed_string, ignore_case)) for file_item in files]
+        results = []
+        for file_item, future in futures:
+            try:
+                result = future.result()
+            except Exception as e:
+                file_path = f"{base_path}/{file_item['path']}" if base_path else file_item["path"]
+                result = {"path": file_path, "error": str(e) or type(e).__name__}
+            if result is not None:
+                results.append(result)
+        return results
+
+
+# Fetch and search one file's raw bytes; returns None for directories. Files over the Contents API limit
+# are searched as a line stream, and files over ARCHIVE_MAX_FILE_BYTES are skipped, so memory stays bounded per worker
+def grep_single_file(owner: str, repo: str, file_item: dict, patterns: tuple[str, ...], base_path: str = "", fixed_string: bool = False, ignore_case: bool = False) -> dict | None:
+    file_path = f"{base_path}/{file_item['path']}" if base_path else file_item["path"]
+    size = file_item.get("size", 0)
+    if size > ARCHIVE_MAX_FILE_BYTES:
+        return {"path": file_path, "skipped": size}
+    if size > CONTENTS_MAX_BYTES:
+        return grep_streamed_file(owner, repo, file_path, file_item["sha"], patterns, fixed_string, ignore_case)
+    content = load_blob(owner, repo, file_path, file_item["sha"])
+    if content is None:
+        return None
+    matches, total_lines = search_text(content, patterns, 0, MAX_MATCHES_PER_FILE, fixed_string, ignore_case)
+    return {"path": file_path, "matches": matches, "total_lines": total_lines}
+
+
+# Search a large blob line by line over the Blobs API; the download stops once MAX_MATCHES_PER_FILE are found
+def grep_streamed_file(owner: str, repo: str, file_path: str, sha: str, patterns: tuple[str, ...], fixed_string: bool = False, ignore_case: bool = False) -> dict:
+    matcher = build_matcher(patterns, fixed_string, ignore_case, binary=False)
+    lines = iter_blob_lines(owner, repo, sha)
+    try:
+        matches, total_lines, _ = stream_search_lines(lines, matcher, 0, MAX_MATCHES_PER_FILE)
+    finally:
+        lines.close()
+    return {"path": file_path, "matches": matches, "total_lines": total_lines}
+
+
+# Stream repo tarball once and grep member bytes matching scope and file pattern
+def grep_archive(owner: str, repo: str, commit_sha: str, patterns: tuple[str, ...], file_pattern: str, base_path: str, max_files: int, fixed_string: bool = False, ignore_case: bool = False) -> tuple[list[dict], int, bool]:
+    url = f"{GITHUB_API_BASE}/repos/{owner}/{repo}/tarball/{commit_sha}"
+    scope = f"{base_path.strip('/')}/" if base_path else ""
+    response = github_get(url, stream=True)
+    results = []
+    scanned = 0
+    try:
+        with tarfile.open(fileobj=response.raw, mode="r|gz") as archive:
+            for member in archive:
+                if not member.isfile() or member.size > ARCHIVE_MAX_FILE_BYTES:
+                    continue
+                file_path = member.name.split("/", 1)[1] if "/" in member.name else member.name
+                if not file_path.startswith(scope) or not matches_file_pattern(file_path[len(scope):], file_pattern):
+                    continue
+                data = archive.extractfile(member).read()
+                scanned += 1
+                matches, total_lines = search_text(data, patterns, 0, MAX_MATCHES_PER_FILE, fixed_string, ignore_case)
+                if matches:
+                    results.append({"path": file_path, "matches": matches, "total_lines": total_lines})
+                    if len(results) >= max_files:
+                        return results, scanned, False
+    finally:
+        response.close()
+    return results, scanned, True
+
+
+# Grep indexed snapshot: trigram postings narrow candidates, regex verifies them; no max_files cap
+def grep_index(index: dict, patterns: tuple[str, ...], file_pattern: str, base_path: str, fixed_string: bool = False, ignore_case: bool = False) -> tuple[list[dict], int]:
+    scope = f"{base_path.strip('/')}/" if base_path else ""
+    candidates = find_candidates(index, patterns, fixed_string, ignore_case)
+    file_ids = sorted(candidates) if candidates is not None else range(len(index["files"]))
     results = []
-    for file_item in files:
-        file_path = f"{base_path}/{file_item['path']}" if base_path else file_item["path"]
-        raw_response = fetch_file_content(owner, repo, file_path)
-        if isinstance(raw_response, list):
+    verified = 0
+    for file_id in file_ids:
+        file_path = index["files"][file_id][0]
+        if not file_path.startswith(scope) or not matches_file_pattern(file_path[len(scope):], file_pattern):
             continue
-        content = decode_content(raw_response)
-        lines = content.split("\n")
-        matches = search_lines(lines, pattern, 0, MAX_MATCHES_PER_FILE)
-        results.append({"path": file_path, "matches": matches, "total_lines": len(lines)})
-    return results
+        verified += 1
+        _, data = read_indexed_file(index, file_id)
+        matches, total_lines = search_text(data, patterns, 0, MAX_MATCHES_PER_FILE, fixed_string, ignore_case)
+        if matches:
+            results.append({"path": file_path, "matches": matches, "total_lines": total_lines})
+    return results, verified
 
 
 # Format grep results across multiple files
 def format_grep_repo_results(results: list[dict], pattern: str, file_pattern: str, base_path: str, total_matching: int, max_files: int, truncated: bool) -> str:
     scope = base_path if base_path else "/"
+    failed = [r for r in results if "error" in r]
+    skipped = [r for r in results if "skipped" in r]
+    results = [r for r in results if "matches" in r]
     searched = len(results)
     output = []
     output.append(f"Search: \"{pattern}\" in {file_pattern} (scope: {scope})")
     output.append(f"Files searched: {searched}/{total_matching} matching files (max_files={max_files})\n")
 
     if truncated:
-        output.append("WARNING: Repository tree was truncated by GitHub API. File list may be incomplete.")
+        output.append(f"WARNING: Repository tree exceeds {MAX_TREE_ENTRIES:,} entries. File list may be incomplete.")
         output.append("Use the 'path' parameter to narrow scope for complete results.\n")
 
     files_with_matches = [r for r in results if r["matches"]]
@@ -55,19 +160,78 @@ def format_grep_repo_results(results: list[dict], pattern: str, file_pattern: st
 
     if not files_with_matches:
         output.append("No matches found in any file.")
-        return "\n".join(output)
-
     for result in files_with_matches:
-        match_count = len(result["matches"])
-        output.append(f"--- {result['path']} ({match_count} match{'es' if match_count != 1 else ''}) ---")
-        for match in result["matches"]:
-            line_num = match["match_line"] + 1
-            line_text = match["lines"][match["match_line"] - match["start"]][1]
-            output.append(f">  {line_num:>6}: {line_text}")
-        output.append("")
-
-    if files_without_matches:
+        output.extend(format_file_matches(result))
+
+    if files_with_matches and files_without_matches:
         no_match_paths = [r["path"] for r in files_without_matches]
         output.append(f"No matches: {', '.join(no_match_paths)}")
 
+    if skipped:
+        skipped_paths = [f"{r['path']} ({r['skipped']:,} bytes)" for r in skipped]
+        output.append(f"Skipped (over {ARCHIVE_MAX_FILE_BYTES:,} bytes): {', '.join(skipped_paths)}")
+
+    if failed:
+        failed_paths = [f"{r['path']} ({r['error']})" for r in failed]
+        output.append(f"Failed: {', '.join(failed_paths)}")
+
+    return "\n".join(output)
+
+
+# Format archive-mode results; only files with matches are listed
+def format_archive_results(results: list[dict], pattern: str, file_pattern: str, base_path: str, scanned: int, max_files: int, complete: bool) -> str:
+    scope = base_path if base_path else "/"
+    output = []
+    output.append(f"Search: \"{pattern}\" in {file_pattern} (scope: {scope}, mode: archive)")
+    output.append(f"Files searched: {scanned} | Files with matches: {len(results)}\n")
+
+    if not complete:
+        output.append(f"NOTE: Stopped after {max_files} files with matches (max_files={max_files}). Raise max_files to continue scanning.\n")
+
+    if not results:
+        output.append("No matches found in any file.")
+        return "\n".join(output)
+
+    for result in results:
+        output.extend(format_file_matches(result))
+
     return "\n".join(output)
+
+
+# Format index-mode results: indexed file count, verified candidates, files with matches.
+# Only the first INDEX_DISPLAY_FILES files are shown; the rest are stored behind a next_page cursor
+def format_index_results(results: list[dict], pattern: str, file_pattern: str, base_path: str, commit_sha: str, indexed: int, candidates: int, search_key: tuple = ()) -> str:
+    scope = base_path if base_path else "/"
+    output = []
+    output.append(f"Search: \"{pattern}\" in {file_pattern} (scope: {scope}, mode: index @ {commit_sha[:7]})")
+    output.append(f"Files indexed: {indexed} | Candidates verified: {candidates} | Files with matches: {len(results)}\n")
+
+    if not results:
+        output.append("No matches found in any file.")
+        return "\n".join(output)
+
+    for result in results[:INDEX_DISPLAY_FILES]:
+        output.extend(format_file_matches(result))
+
+    if len(results) > INDEX_DISPLAY_FILES:
+        result_id = store_result(("grep_index",) + search_key, f"Matches for \"{pattern}\" in {file_pattern} @ {commit_sha[:7]}", results, format_indexed_file)
+        output.append(f"... and {len(results) - INDEX_DISPLAY_FILES} more files with matches {cursor_hint(result_id, INDEX_DISPLAY_FILES)}")
+
+    return "\n".join(output)
+
+
+# Render one stored index-mode file result for next_page
+def format_indexed_file(position: int, result: dict) -> str:
+    return "\n".join(format_file_matches(result))
+
+
+# Format match lines for one file result
+def format_file_matches(result: dict) -> list[str]:
+    match_count = len(result["matches"])
+    output = [f"--- {result['path']} ({match_count} match{'es' if match_count != 1 else ''}) ---"]
+    for match in result["matches"]:
+        line_num = match["match_line"] + 1
+        line_text = match["lines"][match["match_line"] - match["start"]][1]
+        output.append(f">  {line_num:>6}: {line_text}")
+    output.append("")
+    return output
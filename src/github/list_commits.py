@@ -1,7 +1,6 @@
 # INFRASTRUCTURE
-import requests
 from mcp.types import TextContent
-from src.github.client import GITHUB_API_BASE, RESULTS_PER_PAGE, build_headers
+from src.github.client import GITHUB_API_BASE, RESULTS_PER_PAGE, paginate
 
 
 # ORCHESTRATOR
@@ -20,19 +19,17 @@ def list_commits_workflow(
 
 # FUNCTIONS
 
-# Fetch commits from repository
+# Fetch up to per_page commits, spanning multiple API pages when above 100
 def fetch_commits(owner: str, repo: str, sha: str, path: str, author: str, per_page: int) -> list:
     url = f"{GITHUB_API_BASE}/repos/{owner}/{repo}/commits"
-    params = {"per_page": per_page}
+    params = {}
     if sha:
         params["sha"] = sha
     if path:
         params["path"] = path
     if author:
         params["author"] = author
-    response = requests.get(url, params=params, headers=build_headers())
-    response.raise_for_status()
-    return response.json()
+    return list(paginate(url, params, max_items=per_page))
 
 
 # Format commit list for display
@@ -1,11 +1,15 @@
 # INFRASTRUCTURE
 from mcp.types import TextContent
-from src.github.graphql_client import graphql_query
+from src.github.graphql_client import graphql_query, graphql_connection
+from src.github.repo_metadata import repo_field, remember_fields
+
+MAX_DISCUSSIONS = 500
 
 CATEGORIES_QUERY = """
 query($owner: String!, $repo: String!) {
   repository(owner: $owner, name: $repo) {
-    discussionCategories(first: 20) {
+    id
+    discussionCategories(first: 100) {
       nodes {
         id
         name
@@ -18,14 +22,16 @@ query($owner: String!, $repo: String!) {
 """
 
 LIST_QUERY = """
-query($owner: String!, $repo: String!, $first: Int!, $answered: Boolean, $categoryId: ID) {
+query($owner: String!, $repo: String!, $first: Int!, $after: String, $answered: Boolean, $categoryId: ID) {
   repository(owner: $owner, name: $repo) {
     discussions(
       first: $first,
+      after: $after,
       orderBy: {field: UPDATED_AT, direction: DESC},
       answered: $answered,
       categoryId: $categoryId
     ) {
+      pageInfo { hasNextPage endCursor }
       nodes {
         number
         title
@@ -56,47 +62,49 @@ def list_discussions_workflow(
     if category:
         category_id = lookup_category_id(owner, repo, category)
 
-    raw_data = fetch_discussions(owner, repo, first, category_id, answered)
-    formatted = format_results(owner, repo, raw_data)
+    nodes = fetch_discussions(owner, repo, first, category_id, answered)
+    formatted = format_results(owner, repo, nodes)
     return [TextContent(type="text", text=formatted)]
 
 
 # FUNCTIONS
 
-# Lookup category ID by slug
+# Lookup category ID by slug in the cached slug -> ID map
 def lookup_category_id(owner: str, repo: str, slug: str) -> str | None:
+    categories = repo_field(owner, repo, "discussion_categories", lambda: fetch_categories(owner, repo))
+    return categories.get(slug)
+
+
+# Fetch discussion categories as a slug -> ID map; also remembers the repository node ID
+def fetch_categories(owner: str, repo: str) -> dict:
     variables = {"owner": owner, "repo": repo}
     data = graphql_query(CATEGORIES_QUERY, variables)
-    categories = data["repository"]["discussionCategories"]["nodes"]
+    remember_fields(owner, repo, node_id=data["repository"]["id"])
+    return {cat["slug"]: cat["id"] for cat in data["repository"]["discussionCategories"]["nodes"]}
 
-    for cat in categories:
-        if cat["slug"] == slug:
-            return cat["id"]
-    return None
 
-
-# Fetch discussions from repository
+# Fetch discussions from repository, following cursors past 100 up to MAX_DISCUSSIONS
 def fetch_discussions(
     owner: str,
     repo: str,
     first: int,
     category_id: str | None,
     answered: bool | None
-) -> dict:
+) -> list:
     variables = {
         "owner": owner,
         "repo": repo,
-        "first": min(first, 100),
         "categoryId": category_id,
         "answered": answered
     }
-    return graphql_query(LIST_QUERY, variables)
+    connection = graphql_connection(LIST_QUERY, variables, ("repository", "discussions"), max(1, min(first, MAX_DISCUSSIONS)))
+    if connection is None:
+        raise ValueError(f"Repository {owner}/{repo} not found")
+    return connection["nodes"]
 
 
 # Format discussions list for display
-def format_results(owner: str, repo: str, data: dict) -> str:
-    nodes = data["repository"]["discussions"]["nodes"]
-
+def format_results(owner: str, repo: str, nodes: list) -> str:
     lines = [f"## Discussions in {owner}/{repo}\n"]
 
     if not nodes:
@@ -1,7 +1,6 @@
 # INFRASTRUCTURE
-import requests
 from mcp.types import TextContent
-from src.github.client import GITHUB_API_BASE, build_headers
+from src.github.client import GITHUB_API_BASE, paginate
 
 MAX_BODY_LENGTH = 300
 
@@ -15,13 +14,10 @@ def list_releases_workflow(owner: str, repo: str, per_page: int = 10) -> list[Te
 
 # FUNCTIONS
 
-# Fetch releases from repository
+# Fetch up to per_page releases, spanning multiple API pages when above 100
 def fetch_releases(owner: str, repo: str, per_page: int) -> list:
     url = f"{GITHUB_API_BASE}/repos/{owner}/{repo}/releases"
-    params = {"per_page": per_page}
-    response = requests.get(url, params=params, headers=build_headers())
-    response.raise_for_status()
-    return response.json()
+    return list(paginate(url, max_items=per_page))
 
 
 # Format release list for display
@@ -1,8 +1,7 @@
 # INFRASTRUCTURE
-import requests
 from typing import Literal
 from mcp.types import TextContent
-from src.github.client import GITHUB_API_BASE, RESULTS_PER_PAGE, build_headers
+from src.github.client import GITHUB_API_BASE, RESULTS_PER_PAGE, github_get_json
 
 
 # ORCHESTRATOR
@@ -28,9 +27,7 @@ def fetch_repo_prs(owner: str, repo: str, state: str, sort_by: str) -> list:
         "direction": "desc",
         "per_page": RESULTS_PER_PAGE
     }
-    response = requests.get(url, params=params, headers=build_headers())
-    response.raise_for_status()
-    return response.json()
+    return github_get_json(url, params=params)
 
 
 # Format PR list for display
@@ -0,0 +1,211 @@
+# INFRASTRUCTURE
+import os
+import re
+import time
+import atexit
+import tempfile
+import threading
+from collections import deque
+from contextvars import ContextVar
+from urllib.parse import urlparse
+
+LATENCY_SAMPLES = 1024
+QUANTILES = (0.5, 0.95, 0.99)
+METRICS_FILE = os.environ.get("GITHUB_METRICS_FILE", "")
+METRICS_DUMP_INTERVAL = float(os.environ.get("GITHUB_METRICS_DUMP_INTERVAL", "10"))
+UNATTRIBUTED = "(none)"
+ID_SEGMENT = re.compile(r"^(\d+|[0-9a-f]{7,40})$")
+FREE_FORM_SEGMENTS = (["contents"], ["compare"], ["branches"], ["git", "ref"], ["git", "refs"], ["git", "matching-refs"])
+REF_SEGMENTS = ("commits", "tarball", "zipball")
+API_PATH_PREFIX = urlparse(os.environ.get("GITHUB_API_BASE", "https://api.github.com")).path.rstrip("/")
+
+CURRENT_TOOL = ContextVar("current_tool", default=UNATTRIBUTED)
+TOOL_METRICS = {}
+METRICS_LOCK = threading.Lock()
+LAST_DUMP = [0.0]
+
+
+# FUNCTIONS
+
+# Run a workflow under its tool name, recording latency and errors; upstream calls made meanwhile are attributed to it
+def measure_workflow(workflow, *args):
+    tool = workflow.__name__.removesuffix("_workflow")
+    token = CURRENT_TOOL.set(tool)
+    started = time.perf_counter()
+    failed = False
+    try:
+        return workflow(*args)
+    except BaseException:
+        failed = True
+        raise
+    finally:
+        CURRENT_TOOL.reset(token)
+        record_workflow(tool, time.perf_counter() - started, failed)
+        maybe_dump()
+
+
+# Wrap fn for a worker pool so upstream calls inside it count towards the submitting tool
+def with_tool_context(fn):
+    tool = CURRENT_TOOL.get()
+
+    def run(*args):
+        token = CURRENT_TOOL.set(tool)
+        try:
+            return fn(*args)
+        finally:
+            CURRENT_TOOL.reset(token)
+    return run
+
+
+# Create metrics record for a tool (caller holds METRICS_LOCK)
+def get_tool_metrics(tool: str) -> dict:
+    if tool not in TOOL_METRICS:
+        TOOL_METRICS[tool] = {
+            "calls": 0,
+            "errors": 0,
+            "seconds": 0.0,
+            "latencies": deque(maxlen=LATENCY_SAMPLES),
+            "upstream": {},
+            "bytes_in": 0,
+            "bytes_out": 0,
+            "caches": {}
+        }
+    return TOOL_METRICS[tool]
+
+
+# Record one workflow run
+def record_workflow(tool: str, seconds: float, failed: bool) -> None:
+    with METRICS_LOCK:
+        metrics = get_tool_metrics(tool)
+        metrics["calls"] += 1
+        metrics["errors"] += 1 if failed else 0
+        metrics["seconds"] += seconds
+        metrics["latencies"].append(seconds)
+
+
+# Record one upstream HTTP/GraphQL attempt against the current tool and endpoint
+def record_upstream(method: str, url: str, seconds: float, bytes_in: int, bytes_out: int) -> None:
+    endpoint = endpoint_key(method, url)
+    with METRICS_LOCK:
+        metrics = get_tool_metrics(CURRENT_TOOL.get())
+        upstream = metrics["upstream"].setdefault(endpoint, {"calls": 0, "seconds": 0.0})
+        upstream["calls"] += 1
+        upstream["seconds"] += seconds
+        metrics["bytes_in"] += bytes_in
+        metrics["bytes_out"] += bytes_out
+
+
+# Record a cache lookup against the current tool
+def record_cache_lookup(cache: str, hit: bool) -> None:
+    with METRICS_LOCK:
+        counters = get_tool_metrics(CURRENT_TOOL.get())["caches"].setdefault(cache, {"hits": 0, "misses": 0})
+        counters["hits" if hit else "misses"] += 1
+
+
+# Endpoint label with owners, names, numbers and SHAs collapsed, e.g. "GET /repos/*/*/git/trees/*".
+# The GITHUB_API_BASE path (e.g. /api/v3 on GitHub Enterprise) is stripped first so the same rules apply;
+# free-form tails (file paths, compare ranges, branch and ref names) collapse to a single "*", as do refs after commits/tarball
+def endpoint_key(method: str, url: str) -> str:
+    path = urlparse(url).path
+    if API_PATH_PREFIX and path.startswith(f"{API_PATH_PREFIX}/"):
+        path = path[len(API_PATH_PREFIX):]
+    parts = path.strip("/").split("/")
+    if parts[0] == "repos" and len(parts) >= 3:
+        parts[1:3] = ["*", "*"]
+    parts = ["*" if ID_SEGMENT.match(part) else part for part in parts]
+    if parts[:3] == ["repos", "*", "*"]:
+        if len(parts) > 4 and parts[3] in REF_SEGMENTS:
+            parts[4] = "*"
+        for prefix in FREE_FORM_SEGMENTS:
+            end = 3 + len(prefix)
+            if parts[3:end] == prefix and len(parts) > end:
+                parts = parts[:end] + ["*"]
+                break
+    return f"{method} /{'/'.join(parts)}"
+
+
+# Nearest-rank percentile of sorted samples
+def percentile(samples: list[float], quantile: float) -> float:
+    if not samples:
+        return 0.0
+    return samples[min(len(samples) - 1, int(quantile * len(samples)))]
+
+
+# Snapshot per-tool metrics: latency quantiles in ms, upstream calls by endpoint, bytes, cache hit ratios
+def tool_stats() -> dict:
+    with METRICS_LOCK:
+        snapshot = {tool: dict(metrics, latencies=sorted(metrics["latencies"]), upstream={k: dict(v) for k, v in metrics["upstream"].items()}, caches={k: dict(v) for k, v in metrics["caches"].items()}) for tool, metrics in TOOL_METRICS.items()}
+
+    stats = {}
+    for tool, metrics in snapshot.items():
+        upstream_seconds = sum(u["seconds"] for u in metrics["upstream"].values())
+        stats[tool] = {
+            "calls": metrics["calls"],
+            "errors": metrics["errors"],
+            "latency_ms": {f"p{int(q * 100)}": round(percentile(metrics["latencies"], q) * 1000, 1) for q in QUANTILES},
+            "mean_ms": round(metrics["seconds"] / metrics["calls"] * 1000, 1) if metrics["calls"] else 0.0,
+            "upstream_calls": sum(u["calls"] for u in metrics["upstream"].values()),
+            "upstream_seconds": round(upstream_seconds, 3),
+            "upstream": {endpoint: {"calls": u["calls"], "seconds": round(u["seconds"], 3)} for endpoint, u in sorted(metrics["upstream"].items(), key=lambda item: -item[1]["seconds"])},
+            "bytes_in": metrics["bytes_in"],
+            "bytes_out": metrics["bytes_out"],
+            "caches": {name: dict(c, hit_ratio=round(c["hits"] / (c["hits"] + c["misses"]), 3) if c["hits"] + c["misses"] else 0.0) for name, c in metrics["caches"].items()}
+        }
+    return stats
+
+
+# Render per-tool metrics in Prometheus text exposition format
+def format_prometheus(stats: dict) -> str:
+    lines = [
+        "# TYPE github_mcp_tool_calls_total counter",
+        "# TYPE github_mcp_tool_errors_total counter",
+        "# TYPE github_mcp_tool_latency_seconds summary",
+        "# TYPE github_mcp_upstream_calls_total counter",
+        "# TYPE github_mcp_upstream_seconds_total counter",
+        "# TYPE github_mcp_upstream_bytes_in_total counter",
+        "# TYPE github_mcp_upstream_bytes_out_total counter",
+        "# TYPE github_mcp_cache_lookups_total counter"
+    ]
+    for tool, metrics in sorted(stats.items()):
+        label = f'tool="{tool}"'
+        lines.append(f"github_mcp_tool_calls_total{{{label}}} {metrics['calls']}")
+        lines.append(f"github_mcp_tool_errors_total{{{label}}} {metrics['errors']}")
+        for name, value in metrics["latency_ms"].items():
+            lines.append(f'github_mcp_tool_latency_seconds{{{label},quantile="0.{name[1:]}"}} {value / 1000:.4f}')
+        lines.append(f"github_mcp_tool_latency_seconds_sum{{{label}}} {metrics['mean_ms'] * metrics['calls'] / 1000:.4f}")
+        lines.append(f"github_mcp_tool_latency_seconds_count{{{label}}} {metrics['calls']}")
+        for endpoint, upstream in metrics["upstream"].items():
+            endpoint_label = f'{label},endpoint="{endpoint}"'
+            lines.append(f"github_mcp_upstream_calls_total{{{endpoint_label}}} {upstream['calls']}")
+            lines.append(f"github_mcp_upstream_seconds_total{{{endpoint_label}}} {upstream['seconds']}")
+        lines.append(f"github_mcp_upstream_bytes_in_total{{{label}}} {metrics['bytes_in']}")
+        lines.append(f"github_mcp_upstream_bytes_out_total{{{label}}} {metrics['bytes_out']}")
+        for cache, counters in metrics["caches"].items():
+            lines.append(f'github_mcp_cache_lookups_total{{{label},cache="{cache}",result="hit"}} {counters["hits"]}')
+            lines.append(f'github_mcp_cache_lookups_total{{{label},cache="{cache}",result="miss"}} {counters["misses"]}')
+    return "\n".join(lines) + "\n"
+
+
+# Write the Prometheus dump when GITHUB_METRICS_FILE is set, at most every METRICS_DUMP_INTERVAL seconds
+def maybe_dump() -> None:
+    now = time.monotonic()
+    with METRICS_LOCK:
+        if not METRICS_FILE or now - LAST_DUMP[0] < METRICS_DUMP_INTERVAL:
+            return
+        LAST_DUMP[0] = now
+    dump_metrics()
+
+
+# Atomically replace GITHUB_METRICS_FILE with the current metrics
+def dump_metrics() -> None:
+    if not METRICS_FILE:
+        return
+    directory = os.path.dirname(os.path.abspath(METRICS_FILE))
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(prefix=".metrics-", dir=directory)
+    with os.fdopen(fd, "w") as f:
+        f.write(format_prometheus(tool_stats()))
+    os.replace(tmp_path, METRICS_FILE)
+
+
+atexit.register(dump_metrics)
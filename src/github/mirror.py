@@ -0,0 +1,256 @@
+# INFRASTRUCTURE
+import os
+import time
+import base64
+import shutil
+import tempfile
+import threading
+import subprocess
+from os.path import basename
+from mcp.types import TextContent
+from src.github.client import GITHUB_TOKEN, single_flight, check_repo_ref
+
+MIRROR_DIR = os.environ.get("GITHUB_MIRROR_DIR", os.path.join(os.path.expanduser("~"), ".cache", "github-mcp", "mirrors"))
+MIRROR_URL_TEMPLATE = os.environ.get("GITHUB_MIRROR_URL_TEMPLATE", "https://github.com/{owner}/{repo}.git")
+MIRROR_TTL = float(os.environ.get("GITHUB_MIRROR_TTL", "300"))
+GIT_TIMEOUT = float(os.environ.get("GITHUB_GIT_TIMEOUT", "600"))
+
+MIRRORS = {}
+MIRROR_LOCK = threading.Lock()
+
+
+# ORCHESTRATOR
+def mirror_repo_workflow(owner: str, repo: str) -> list[TextContent]:
+    created = not has_mirror(owner, repo)
+    sync_mirror(owner, repo)
+    return [TextContent(type="text", text=format_mirror_status(owner, repo, created))]
+
+
+# FUNCTIONS
+
+# Local bare mirror directory for a repository
+def mirror_path(owner: str, repo: str) -> str:
+    check_repo_ref(owner, repo)
+    return os.path.join(MIRROR_DIR, owner.lower(), f"{repo.lower()}.git")
+
+
+# True when a mirror exists; tree, file and grep tools route through it
+def has_mirror(owner: str, repo: str) -> bool:
+    return os.path.isfile(os.path.join(mirror_path(owner, repo), "HEAD"))
+
+
+# Git environment: no prompts, token passed as an HTTP header instead of in the URL
+def git_env() -> dict:
+    env = dict(os.environ, GIT_TERMINAL_PROMPT="0")
+    if GITHUB_TOKEN:
+        credentials = base64.b64encode(f"x-access-token:{GITHUB_TOKEN}".encode()).decode()
+        env.update({
+            "GIT_CONFIG_COUNT": "1",
+            "GIT_CONFIG_KEY_0": "http.extraHeader",
+            "GIT_CONFIG_VALUE_0": f"Authorization: Basic {credentials}"
+        })
+    return env
+
+
+# Run git command and return stdout; raise with stderr on failure
+def run_git(args: list[str], cwd: str | None = None) -> str:
+    result = subprocess.run(["git", *args], cwd=cwd, env=git_env(), capture_output=True, timeout=GIT_TIMEOUT)
+    if result.returncode != 0:
+        raise Exception(f"git {args[0]} failed: {result.stderr.decode(errors='replace').strip()}")
+    return result.stdout.decode("utf-8", errors="replace")
+
+
+# Clone or fetch the mirror; concurrent callers share one git process
+def sync_mirror(owner: str, repo: str) -> None:
+    path = mirror_path(owner, repo)
+    if has_mirror(owner, repo):
+        single_flight(("mirror", path), lambda: fetch_mirror(owner, repo))
+    else:
+        single_flight(("mirror", path), lambda: clone_mirror(owner, repo))
+
+
+# Blob-less bare clone into a temporary directory, published with an atomic rename.
+# Another server process sharing MIRROR_DIR may publish the same mirror first; its copy is reused
+def clone_mirror(owner: str, repo: str) -> None:
+    path = mirror_path(owner, repo)
+    if has_mirror(owner, repo):
+        return
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    work_dir = tempfile.mkdtemp(prefix=".clone-", dir=os.path.dirname(path))
+    try:
+        url = MIRROR_URL_TEMPLATE.format(owner=owner, repo=repo)
+        run_git(["clone", "--bare", "--filter=blob:none", "--no-tags", url, work_dir])
+        run_git(["config", "remote.origin.fetch", "+refs/heads/*:refs/heads/*"], cwd=work_dir)
+        os.replace(work_dir, path)
+    except OSError:
+        shutil.rmtree(work_dir, ignore_errors=True)
+        if not has_mirror(owner, repo):
+            raise
+    except BaseException:
+        shutil.rmtree(work_dir, ignore_errors=True)
+        raise
+    reset_mirror_state(path)
+
+
+# Fetch new commits and trees; blobs stay on the remote until read
+def fetch_mirror(owner: str, repo: str) -> None:
+    path = mirror_path(owner, repo)
+    run_git(["fetch", "--prune", "--no-tags", "--filter=blob:none", "origin"], cwd=path)
+    reset_mirror_state(path)
+
+
+# Drop cached head and batch process so the next read sees fetched refs. The old process is
+# killed under its state lock, so a read in progress finishes first; later readers see it retired
+def reset_mirror_state(path: str) -> None:
+    with MIRROR_LOCK:
+        state = MIRRORS.pop(path, None)
+    if state is None:
+        return
+    with state["lock"]:
+        state["retired"] = True
+        if state["process"] is not None:
+            state["process"].kill()
+
+
+# Return per-mirror state, starting a background refetch when the last attempt is older than MIRROR_TTL.
+# Reads keep using the existing mirror meanwhile, so a slow or failing fetch never blocks them
+def ensure_fresh(owner: str, repo: str) -> dict:
+    path = mirror_path(owner, repo)
+    state = get_mirror_state(path)
+    with MIRROR_LOCK:
+        stale = time.time() - state["fetched_at"] > MIRROR_TTL
+        if stale:
+            state["fetched_at"] = time.time()
+    if stale:
+        threading.Thread(target=refresh_mirror, args=(owner, repo), daemon=True).start()
+    return state
+
+
+# Background TTL refetch; on failure the existing mirror keeps serving and the attempt is retried after MIRROR_TTL
+def refresh_mirror(owner: str, repo: str) -> None:
+    try:
+        sync_mirror(owner, repo)
+    except Exception:
+        pass
+
+
+# Create state on first use: batch process, its lock, cached head commit, last fetch attempt
+def get_mirror_state(path: str) -> dict:
+    with MIRROR_LOCK:
+        if path not in MIRRORS:
+            MIRRORS[path] = {"process": None, "lock": threading.Lock(), "head": None, "fetched_at": last_fetch_time(path), "retired": False}
+        return MIRRORS[path]
+
+
+# Time of last clone (config) or fetch (FETCH_HEAD)
+def last_fetch_time(path: str) -> float:
+    stamps = [os.path.join(path, "FETCH_HEAD"), os.path.join(path, "config")]
+    return max(os.path.getmtime(stamp) for stamp in stamps if os.path.exists(stamp))
+
+
+# Commit SHA of the mirror's default branch
+def mirror_head(owner: str, repo: str) -> str:
+    state = ensure_fresh(owner, repo)
+    if state["head"] is None:
+        state["head"] = run_git(["rev-parse", "HEAD"], cwd=mirror_path(owner, repo)).strip()
+    return state["head"]
+
+
+# Read one object through a persistent "git cat-file --batch"; missing blobs are fetched on demand.
+# State retired by a refetch while waiting for its lock is skipped in favour of the current one
+def read_object(owner: str, repo: str, spec: str) -> tuple[str, str, bytes] | None:
+    state = ensure_fresh(owner, repo)
+    with state["lock"]:
+        if not state["retired"]:
+            return read_batch(state, mirror_path(owner, repo), spec)
+    return read_object(owner, repo, spec)
+
+
+# Send one spec to the state's batch process (started on first use); caller holds the state lock
+def read_batch(state: dict, path: str, spec: str) -> tuple[str, str, bytes] | None:
+    process = state["process"]
+    if process is None or process.poll() is not None:
+        process = subprocess.Popen(
+            ["git", "cat-file", "--batch"], cwd=path, env=git_env(),
+            stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL
+        )
+        state["process"] = process
+    process.stdin.write(spec.encode("utf-8") + b"\n")
+    process.stdin.flush()
+    header = process.stdout.readline().decode("utf-8", errors="replace").rstrip("\n")
+    if not header:
+        raise Exception(f"git cat-file exited while reading {spec}")
+    if header.endswith((" missing", " ambiguous")):
+        return None
+    sha, kind, size = header.rsplit(" ", 2)
+    data = process.stdout.read(int(size))
+    process.stdout.read(1)
+    return sha, kind, data
+
+
+# Tree SHA for a path at the mirror head (root when path is empty)
+def mirror_tree_sha(owner: str, repo: str, path: str = "") -> str:
+    head = mirror_head(owner, repo)
+    found = read_object(owner, repo, f"{head}:{path.strip('/')}")
+    if found is None:
+        raise ValueError(f"Path '{path}' not found in {owner}/{repo}")
+    if found[1] != "tree":
+        raise ValueError(f"Path '{path}' is not a directory")
+    return found[0]
+
+
+# Tree listing in Git Trees API shape from "git ls-tree"; never truncated, sizes unknown without blobs
+def mirror_tree(owner: str, repo: str, tree_sha: str, recursive: bool = True) -> dict:
+    args = ["ls-tree", "-z", "-r", "-t", tree_sha] if recursive else ["ls-tree", "-z", tree_sha]
+    output = run_git(args, cwd=mirror_path(owner, repo))
+    items = []
+    for entry in output.split("\0"):
+        if not entry:
+            continue
+        info, path = entry.split("\t", 1)
+        mode, kind, sha = info.split(" ")
+        items.append({"path": path, "mode": mode, "type": kind, "sha": sha})
+    return {"sha": tree_sha, "tree": items, "truncated": False}
+
+
+# File metadata and bytes, or Contents API style directory listing, at the mirror head
+def mirror_file(owner: str, repo: str, path: str) -> tuple[dict | list, bytes | None]:
+    head = mirror_head(owner, repo)
+    path = path.strip("/")
+    found = read_object(owner, repo, f"{head}:{path}")
+    if found is None:
+        raise ValueError(f"Path '{path}' not found in {owner}/{repo}")
+    sha, kind, data = found
+
+    if kind == "tree":
+        listing = mirror_tree(owner, repo, sha, recursive=False)["tree"]
+        entries = [
+            {"name": item["path"], "path": f"{path}/{item['path']}" if path else item["path"], "type": "dir" if item["type"] == "tree" else "file", "sha": item["sha"]}
+            for item in listing
+        ]
+        return entries, None
+
+    metadata = {
+        "type": "file",
+        "name": basename(path),
+        "path": path,
+        "sha": sha,
+        "size": len(data),
+        "html_url": f"https://github.com/{owner}/{repo}/blob/{head}/{path}"
+    }
+    return metadata, data
+
+
+# Format mirror location, head commit and local object usage
+def format_mirror_status(owner: str, repo: str, created: bool) -> str:
+    path = mirror_path(owner, repo)
+    counts = dict(line.split(": ", 1) for line in run_git(["count-objects", "-v"], cwd=path).splitlines() if ": " in line)
+    branches = run_git(["for-each-ref", "--format=%(refname:short)", "refs/heads"], cwd=path).split()
+    lines = []
+    lines.append(f"Mirror: {owner}/{repo} ({'cloned' if created else 'fetched'})")
+    lines.append(f"Path: {path}")
+    lines.append(f"Head: {mirror_head(owner, repo)}")
+    lines.append(f"Branches: {len(branches)}")
+    lines.append(f"Objects: {int(counts.get('count', 0)) + int(counts.get('in-pack', 0)):,} ({int(counts.get('size-pack', 0)) + int(counts.get('size', 0)):,} KiB)")
+    lines.append("Tree, file and grep tools now read this repository from the mirror; blobs are fetched on first read.")
+    return "\n".join(lines)
@@ -0,0 +1,30 @@
+# INFRASTRUCTURE
+from mcp.types import TextContent
+from src.github.result_store import load_page, cursor_hint
+
+
+# ORCHESTRATOR
+def next_page_workflow(cursor: str) -> list[TextContent]:
+    page = load_page(cursor)
+    formatted_string = format_page(page)
+    return [TextContent(type="text", text=formatted_string)]
+
+
+# FUNCTIONS
+
+# Format one page of a stored result, with the cursor for the following page
+def format_page(page: dict) -> str:
+    lines = []
+    lines.append(f"# {page['title']}")
+
+    if page["start"] >= page["total"]:
+        lines.append(f"No more items ({page['total']} total).")
+        return "\n".join(lines)
+
+    lines.append(f"Showing {page['start'] + 1}-{page['end']} of {page['total']}\n")
+    lines.extend(page["items"])
+
+    if page["end"] < page["total"]:
+        lines.append(f"\n{page['total'] - page['end']} more: {cursor_hint(page['id'], page['end'])}")
+
+    return "\n".join(lines)
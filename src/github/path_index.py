@@ -0,0 +1,206 @@
+# INFRASTRUCTURE
+import re
+from bisect import bisect_left
+from functools import lru_cache
+from itertools import chain, islice
+from os.path import basename, commonprefix
+
+GLOB_CACHE_SIZE = 256
+GLOB_METACHARS = "*?["
+
+
+# FUNCTIONS
+
+# Index tree items by sorted path, with per-type depth buckets and blob extension buckets
+def build_path_index(raw_tree: dict) -> dict:
+    items = sorted(raw_tree.get("tree", []), key=lambda item: item["path"])
+    levels = {"tree": [], "blob": []}
+    extensions = {}
+    for idx, item in enumerate(items):
+        buckets = levels.get(item["type"])
+        if buckets is None:
+            continue
+        depth = item["path"].count("/")
+        while len(buckets) <= depth:
+            buckets.append([])
+        buckets[depth].append(idx)
+        if item["type"] == "blob":
+            extensions.setdefault(extension_key(basename(item["path"])), []).append(idx)
+
+    return {
+        "items": items,
+        "paths": [item["path"] for item in items],
+        "levels": levels,
+        "extensions": extensions,
+        "truncated": raw_tree.get("truncated", False)
+    }
+
+
+# Last ".suffix" of a file name (including dotfiles like ".bashrc"), or "" without a dot
+def extension_key(name: str) -> str:
+    dot = name.rfind(".")
+    return name[dot:] if dot >= 0 else ""
+
+
+# Index range [lo, hi) of paths under prefix; sorted order keeps every subtree contiguous
+def subtree_range(index: dict, prefix: str) -> tuple[int, int]:
+    if not prefix:
+        return 0, len(index["paths"])
+    paths = index["paths"]
+    lo = bisect_left(paths, prefix)
+    hi = bisect_left(paths, prefix[:-1] + chr(ord(prefix[-1]) + 1), lo)
+    return lo, hi
+
+
+# Derive the index of a subdirectory from a complete parent index without another request
+def subtree_index(index: dict, path: str) -> dict:
+    path = path.strip("/")
+    position = bisect_left(index["paths"], path)
+    if position == len(index["paths"]) or index["paths"][position] != path or index["items"][position]["type"] != "tree":
+        raise ValueError(f"Path '{path}' is not a directory")
+    prefix = f"{path}/"
+    lo, hi = subtree_range(index, prefix)
+    items = [dict(item, path=item["path"][len(prefix):]) for item in index["items"][lo:hi]]
+    return build_path_index({"sha": index["items"][position]["sha"], "tree": items, "truncated": index["truncated"]})
+
+
+# Item count and first `limit` items of a type shallower than depth (all depths when depth <= 0), shallowest first
+def query_depth(index: dict, kind: str, depth: int, limit: int) -> tuple[int, list[dict]]:
+    levels = index["levels"][kind] if depth <= 0 else index["levels"][kind][:depth]
+    count = sum(len(level) for level in levels)
+    return count, [index["items"][idx] for idx in islice(chain.from_iterable(levels), limit)]
+
+
+# Blobs matching the glob pattern in path order, up to limit. Literal directory prefixes narrow to a
+# subtree range and "*.ext" patterns to extension buckets, so only candidates are tested
+def query_pattern(index: dict, pattern: str, limit: int) -> list[dict]:
+    globs = compile_globs(pattern)
+    lo, hi = subtree_range(index, globs["prefix"])
+    if globs["extensions"] is None:
+        candidates = range(lo, hi)
+    else:
+        buckets = [index["extensions"].get(key, []) for key in globs["extensions"]]
+        candidates = sorted(idx for bucket in buckets for idx in bucket[bisect_left(bucket, lo):bisect_left(bucket, hi)])
+
+    results = []
+    for idx in candidates:
+        item = index["items"][idx]
+        if item["type"] == "blob" and glob_matches(globs, item["path"]):
+            results.append(item)
+            if len(results) >= limit:
+                break
+    return results
+
+
+# Match glob against full path when it contains "/", otherwise against basename
+def matches_file_pattern(path: str, pattern: str) -> bool:
+    return glob_matches(compile_globs(pattern), path)
+
+
+# Test a path against compiled globs
+def glob_matches(globs: dict, path: str) -> bool:
+    if globs["name"] is not None and globs["name"].fullmatch(basename(path)):
+        return True
+    return globs["path"] is not None and globs["path"].fullmatch(path) is not None
+
+
+# Compile comma-separated, brace-expanded globs once: basename and full-path regexes, a shared
+# literal directory prefix, and extension keys when every pattern ends in "*<literal>.ext"
+@lru_cache(maxsize=GLOB_CACHE_SIZE)
+def compile_globs(pattern: str) -> dict:
+    patterns = [expanded for part in split_patterns(pattern) for expanded in expand_braces(part)]
+    name_patterns = [p for p in patterns if "/" not in p]
+    path_patterns = [p for p in patterns if "/" in p]
+
+    prefix = ""
+    if path_patterns and not name_patterns:
+        literals = [p[:min([p.find(ch) for ch in GLOB_METACHARS if ch in p] or [len(p)])] for p in path_patterns]
+        prefix = commonprefix(literals)
+        prefix = prefix[:prefix.rfind("/") + 1]
+
+    keys = [glob_extension(p) for p in patterns]
+    return {
+        "name": compile_alternatives(name_patterns),
+        "path": compile_alternatives(path_patterns),
+        "prefix": prefix,
+        "extensions": None if not keys or None in keys else tuple(sorted(set(keys)))
+    }
+
+
+# Split on commas outside braces
+def split_patterns(pattern: str) -> list[str]:
+    parts = []
+    current = []
+    depth = 0
+    for ch in pattern:
+        if ch == "{":
+            depth += 1
+        elif ch == "}":
+            depth = max(0, depth - 1)
+        if ch == "," and depth == 0:
+            parts.append("".join(current))
+            current = []
+        else:
+            current.append(ch)
+    parts.append("".join(current))
+    return [part.strip() for part in parts if part.strip()]
+
+
+# Expand "{a,b}" alternatives into separate patterns
+def expand_braces(pattern: str) -> list[str]:
+    start = pattern.find("{")
+    end = pattern.find("}", start + 1)
+    if start < 0 or end < 0:
+        return [pattern]
+    head, options, tail = pattern[:start], pattern[start + 1:end].split(","), pattern[end + 1:]
+    return [expanded for option in options for expanded in expand_braces(head + option + tail)]
+
+
+# Extension bucket key for patterns ending in "*" plus a literal containing a dot, else None
+def glob_extension(pattern: str) -> str | None:
+    tail = pattern.rsplit("/", 1)[-1]
+    if not tail.startswith("*"):
+        return None
+    literal = tail.lstrip("*")
+    if "." not in literal or any(ch in literal for ch in GLOB_METACHARS):
+        return None
+    return extension_key(literal)
+
+
+# One compiled regex for a list of globs, or None when the list is empty
+def compile_alternatives(patterns: list[str]):
+    if not patterns:
+        return None
+    try:
+        return re.compile("|".join(f"(?:{translate_glob(p)})" for p in patterns), re.DOTALL)
+    except re.error as error:
+        raise ValueError(f"Invalid file pattern: {error}")
+
+
+# Translate glob to regex: * and ? as in fnmatch (crossing "/"), [...] classes, "**/" matches zero or more directories
+def translate_glob(pattern: str) -> str:
+    out = []
+    i = 0
+    while i < len(pattern):
+        if pattern.startswith("**/", i):
+            out.append("(?:.*/)?")
+            i += 3
+            continue
+        ch = pattern[i]
+        if ch == "*":
+            out.append(".*")
+        elif ch == "?":
+            out.append(".")
+        elif ch == "[" and pattern.find("]", i + 2) > 0:
+            end = pattern.find("]", i + 2)
+            body = re.sub(r"([&~|\[])", r"\\\1", pattern[i + 1:end].replace("\\", "\\\\"))
+            if body.startswith("!"):
+                body = "^" + body[1:]
+            elif body.startswith("^"):
+                body = "\\" + body
+            out.append(f"[{body}]")
+            i = end
+        else:
+            out.append(re.escape(ch))
+        i += 1
+    return "".join(out)
@@ -0,0 +1,154 @@
+# INFRASTRUCTURE
+import os
+import time
+import threading
+from datetime import datetime
+
+AUTHENTICATED = bool(os.environ.get("GITHUB_TOKEN", "") or os.environ.get("GH_TOKEN", ""))
+MAX_WAIT_SECONDS = float(os.environ.get("GITHUB_RATE_LIMIT_MAX_WAIT", "60"))
+
+# resource -> (sustained requests per second, burst size); pacing stays under secondary limits,
+# while X-RateLimit-Remaining/Reset from responses enforce the primary hourly/minute quota
+DEFAULT_BUDGETS = {
+    "core": (15.0, 100),
+    "search": (30 / 60 if AUTHENTICATED else 10 / 60, 5),
+    "code_search": (10 / 60, 3),
+    "graphql": (15.0, 50)
+}
+
+BUDGETS = {}
+BUDGET_LOCK = threading.Lock()
+
+
+# FUNCTIONS
+
+# Map request URL to the GitHub rate-limit resource it is charged against
+def classify_resource(url: str) -> str:
+    if url.endswith("/graphql"):
+        return "graphql"
+    if "/search/code" in url:
+        return "code_search"
+    if "/search/" in url:
+        return "search"
+    return "core"
+
+
+# Create token bucket state for a resource from its default budget
+def create_budget(resource: str) -> dict:
+    rate, burst = DEFAULT_BUDGETS.get(resource, DEFAULT_BUDGETS["core"])
+    return {
+        "limit": None,
+        "remaining": None,
+        "reset": 0.0,
+        "blocked_until": 0.0,
+        "rate": rate,
+        "capacity": float(burst),
+        "tokens": float(burst),
+        "refilled": time.monotonic(),
+        "granted": 0,
+        "waited": 0,
+        "wait_seconds": 0.0,
+        "costed_queries": 0,
+        "points_used": 0,
+        "max_cost": 0
+    }
+
+
+# Return budget for resource, creating it on first use (caller holds BUDGET_LOCK)
+def get_budget(resource: str) -> dict:
+    if resource not in BUDGETS:
+        BUDGETS[resource] = create_budget(resource)
+    return BUDGETS[resource]
+
+
+# Block until the resource budget allows one request; raise TimeoutError past the deadline
+def acquire(resource: str, max_wait: float = MAX_WAIT_SECONDS) -> None:
+    deadline = time.monotonic() + max_wait
+    waited = False
+    while True:
+        with BUDGET_LOCK:
+            budget = get_budget(resource)
+            delay = reserve_token(budget)
+            if delay <= 0:
+                budget["granted"] += 1
+                budget["waited"] += 1 if waited else 0
+                return
+            if time.monotonic() + delay > deadline:
+                raise TimeoutError(f"GitHub {resource} rate limit exhausted; next request allowed in {delay:.0f}s (max wait {max_wait:.0f}s)")
+            budget["wait_seconds"] += delay
+        waited = True
+        time.sleep(delay)
+
+
+# Refill bucket and take a token; returns 0 on success or seconds to wait
+def reserve_token(budget: dict) -> float:
+    now = time.monotonic()
+    if budget["blocked_until"] > now:
+        return budget["blocked_until"] - now
+
+    wall_now = time.time()
+    if budget["remaining"] is not None and budget["remaining"] <= 0 and budget["reset"] > wall_now:
+        return budget["reset"] - wall_now + 1
+
+    elapsed = now - budget["refilled"]
+    budget["tokens"] = min(budget["capacity"], budget["tokens"] + elapsed * budget["rate"])
+    budget["refilled"] = now
+    if budget["tokens"] >= 1:
+        budget["tokens"] -= 1
+        if budget["remaining"] is not None:
+            budget["remaining"] -= 1
+        return 0.0
+    return (1 - budget["tokens"]) / budget["rate"]
+
+
+# Update budget from X-RateLimit-* and Retry-After response headers
+def record_response(resource: str, headers, status_code: int) -> None:
+    resource = headers.get("X-RateLimit-Resource", resource)
+    with BUDGET_LOCK:
+        budget = get_budget(resource)
+        if "X-RateLimit-Limit" in headers:
+            budget["limit"] = int(headers["X-RateLimit-Limit"])
+        if "X-RateLimit-Remaining" in headers:
+            budget["remaining"] = int(headers["X-RateLimit-Remaining"])
+        if "X-RateLimit-Reset" in headers:
+            budget["reset"] = float(headers["X-RateLimit-Reset"])
+
+        retry_after = headers.get("Retry-After")
+        if retry_after and status_code in (403, 429):
+            budget["blocked_until"] = time.monotonic() + float(retry_after)
+
+
+# Record the point cost and remaining budget reported in a GraphQL response's rateLimit field
+def record_graphql_cost(rate_limit: dict) -> None:
+    with BUDGET_LOCK:
+        budget = get_budget("graphql")
+        budget["limit"] = rate_limit.get("limit", budget["limit"])
+        budget["remaining"] = rate_limit["remaining"]
+        budget["reset"] = datetime.fromisoformat(rate_limit["resetAt"].replace("Z", "+00:00")).timestamp()
+        budget["costed_queries"] += 1
+        budget["points_used"] += rate_limit["cost"]
+        budget["max_cost"] = max(budget["max_cost"], rate_limit["cost"])
+
+
+# Remaining quota of a resource and its limit, (None, None) before the first response reports them
+def remaining_budget(resource: str) -> tuple[int | None, int | None]:
+    with BUDGET_LOCK:
+        budget = get_budget(resource)
+        return budget["remaining"], budget["limit"]
+
+
+# Snapshot per-resource budget state
+def rate_limit_stats() -> dict:
+    with BUDGET_LOCK:
+        return {
+            resource: {
+                "limit": budget["limit"],
+                "remaining": budget["remaining"],
+                "reset": budget["reset"],
+                "granted": budget["granted"],
+                "waited": budget["waited"],
+                "wait_seconds": round(budget["wait_seconds"], 2),
+                **({"costed_queries": budget["costed_queries"], "points_used": budget["points_used"], "max_cost": budget["max_cost"]} if budget["costed_queries"] else {})
+            }
+            for resource, budget in BUDGETS.items()
+        }
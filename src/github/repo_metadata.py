@@ -0,0 +1,64 @@
+# INFRASTRUCTURE
+import os
+from src.github.cache import create_cache, cache_get, cache_put, cache_stats
+from src.github.client import GITHUB_API_BASE, github_get_json
+
+REPO_METADATA_TTL = int(os.environ.get("GITHUB_REPO_METADATA_TTL", os.environ.get("GITHUB_DEFAULT_BRANCH_TTL", "300")))
+REPO_METADATA_ENTRIES = 4096
+REPO_FIELDS = ("default_branch", "node_id", "visibility", "archived")
+
+METADATA_CACHE = create_cache(REPO_METADATA_ENTRIES, ttl=REPO_METADATA_TTL, name="repo_metadata")
+
+
+# FUNCTIONS
+
+# Cached value of one repository field, filled by load() on miss; each field expires on its own
+def repo_field(owner: str, repo: str, name: str, load):
+    key = (owner.lower(), repo.lower(), name)
+    value = cache_get(METADATA_CACHE, key)
+    if value is None:
+        value = load()
+        cache_put(METADATA_CACHE, key, value)
+    return value
+
+
+# Store fields learned from any response so later lookups skip their own round trip
+def remember_fields(owner: str, repo: str, **fields) -> None:
+    for name, value in fields.items():
+        if value is not None:
+            cache_put(METADATA_CACHE, (owner.lower(), repo.lower(), name), value)
+
+
+# Full repository object from the Repos API, cached; also fills the individual fields
+def get_repo_data(owner: str, repo: str) -> dict:
+    return repo_field(owner, repo, "repo", lambda: fetch_repo_data(owner, repo))
+
+
+# GET /repos/{owner}/{repo} and remember its default branch, node ID, visibility and archived flag
+def fetch_repo_data(owner: str, repo: str) -> dict:
+    url = f"{GITHUB_API_BASE}/repos/{owner}/{repo}"
+    data = github_get_json(url)
+    remember_fields(owner, repo, **{name: data.get(name) for name in REPO_FIELDS})
+    return data
+
+
+# Default branch name
+def resolve_default_branch(owner: str, repo: str) -> str:
+    return repo_field(owner, repo, "default_branch", lambda: get_repo_data(owner, repo)["default_branch"])
+
+
+# GraphQL node ID of the repository
+def resolve_node_id(owner: str, repo: str) -> str:
+    return repo_field(owner, repo, "node_id", lambda: get_repo_data(owner, repo)["node_id"])
+
+
+# Visibility ("public", "private", "internal") and archived flag
+def resolve_visibility(owner: str, repo: str) -> tuple[str, bool]:
+    visibility = repo_field(owner, repo, "visibility", lambda: get_repo_data(owner, repo).get("visibility", "public"))
+    archived = repo_field(owner, repo, "archived", lambda: get_repo_data(owner, repo).get("archived", False))
+    return visibility, archived
+
+
+# Report metadata cache counters
+def repo_metadata_stats() -> dict:
+    return cache_stats(METADATA_CACHE)
@@ -0,0 +1,68 @@
+# INFRASTRUCTURE
+import os
+import hashlib
+from src.github.cache import create_cache, cache_get, cache_put, cache_stats
+
+RESULT_STORE_BYTES = int(os.environ.get("GITHUB_RESULT_STORE_BYTES", str(64 * 1024 * 1024)))
+RESULT_TTL = int(os.environ.get("GITHUB_RESULT_TTL", "1800"))
+RESULT_PAGE_ITEMS = 100
+RESULT_PAGE_CHARS = int(os.environ.get("GITHUB_RESULT_PAGE_CHARS", "20000"))
+RESULT_ITEM_BYTES = 200
+
+RESULT_STORE = create_cache(RESULT_STORE_BYTES, ttl=RESULT_TTL, name="results")
+
+
+# FUNCTIONS
+
+# Keep a full result server-side and return its ID. items are rendered on demand by render(position, item)
+# with 1-based positions; key identifies the result so repeated calls replace one entry instead of adding more
+def store_result(key: tuple, title: str, items: list, render, size: int = 0) -> str:
+    result_id = hashlib.sha256(repr(key).encode()).hexdigest()[:16]
+    entry = {"title": title, "items": items, "render": render}
+    cache_put(RESULT_STORE, result_id, entry, size or len(items) * RESULT_ITEM_BYTES)
+    return result_id
+
+
+# Opaque cursor for a stored result starting at an item offset
+def make_cursor(result_id: str, offset: int) -> str:
+    return f"{result_id}.{offset}"
+
+
+# Tool hint line pointing at a cursor
+def cursor_hint(result_id: str, offset: int) -> str:
+    return f"[next_page: cursor=\"{make_cursor(result_id, offset)}\"]"
+
+
+# Split a cursor into result ID and offset
+def parse_cursor(cursor: str) -> tuple[str, int]:
+    result_id, _, offset = cursor.strip().partition(".")
+    if not result_id or not offset.isdigit():
+        raise ValueError(f"Invalid cursor '{cursor}'")
+    return result_id, int(offset)
+
+
+# Slice of a stored result from the cursor, cut at RESULT_PAGE_ITEMS items or RESULT_PAGE_CHARS characters
+# (always at least one item). Returns title, rendered items, start, end and total; no network access
+def load_page(cursor: str) -> dict:
+    result_id, offset = parse_cursor(cursor)
+    entry = cache_get(RESULT_STORE, result_id)
+    if entry is None:
+        raise ValueError(f"Cursor '{cursor}' expired or unknown; re-run the original tool call for a fresh cursor")
+
+    items = entry["items"]
+    rendered = []
+    chars = 0
+    end = offset
+    while end < len(items) and len(rendered) < RESULT_PAGE_ITEMS:
+        text = entry["render"](end + 1, items[end])
+        if rendered and chars + len(text) > RESULT_PAGE_CHARS:
+            break
+        rendered.append(text)
+        chars += len(text) + 1
+        end += 1
+    return {"id": result_id, "title": entry["title"], "items": rendered, "start": offset, "end": end, "total": len(items)}
+
+
+# Result store counters
+def result_store_stats() -> dict:
+    return cache_stats(RESULT_STORE)
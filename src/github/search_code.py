@@ -1,7 +1,6 @@
 # INFRASTRUCTURE
-import requests
 from mcp.types import TextContent
-from src.github.client import GITHUB_API_BASE, RESULTS_PER_PAGE, build_headers
+from src.github.client import GITHUB_API_BASE, RESULTS_PER_PAGE, github_get_json
 
 
 # ORCHESTRATOR
@@ -20,9 +19,7 @@ def fetch_code_search(query: str) -> dict:
         "q": query,
         "per_page": RESULTS_PER_PAGE
     }
-    response = requests.get(url, params=params, headers=build_headers("application/vnd.github.text-match+json"))
-    response.raise_for_status()
-    return response.json()
+    return github_get_json(url, params=params, accept="application/vnd.github.text-match+json")
 
 
 # Extract relevant fields from raw API response
@@ -1,11 +1,14 @@
 # INFRASTRUCTURE
 from mcp.types import TextContent
-from src.github.graphql_client import graphql_query
+from src.github.graphql_client import graphql_connection
+
+MAX_DISCUSSIONS = 500
 
 SEARCH_QUERY = """
-query($query: String!, $first: Int!) {
-  search(query: $query, type: DISCUSSION, first: $first) {
+query($query: String!, $first: Int!, $after: String) {
+  search(query: $query, type: DISCUSSION, first: $first, after: $after) {
     discussionCount
+    pageInfo { hasNextPage endCursor }
     nodes {
       ... on Discussion {
         number
@@ -35,15 +38,14 @@ def search_discussions_workflow(query: str, first: int = 10) -> list[TextContent
 
 # FUNCTIONS
 
-# Fetch discussions via GitHub GraphQL Search API
+# Fetch discussions via GitHub GraphQL Search API, following cursors past 100 up to MAX_DISCUSSIONS
 def fetch_discussions(query: str, first: int) -> dict:
-    variables = {"query": query, "first": min(first, 100)}
-    return graphql_query(SEARCH_QUERY, variables)
+    variables = {"query": query}
+    return graphql_connection(SEARCH_QUERY, variables, ("search",), max(1, min(first, MAX_DISCUSSIONS)))
 
 
 # Format search results for display
-def format_results(data: dict) -> str:
-    search = data["search"]
+def format_results(search: dict) -> str:
     total = search["discussionCount"]
     nodes = search["nodes"]
 
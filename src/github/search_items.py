@@ -1,8 +1,7 @@
 # INFRASTRUCTURE
-import requests
 from typing import Literal
 from mcp.types import TextContent
-from src.github.client import GITHUB_API_BASE, RESULTS_PER_PAGE, build_headers
+from src.github.client import GITHUB_API_BASE, RESULTS_PER_PAGE, github_get_json
 
 
 # ORCHESTRATOR
@@ -41,9 +40,7 @@ def fetch_items(query: str, sort_by: str) -> dict:
     params = {"q": query, "per_page": RESULTS_PER_PAGE, "order": "desc"}
     if sort_by != "best_match":
         params["sort"] = sort_by
-    response = requests.get(url, params=params, headers=build_headers())
-    response.raise_for_status()
-    return response.json()
+    return github_get_json(url, params=params)
 
 
 # Format search results for display
@@ -1,8 +1,7 @@
 # INFRASTRUCTURE
-import requests
 from typing import Literal
 from mcp.types import TextContent
-from src.github.client import GITHUB_API_BASE, RESULTS_PER_PAGE, build_headers
+from src.github.client import GITHUB_API_BASE, RESULTS_PER_PAGE, github_get_json
 
 
 # ORCHESTRATOR
@@ -30,9 +29,7 @@ def fetch_repositories(query: str, sort_by: str) -> dict:
     if sort_by != "best_match":
         params["sort"] = sort_by
 
-    response = requests.get(url, params=params, headers=build_headers())
-    response.raise_for_status()
-    return response.json()
+    return github_get_json(url, params=params)
 
 
 # Extract relevant fields from raw API response
@@ -0,0 +1,75 @@
+# INFRASTRUCTURE
+import json
+from mcp.types import TextContent
+from src.github.metrics import METRICS_FILE, tool_stats, dump_metrics
+from src.github.client import retry_stats, single_flight_stats, response_cache_stats, pool_stats
+from src.github.rate_limit import rate_limit_stats
+from src.github.get_repo_tree import tree_cache_stats
+from src.github.get_file_content import blob_cache_stats
+from src.github.trigram_index import index_stats
+from src.github.repo_metadata import repo_metadata_stats
+from src.github.result_store import result_store_stats
+
+
+# ORCHESTRATOR
+def server_stats_workflow() -> list[TextContent]:
+    stats = collect_stats()
+    dump_metrics()
+    formatted_string = format_stats(stats)
+    return [TextContent(type="text", text=formatted_string)]
+
+
+# FUNCTIONS
+
+# Per-tool metrics plus process-wide client, rate-limit and cache counters
+def collect_stats() -> dict:
+    return {
+        "tools": tool_stats(),
+        "rate_limits": rate_limit_stats(),
+        "retries": retry_stats(),
+        "single_flight": single_flight_stats(),
+        "connection_pool": pool_stats(),
+        "caches": {
+            "responses": response_cache_stats(),
+            **tree_cache_stats(),
+            **blob_cache_stats(),
+            "trigram_indexes": index_stats(),
+            "repo_metadata": repo_metadata_stats(),
+            "results": result_store_stats()
+        }
+    }
+
+
+# Stats as JSON for the stats resource
+def stats_json() -> str:
+    return json.dumps(collect_stats(), indent=2)
+
+
+# Format per-tool table, slowest endpoints, then process-wide counters
+def format_stats(stats: dict) -> str:
+    lines = ["## Tools\n"]
+    tools = sorted(stats["tools"].items(), key=lambda item: -item[1]["mean_ms"] * item[1]["calls"])
+    if not tools:
+        lines.append("No tool calls recorded yet.")
+
+    for tool, metrics in tools:
+        latency = metrics["latency_ms"]
+        lines.append(f"### {tool}")
+        lines.append(f"Calls: {metrics['calls']} | Errors: {metrics['errors']} | p50 {latency['p50']}ms | p95 {latency['p95']}ms | p99 {latency['p99']}ms")
+        lines.append(f"Upstream: {metrics['upstream_calls']} calls, {metrics['upstream_seconds']}s | In: {metrics['bytes_in']:,} B | Out: {metrics['bytes_out']:,} B")
+        for endpoint, upstream in list(metrics["upstream"].items())[:5]:
+            lines.append(f"  {endpoint}: {upstream['calls']} calls, {upstream['seconds']}s")
+        caches = ", ".join(f"{name} {c['hit_ratio']:.0%} of {c['hits'] + c['misses']}" for name, c in metrics["caches"].items())
+        if caches:
+            lines.append(f"Cache hits: {caches}")
+        lines.append("")
+
+    for section in ("rate_limits", "retries", "single_flight", "connection_pool", "caches"):
+        lines.append(f"## {section.replace('_', ' ').title()}\n")
+        lines.append(json.dumps(stats[section], indent=2))
+        lines.append("")
+
+    if METRICS_FILE:
+        lines.append(f"Prometheus dump: {METRICS_FILE}")
+
+    return "\n".join(lines)
@@ -0,0 +1,244 @@
+# INFRASTRUCTURE
+import os
+import re
+import json
+import mmap
+import time
+import shutil
+import struct
+import tarfile
+import tempfile
+from array import array
+from src.github.cache import create_cache, cache_get, cache_put, cache_stats
+from src.github.client import GITHUB_API_BASE, github_get, single_flight, check_repo_ref
+
+try:
+    from re import _parser as sre_parse
+except ImportError:
+    import sre_parse
+
+INDEX_DIR = os.environ.get("GITHUB_INDEX_DIR", os.path.join(os.path.expanduser("~"), ".cache", "github-mcp", "index"))
+INDEX_MAX_BYTES = int(os.environ.get("GITHUB_INDEX_MAX_BYTES", str(2 * 1024 * 1024 * 1024)))
+INDEX_MAX_AGE = float(os.environ.get("GITHUB_INDEX_MAX_AGE", str(7 * 24 * 3600)))
+INDEX_MAX_FILE_BYTES = int(os.environ.get("GITHUB_ARCHIVE_MAX_FILE_BYTES", str(20 * 1024 * 1024)))
+OPEN_INDEXES = 8
+TRIGRAM_RECORD = struct.Struct("=III")
+
+INDEX_CACHE = create_cache(OPEN_INDEXES, name="trigram_indexes")
+
+
+# FUNCTIONS
+
+# Return opened index for a commit, building it from the tarball on first use
+def load_index(owner: str, repo: str, commit_sha: str) -> dict:
+    key = (owner.lower(), repo.lower(), commit_sha)
+    index = cache_get(INDEX_CACHE, key)
+    if index is not None:
+        return index
+
+    index_path = build_index_path(*key)
+    if not os.path.isdir(index_path):
+        single_flight(("index",) + key, lambda: build_index(owner, repo, commit_sha, index_path))
+    os.utime(index_path)
+    index = open_index(index_path)
+    cache_put(INDEX_CACHE, key, index)
+    return index
+
+
+# Directory holding the index for one repository snapshot
+def build_index_path(owner: str, repo: str, commit_sha: str) -> str:
+    check_repo_ref(owner, repo)
+    return os.path.join(INDEX_DIR, f"{owner}__{repo}", commit_sha)
+
+
+# Stream the tarball once, write contents and trigram postings, then publish the directory atomically.
+# Another server process sharing INDEX_DIR may publish the same snapshot first; its copy is reused
+def build_index(owner: str, repo: str, commit_sha: str, index_path: str) -> None:
+    if os.path.isdir(index_path):
+        return
+    os.makedirs(os.path.dirname(index_path), exist_ok=True)
+    work_dir = tempfile.mkdtemp(prefix=".build-", dir=os.path.dirname(index_path))
+    try:
+        files, postings = write_contents(owner, repo, commit_sha, work_dir)
+        write_postings(postings, work_dir)
+        with open(os.path.join(work_dir, "files.json"), "w") as f:
+            json.dump({"commit": commit_sha, "built_at": time.time(), "files": files}, f)
+        os.replace(work_dir, index_path)
+    except OSError:
+        shutil.rmtree(work_dir, ignore_errors=True)
+        if not os.path.isdir(index_path):
+            raise
+    except BaseException:
+        shutil.rmtree(work_dir, ignore_errors=True)
+        raise
+    evict_indexes(keep=index_path)
+
+
+# Copy every file from the tarball into content.bin, collecting trigram -> file id postings
+def write_contents(owner: str, repo: str, commit_sha: str, work_dir: str) -> tuple[list, dict]:
+    url = f"{GITHUB_API_BASE}/repos/{owner}/{repo}/tarball/{commit_sha}"
+    response = github_get(url, stream=True)
+    files = []
+    postings = {}
+    offset = 0
+    try:
+        with open(os.path.join(work_dir, "content.bin"), "wb") as out, tarfile.open(fileobj=response.raw, mode="r|gz") as archive:
+            for member in archive:
+                if not member.isfile() or member.size > INDEX_MAX_FILE_BYTES:
+                    continue
+                data = archive.extractfile(member).read()
+                file_id = len(files)
+                file_path = member.name.split("/", 1)[1] if "/" in member.name else member.name
+                files.append([file_path, offset, len(data)])
+                out.write(data)
+                offset += len(data)
+                for trigram in extract_trigrams(data):
+                    postings.setdefault(trigram, array("I")).append(file_id)
+    finally:
+        response.close()
+    return files, postings
+
+
+# Distinct trigrams of ASCII-lowercased bytes, packed into ints
+def extract_trigrams(data: bytes) -> set[int]:
+    data = data.lower()
+    return {(a << 16) | (b << 8) | c for a, b, c in zip(data, data[1:], data[2:])}
+
+
+# Write sorted trigram table (trigram, postings offset, count) and concatenated postings
+def write_postings(postings: dict, work_dir: str) -> None:
+    position = 0
+    with open(os.path.join(work_dir, "trigrams.bin"), "wb") as table, open(os.path.join(work_dir, "postings.bin"), "wb") as lists:
+        for trigram in sorted(postings):
+            file_ids = postings[trigram]
+            table.write(TRIGRAM_RECORD.pack(trigram, position, len(file_ids)))
+            file_ids.tofile(lists)
+            position += len(file_ids)
+
+
+# Memory-map index files; posting lists and contents are paged in on demand
+def open_index(index_path: str) -> dict:
+    with open(os.path.join(index_path, "files.json")) as f:
+        meta = json.load(f)
+    return {
+        "path": index_path,
+        "files": meta["files"],
+        "trigrams": map_file(os.path.join(index_path, "trigrams.bin")),
+        "postings": map_file(os.path.join(index_path, "postings.bin")),
+        "content": map_file(os.path.join(index_path, "content.bin"))
+    }
+
+
+# Read-only mmap of a file; empty files map to empty bytes
+def map_file(file_path: str):
+    with open(file_path, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return b""
+        return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+
+# Binary search the trigram table and return its posting list as a set of file ids
+def lookup_postings(index: dict, trigram: int) -> set[int]:
+    table = index["trigrams"]
+    low, high = 0, len(table) // TRIGRAM_RECORD.size
+    while low < high:
+        mid = (low + high) // 2
+        value, position, count = TRIGRAM_RECORD.unpack_from(table, mid * TRIGRAM_RECORD.size)
+        if value == trigram:
+            file_ids = array("I")
+            file_ids.frombytes(index["postings"][position * file_ids.itemsize:(position + count) * file_ids.itemsize])
+            return set(file_ids)
+        if value < trigram:
+            low = mid + 1
+        else:
+            high = mid
+    return set()
+
+
+# File ids that can contain a match; None means the patterns give no trigrams to narrow by
+def find_candidates(index: dict, patterns: tuple[str, ...], fixed_string: bool = False, ignore_case: bool = False) -> set[int] | None:
+    candidates = set()
+    for pattern in patterns:
+        trigrams = required_trigrams(pattern, fixed_string, ignore_case)
+        if not trigrams:
+            return None
+        postings = sorted((lookup_postings(index, trigram) for trigram in trigrams), key=len)
+        matched = postings[0]
+        for file_ids in postings[1:]:
+            if not matched:
+                break
+            matched = matched & file_ids
+        candidates |= matched
+    return candidates
+
+
+# Trigrams every match of the pattern must contain, from its mandatory literal runs
+def required_trigrams(pattern: str, fixed_string: bool, ignore_case: bool) -> set[int]:
+    runs = [pattern] if fixed_string else literal_runs(pattern)
+    if not fixed_string and has_ignorecase_flag(pattern):
+        ignore_case = True
+    trigrams = set()
+    for run in runs:
+        trigrams |= extract_trigrams(run.encode("utf-8"))
+    if ignore_case:
+        trigrams = {t for t in trigrams if t & 0x808080 == 0}
+    return trigrams
+
+
+# Literal sequences at the top level of a regex; any other construct ends the current run
+def literal_runs(pattern: str) -> list[str]:
+    try:
+        parsed = sre_parse.parse(pattern)
+    except re.error:
+        return []
+    runs = []
+    current = []
+    for op, arg in parsed:
+        if op is sre_parse.LITERAL:
+            current.append(chr(arg))
+            continue
+        runs.append("".join(current))
+        current = []
+    runs.append("".join(current))
+    return [run for run in runs if len(run) >= 3]
+
+
+# True when the pattern enables IGNORECASE inline, e.g. "(?i)foo"
+def has_ignorecase_flag(pattern: str) -> bool:
+    try:
+        return bool(sre_parse.parse(pattern).state.flags & re.IGNORECASE)
+    except re.error:
+        return False
+
+
+# Path and content bytes for one indexed file
+def read_indexed_file(index: dict, file_id: int) -> tuple[str, bytes]:
+    file_path, offset, size = index["files"][file_id]
+    return file_path, index["content"][offset:offset + size]
+
+
+# Remove indexes older than INDEX_MAX_AGE, then least recently used ones until under INDEX_MAX_BYTES; keep is never removed
+def evict_indexes(keep: str = "") -> None:
+    entries = []
+    for repo_dir in os.scandir(INDEX_DIR) if os.path.isdir(INDEX_DIR) else []:
+        if not repo_dir.is_dir():
+            continue
+        for snapshot in os.scandir(repo_dir.path):
+            if snapshot.is_dir() and not snapshot.name.startswith("."):
+                size = sum(f.stat().st_size for f in os.scandir(snapshot.path) if f.is_file())
+                entries.append((snapshot.stat().st_mtime, size, snapshot.path))
+
+    now = time.time()
+    total = sum(size for _, size, _ in entries)
+    for used_at, size, path in sorted(entries):
+        if now - used_at <= INDEX_MAX_AGE and total <= INDEX_MAX_BYTES:
+            break
+        if path == keep:
+            continue
+        shutil.rmtree(path, ignore_errors=True)
+        total -= size
+
+
+# Report open index cache counters
+def index_stats() -> dict:
+    return cache_stats(INDEX_CACHE)